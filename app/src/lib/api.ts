@@ -25,14 +25,25 @@ async function getAuthHeaders(): Promise<Record<string, string>> {
 // Types
 // ============================================================================
 
-export interface Script {
+export interface ScriptSummary {
   id: number
   name: string
-  lines: string[]
   line_count: number
   created_at?: string
 }
 
+export interface Script extends ScriptSummary {
+  lines: string[]
+}
+
+export interface ScriptLinesPage {
+  script_id: number
+  offset: number
+  limit: number
+  total: number
+  lines: string[]
+}
+
 export interface Recording {
   id: number
   script_id: number
@@ -48,6 +59,41 @@ export interface Recording {
   is_valid: boolean
   storage_path?: string
   created_at?: string
+  file_size_bytes?: number | null
+  original_size_bytes?: number | null
+  noise_floor_db?: number | null
+  snr_db?: number | null
+  clipped_ratio?: number | null
+  leading_silence_seconds?: number | null
+  trailing_silence_seconds?: number | null
+  dc_offset?: number | null
+}
+
+export interface RecordingListPage {
+  items: Recording[]
+  next_cursor: string | null
+}
+
+export interface RecordingListFilters {
+  scriptId?: number
+  isValid?: boolean
+  createdAfter?: string
+  createdBefore?: string
+}
+
+export interface RecordedLines {
+  script_id: number
+  total: number
+  recorded: number
+  /** base64 bitset: bit i (least significant first within each byte) is set when line i has a take */
+  bitmap: string
+  next_unrecorded: number | null
+}
+
+/** Whether line lineIndex is set in a RecordedLines bitmap. */
+export function isLineRecorded(lines: RecordedLines, lineIndex: number): boolean {
+  const byte = atob(lines.bitmap).charCodeAt(lineIndex >> 3)
+  return Number.isFinite(byte) && ((byte >> (lineIndex & 7)) & 1) === 1
 }
 
 export interface RecordingProgress {
@@ -67,7 +113,24 @@ export interface SaveRecordingResult {
   peak_amplitude: number
   rms_level: number
   is_valid: boolean
+  file_size_bytes?: number | null
+  original_size_bytes?: number | null
+  noise_floor_db?: number | null
+  snr_db?: number | null
+  clipped_ratio?: number | null
+  leading_silence_seconds?: number | null
+  trailing_silence_seconds?: number | null
+  dc_offset?: number | null
   error: string | null
+  /** Set when the stored take will be normalized / re-encoded by a background job */
+  job_id?: number | null
+}
+
+export interface SaveRecordingBatchResult {
+  script_id: number
+  saved: number
+  failed: number
+  items: Array<SaveRecordingResult & { line_index: number }>
 }
 
 export interface UserSettings {
@@ -166,8 +229,9 @@ export const api = {
   },
 
   /** Fetch TTS pronunciation audio for the given text. */
-  async pronounceText(text: string, lang = 'en'): Promise<Blob> {
+  async pronounceText(text: string, lang = 'en', voice = ''): Promise<Blob> {
     const params = new URLSearchParams({ text, lang })
+    if (voice) params.set('voice', voice)
     const response = await fetch(`${API_BASE}/tts/pronounce?${params}`)
     if (!response.ok) {
       const err = await response.json().catch(() => ({ detail: 'TTS failed' }))
@@ -181,10 +245,19 @@ export const api = {
     return fetchAPI('/scripts')
   },
 
+  async listScriptSummaries(): Promise<ScriptSummary[]> {
+    return fetchAPI('/scripts?summary=true')
+  },
+
   async getScript(scriptId: number): Promise<Script> {
     return fetchAPI(`/scripts/${scriptId}`)
   },
 
+  async getScriptLines(scriptId: number, offset = 0, limit = 100): Promise<ScriptLinesPage> {
+    const params = new URLSearchParams({ offset: String(offset), limit: String(limit) })
+    return fetchAPI(`/scripts/${scriptId}/lines?${params}`)
+  },
+
   // Recordings
   async saveRecording(
     audioBlob: Blob,
@@ -205,15 +278,62 @@ export const api = {
     })
   },
 
+  /** Save many takes of one script in one request (e.g. takes recorded offline). Results are per take, in order. */
+  async saveRecordingsBatch(
+    scriptId: number,
+    takes: Array<{ audioBlob: Blob; lineIndex: number; phraseText: string }>
+  ): Promise<SaveRecordingBatchResult> {
+    const formData = new FormData()
+    formData.append('script_id', scriptId.toString())
+    for (const take of takes) {
+      formData.append('audio_files', take.audioBlob, 'recording.wav')
+      formData.append('line_indexes', take.lineIndex.toString())
+      formData.append('phrase_texts', take.phraseText)
+    }
+
+    return fetchAPI('/recording/save-batch', {
+      method: 'POST',
+      body: formData,
+      auth: true,
+    })
+  },
+
+  /** One page of the user's recordings, ordered by script then line. Pass next_cursor back for the next page. */
+  async listRecordingsPage(
+    filters: RecordingListFilters = {},
+    cursor?: string | null,
+    limit = 500
+  ): Promise<RecordingListPage> {
+    const params = new URLSearchParams({ limit: String(limit) })
+    if (filters.scriptId !== undefined) params.set('script_id', String(filters.scriptId))
+    if (filters.isValid !== undefined) params.set('is_valid', String(filters.isValid))
+    if (filters.createdAfter) params.set('created_after', filters.createdAfter)
+    if (filters.createdBefore) params.set('created_before', filters.createdBefore)
+    if (cursor) params.set('cursor', cursor)
+    return fetchAPI(`/recording/list?${params}`, { auth: true })
+  },
+
+  /** All of the user's recordings (optionally for one script), fetched page by page. */
   async listRecordings(scriptId?: number): Promise<Recording[]> {
-    const params = scriptId !== undefined ? `?script_id=${scriptId}` : ''
-    return fetchAPI(`/recording/list${params}`, { auth: true })
+    const recordings: Recording[] = []
+    let cursor: string | null = null
+    do {
+      const page: RecordingListPage = await this.listRecordingsPage({ scriptId }, cursor, 1000)
+      recordings.push(...page.items)
+      cursor = page.next_cursor
+    } while (cursor)
+    return recordings
   },
 
   async getRecordingProgress(): Promise<RecordingProgress[]> {
     return fetchAPI('/recording/progress', { auth: true })
   },
 
+  /** Which lines of a script the user has recorded, and the first unrecorded line at or after start. */
+  async getRecordedLines(scriptId: number, start = 0): Promise<RecordedLines> {
+    return fetchAPI(`/recording/progress/${scriptId}/lines?start=${start}`, { auth: true })
+  },
+
   // User settings (per-account audio profile)
   async getUserSettings(): Promise<UserSettings> {
     return fetchAPI('/user/settings', { auth: true })
@@ -276,7 +396,8 @@ export const api = {
     const zip = new JSZip()
     for (const rec of recordings) {
       const blob = await this.fetchRecordingAudio(rec.id, rec.storage_path)
-      const safeName = `${rec.script_name}_${String(rec.line_index + 1).padStart(4, '0')}.wav`
+      const ext = blob.type === 'audio/flac' || rec.storage_path?.endsWith('.flac') ? 'flac' : 'wav'
+      const safeName = `${rec.script_name}_${String(rec.line_index + 1).padStart(4, '0')}.${ext}`
         .replace(/[^a-zA-Z0-9_.-]/g, '_')
       zip.file(safeName, blob)
     }
@@ -1,12 +1,21 @@
 # Kuiper TTS API Server
 # FastAPI server for audio recording web application
 
+import asyncio
+import base64
+import functools
+import hashlib
+import json
 import logging
+import os
+import re
 import sys
+import time
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 from contextlib import asynccontextmanager
-from time import time
+from datetime import datetime, timezone
+from email.utils import format_datetime
 
 # Add parent directories to path for imports
 _current_dir = Path(__file__).parent.resolve()
@@ -15,11 +24,29 @@ _backend_dir = _current_dir.parent
 if str(_backend_dir) not in sys.path:
     sys.path.insert(0, str(_backend_dir))
 
-import subprocess
 import tempfile
 
+from core.audio_processor import EXTENDED_METRICS, MAX_DURATION_SECONDS
+from core.batch_analysis import REPORT_FORMATS, analyze_file, analyze_stream, failure_row, render_report, summarize
 from core.config import get_settings
-from core.audio_processor import analyze_wav_bytes
+from core import tts
+from core.auth import KeysUnavailableError, TokenError, TokenVerifier
+from core.cache import DiskCache, SingleFlight, cache_stats
+from core.codecs import STORAGE_FORMATS, CodecUnavailableError, encode, flac_available, format_of_path, negotiate, transcode_file
+from core.export import ARCHIVE_FORMATS, ExportItem, stream_archive
+from core.jobs import JOB_STATUSES, Job, JobQueue, JobRunner
+from core import metrics
+from core.ratelimit import RateLimiter, create_rate_limiter
+from core.tts_engines import TTSError, TTSTimeoutError, TTSUnavailableError
+from core.upload_sessions import (
+    ChecksumMismatchError,
+    OffsetMismatchError,
+    UploadSession,
+    UploadSessionNotFoundError,
+    UploadSessionStore,
+)
+from core.uploads import SpooledUpload, UploadTooLargeError, analyze_payload, canonicalize, spool_upload
+from core.workers import PoolSaturatedError, pool_stats, run_cpu, run_io, shutdown_pools
 
 settings = get_settings()
 
@@ -31,11 +58,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger('kuiper.api')
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request, status, Depends
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request, Query, status, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response, JSONResponse
+from fastapi.responses import FileResponse, Response, JSONResponse, StreamingResponse
 from fastapi.exceptions import RequestValidationError
 from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 import db
@@ -50,8 +78,29 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     logger.info("Starting Kuiper TTS API server...")
     # Supabase client is initialized lazily in db.py
+    try:
+        await tts.start_engine()
+    except TTSUnavailableError as e:
+        logger.warning(f"TTS engine unavailable: {e}")
+    if settings.storage_format == "flac" and not flac_available():
+        logger.warning("KUIPER_STORAGE_FORMAT=flac but soundfile/libsndfile is missing; storing WAV")
+    upload_gc = asyncio.create_task(_collect_upload_sessions())
+    jwks_refresh = asyncio.create_task(_refresh_signing_keys())
+    job_runner = asyncio.create_task(_run_jobs())
     yield
     logger.info("Shutting down Kuiper TTS API server...")
+    upload_gc.cancel()
+    jwks_refresh.cancel()
+    job_runner.cancel()
+    if _job_runner is not None:
+        await _job_runner.stop()
+    if _job_queue is not None:
+        _job_queue.close()
+    await db.close_db()
+    await tts.stop_engine()
+    if _rate_limiter is not None:
+        _rate_limiter.close()
+    shutdown_pools()
 
 
 app = FastAPI(
@@ -75,36 +124,165 @@ app.add_middleware(
 )
 
 
-# Rate limiting state
-_rate_limit_store: dict = {}
+def _create_rate_limiter() -> Optional[RateLimiter]:
+    if not settings.is_production or settings.rate_limit_per_minute <= 0:
+        return None
+    path = settings.rate_limit_db_path or os.path.join(tempfile.gettempdir(), "kuiper-ratelimit.sqlite3")
+    return create_rate_limiter(settings.rate_limit_backend, settings.rate_limit_per_minute, 60.0, path)
 
 
-@app.middleware("http")
-async def rate_limit_middleware(request: Request, call_next):
-    """Simple rate limiting middleware."""
-    if settings.is_production and settings.rate_limit_per_minute > 0:
-        client_ip = request.client.host if request.client else "unknown"
-        current_time = time()
-        minute_ago = current_time - 60
+_rate_limiter = _create_rate_limiter()
 
-        if client_ip not in _rate_limit_store:
-            _rate_limit_store[client_ip] = []
 
-        _rate_limit_store[client_ip] = [
-            t for t in _rate_limit_store[client_ip] if t > minute_ago
-        ]
+class RateLimitMiddleware:
+    """Per-client-IP request limit (sliding one-minute window)."""
+
+    def __init__(self, app, limiter: Optional[RateLimiter]):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.limiter is None:
+            await self.app(scope, receive, send)
+            return
 
-        if len(_rate_limit_store[client_ip]) >= settings.rate_limit_per_minute:
-            return JSONResponse(
+        client = scope.get("client")
+        allowed, retry_after = await self.limiter.hit(client[0] if client else "unknown")
+        if not allowed:
+            response = JSONResponse(
                 status_code=429,
                 content={"detail": "Rate limit exceeded. Please try again later."},
-                headers=_cors_headers_for_request(request),
+                headers={"Retry-After": str(retry_after), **_cors_headers_for_request(Request(scope))},
             )
+            await response(scope, receive, send)
+            return
 
-        _rate_limit_store[client_ip].append(current_time)
+        await self.app(scope, receive, send)
 
-    response = await call_next(request)
-    return response
+
+app.add_middleware(RateLimitMiddleware, limiter=_rate_limiter)
+
+
+class BodySizeLimitMiddleware:
+    """Reject oversized request bodies without buffering them.
+
+    Checks Content-Length up front. For chunked bodies it counts bytes as they
+    arrive; once the limit is crossed it sends the 413 itself, tells the app
+    the client disconnected and discards whatever the app responds.
+    path_limits maps a path to its own (max_bytes, 413 detail), e.g. for
+    requests that carry many files.
+    """
+
+    def __init__(self, app, max_bytes: int, path_limits: Optional[Dict[str, Tuple[int, str]]] = None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes, detail = self.path_limits.get(
+            scope["path"], (self.max_bytes, f"File too large. Maximum size is {settings.max_upload_size_mb}MB"),
+        )
+        request = Request(scope)
+        response = JSONResponse(
+            status_code=413,
+            content={"detail": detail},
+            headers={"Connection": "close", **_cors_headers_for_request(request)},
+        )
+        content_length = request.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > max_bytes:
+            await response(scope, receive, send)
+            return
+
+        received = 0
+        rejected = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    rejected = True
+                    logger.warning(f"Rejected request body over {max_bytes} bytes: {scope['path']}")
+                    if not response_started:
+                        await response(scope, receive, send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if rejected:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        await self.app(scope, limited_receive, guarded_send)
+
+
+# Room for multipart boundaries and form fields on top of the file itself.
+# A save-batch carries up to batch_save_max_takes files, so it gets its own
+# total limit; each take is still held to max_upload_size_mb by the endpoint.
+BATCH_SAVE_MAX_MB = settings.batch_save_max_mb or settings.max_upload_size_mb * settings.batch_save_max_takes
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.max_upload_size_mb * 1024 * 1024 + 1024 * 1024,
+    path_limits={
+        "/api/recording/save-batch": (
+            BATCH_SAVE_MAX_MB * 1024 * 1024 + 1024 * 1024,
+            f"Batch too large. Maximum total size is {BATCH_SAVE_MAX_MB}MB; send fewer takes per batch",
+        ),
+    },
+)
+
+
+class MetricsMiddleware:
+    """Per-route latency histogram and in-flight gauge for every HTTP request.
+
+    Outermost, so rate-limited and oversized requests are counted too. The
+    route label is the path template ("/api/recordings/{recording_id}/audio"),
+    or "unmatched" when no route handled the request, to keep cardinality
+    bounded. Streaming responses are timed until their last byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            metrics.REQUEST_SECONDS.observe(
+                elapsed, scope["method"], getattr(route, "path", "unmatched"), str(status),
+            )
+
+
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
 
 
 # ============================================================================
@@ -131,13 +309,27 @@ def _cors_headers_for_request(request: Request) -> dict:
     return {}
 
 
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request: Request, exc: PoolSaturatedError):
+    logger.warning(f"HTTP 503: {exc}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please retry"},
+        headers={"Retry-After": str(exc.retry_after), **_cors_headers_for_request(request)},
+    )
+
+
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+    # Routes turn unexpected errors into a 500; a saturated worker pool
+    # underneath is temporary, so it is answered as a 503 with Retry-After
+    if exc.status_code == 500 and isinstance(exc.__context__, PoolSaturatedError):
+        return await pool_saturated_handler(request, exc.__context__)
     logger.warning(f"HTTP {exc.status_code}: {exc.detail}")
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
-        headers=_cors_headers_for_request(request),
+        headers={**(exc.headers or {}), **_cors_headers_for_request(request)},
     )
 
 
@@ -177,22 +369,33 @@ def require_admin(request: Request):
 # JWT Auth for Recording Endpoints (JWKS / ECC P-256)
 # ============================================================================
 
-_jwks_client = None
+_token_verifier: Optional[TokenVerifier] = None
 
 
-def _get_jwks_client():
-    """Lazy-init JWKS client for Supabase JWT verification (JWKS / ECC P-256)."""
-    global _jwks_client
-    if _jwks_client is None:
+def _get_token_verifier() -> TokenVerifier:
+    """Lazy-init verifier for Supabase JWTs (JWKS / ECC P-256)."""
+    global _token_verifier
+    if _token_verifier is None:
         if not settings.supabase_url:
             raise HTTPException(503, "SUPABASE_URL not configured")
         jwks_url = settings.supabase_url.rstrip("/") + "/auth/v1/.well-known/jwks.json"
-        from jwt import PyJWKClient
-        _jwks_client = PyJWKClient(jwks_url, cache_keys=True, lifespan=600)
-    return _jwks_client
+        _token_verifier = TokenVerifier(jwks_url, cache_entries=settings.auth_cache_entries)
+    return _token_verifier
+
+
+async def _refresh_signing_keys():
+    """Fetch the JWKS at startup and then periodically, off the request path."""
+    if not settings.supabase_url:
+        return
+    while True:
+        try:
+            await _get_token_verifier().refresh_async(run_io)
+        except Exception as e:
+            logger.warning(f"JWKS refresh failed: {e}")
+        await asyncio.sleep(settings.jwks_refresh_interval)
 
 
-def get_current_user_id(request: Request) -> str:
+async def get_current_user_id(request: Request) -> str:
     """Extract user_id from Supabase JWT (JWKS/ECC). Required for recording endpoints."""
     auth_header = request.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
@@ -203,23 +406,13 @@ def get_current_user_id(request: Request) -> str:
         raise HTTPException(401, "Invalid authorization token.")
 
     try:
-        import jwt
-        client = _get_jwks_client()
-        signing_key = client.get_signing_key_from_jwt(token)
-        payload = jwt.decode(
-            token,
-            signing_key.key,
-            algorithms=["RS256", "ES256"],
-            audience="authenticated",
-            options={"verify_aud": True},
-        )
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(401, "Invalid token: missing user id")
-        return str(user_id)
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(401, "Session expired. Please sign in again.")
-    except jwt.InvalidTokenError as e:
+        return await _get_token_verifier().verify(token, run_io)
+    except KeysUnavailableError as e:
+        logger.warning(str(e))
+        raise HTTPException(503, "Authentication is temporarily unavailable. Please retry shortly.")
+    except TokenError as e:
+        if e.expired:
+            raise HTTPException(401, "Session expired. Please sign in again.")
         logger.debug(f"JWT verification failed: {e}")
         raise HTTPException(401, "Invalid or expired token. Please sign in again.")
 
@@ -228,13 +421,22 @@ def get_current_user_id(request: Request) -> str:
 # Request/Response Models
 # ============================================================================
 
-class ScriptResponse(BaseModel):
+class ScriptSummaryResponse(BaseModel):
     id: int
     name: str
-    lines: List[str]
     line_count: int
     created_at: Optional[str] = None
 
+class ScriptResponse(ScriptSummaryResponse):
+    lines: List[str]
+
+class ScriptLinesResponse(BaseModel):
+    script_id: int
+    offset: int
+    limit: int
+    total: int
+    lines: List[str]
+
 class CreateScriptRequest(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
     lines: List[str] = Field(..., min_length=1)
@@ -258,6 +460,19 @@ class RecordingListItem(BaseModel):
     is_valid: bool
     storage_path: Optional[str] = None
     created_at: Optional[str] = None
+    file_size_bytes: Optional[int] = None  # as stored
+    original_size_bytes: Optional[int] = None  # as uploaded; None before sizes were tracked
+    # Frame-based metrics; None for recordings saved before they were computed
+    noise_floor_db: Optional[float] = None
+    snr_db: Optional[float] = None
+    clipped_ratio: Optional[float] = None
+    leading_silence_seconds: Optional[float] = None
+    trailing_silence_seconds: Optional[float] = None
+    dc_offset: Optional[float] = None
+
+class RecordingListPage(BaseModel):
+    items: List[RecordingListItem]
+    next_cursor: Optional[str] = None  # pass back as cursor for the next page; None on the last
 
 class RecordingProgressResponse(BaseModel):
     script_id: int
@@ -267,6 +482,14 @@ class RecordingProgressResponse(BaseModel):
     remaining: int
     percent: float  # Allows 0.1, 0.2 for small progress; display with 1 decimal when < 1
 
+class RecordedLinesResponse(BaseModel):
+    script_id: int
+    total: int
+    recorded: int
+    # base64 bitset, bit i (LSB first within each byte) set when line i has a take
+    bitmap: str
+    next_unrecorded: Optional[int] = None  # None when every line is recorded
+
 class SaveRecordingResponse(BaseModel):
     success: bool
     id: Optional[int] = None
@@ -275,7 +498,58 @@ class SaveRecordingResponse(BaseModel):
     peak_amplitude: float = 0
     rms_level: float = 0
     is_valid: bool = False
+    file_size_bytes: Optional[int] = None  # as stored
+    original_size_bytes: Optional[int] = None  # as uploaded
+    noise_floor_db: Optional[float] = None
+    snr_db: Optional[float] = None
+    clipped_ratio: Optional[float] = None
+    leading_silence_seconds: Optional[float] = None
+    trailing_silence_seconds: Optional[float] = None
+    dc_offset: Optional[float] = None
     error: Optional[str] = None
+    # Background job that will normalize / re-encode the stored take (KUIPER_POST_PROCESSING)
+    job_id: Optional[int] = None
+
+
+class SaveRecordingBatchItem(SaveRecordingResponse):
+    line_index: int
+
+class SaveRecordingBatchResponse(BaseModel):
+    script_id: int
+    saved: int
+    failed: int
+    items: List[SaveRecordingBatchItem]  # in request order
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    key: Optional[str] = None
+    payload: dict
+    status: str  # queued, running, done or failed
+    attempts: int
+    max_attempts: int
+    run_at: float  # epoch seconds; when a queued job is next due
+    created_at: float
+    updated_at: float
+    last_error: Optional[str] = None
+
+class JobListResponse(BaseModel):
+    counts: dict  # jobs per status
+    jobs: List[JobResponse]
+
+class CreateUploadRequest(BaseModel):
+    script_id: int
+    line_index: int
+    phrase_text: str = Field(..., min_length=1)
+    size: int = Field(..., ge=1)  # total bytes
+    sha256: Optional[str] = Field(None, pattern="^[0-9a-fA-F]{64}$")  # of the whole file
+
+class UploadSessionResponse(BaseModel):
+    upload_id: str
+    offset: int  # bytes received; the next chunk starts here
+    size: int
+    max_chunk_bytes: int
+    expires_at: str  # if no further chunk arrives
 
 
 class UserSettings(BaseModel):
@@ -308,47 +582,100 @@ async def health_check():
         "status": "healthy",
         "version": "2.0.0",
         "environment": settings.environment,
+        "workers": pool_stats(),
+        "caches": cache_stats(),
+        "tts": tts.tts_cache_stats(),
+        "rate_limiter": await run_io(_rate_limiter.stats) if _rate_limiter is not None else None,
+        "upload_sessions": await run_io(_upload_sessions.stats) if _upload_sessions is not None else None,
+        "auth": _token_verifier.stats() if _token_verifier is not None else None,
+        "jobs": await run_io(_job_runner.stats) if _job_runner is not None else None,
     }
 
 
+def _collect_metrics():
+    """Gauges and counters read from the stats the components already keep."""
+    caches = cache_stats()
+    yield ("kuiper_cache_hits_total", "counter", "Cache lookups that hit.",
+           [({"cache": name}, c["hits"]) for name, c in caches.items()])
+    yield ("kuiper_cache_misses_total", "counter", "Cache lookups that missed.",
+           [({"cache": name}, c["misses"]) for name, c in caches.items()])
+    yield ("kuiper_cache_hit_ratio", "gauge", "Hits / lookups since start.",
+           [({"cache": name}, c["hit_ratio"]) for name, c in caches.items()])
+    yield ("kuiper_cache_evictions_total", "counter", "Entries evicted to stay within the cache's bound.",
+           [({"cache": name}, c["evictions"]) for name, c in caches.items()])
+
+    pools = pool_stats()
+    yield ("kuiper_worker_pool_running", "gauge", "Tasks running on a worker pool.",
+           [({"pool": name}, p["running"]) for name, p in pools.items()])
+    yield ("kuiper_worker_pool_queued", "gauge", "Tasks waiting for a worker pool slot.",
+           [({"pool": name}, p["queued"]) for name, p in pools.items()])
+    yield ("kuiper_worker_pool_rejected_total", "counter", "Tasks refused because the pool queue was full.",
+           [({"pool": name}, p["rejected"]) for name, p in pools.items()])
+
+    if _rate_limiter is not None:
+        yield ("kuiper_rate_limit_requests_total", "counter", "Requests checked by the rate limiter, by outcome.",
+               [({"result": "allowed"}, _rate_limiter.allowed), ({"result": "rejected"}, _rate_limiter.rejected)])
+
+    yield ("kuiper_tts_synthesized_total", "counter", "Pronunciations synthesized (not served from cache).",
+           [({}, tts.synthesized)])
+
+    if _job_runner is not None:
+        runner = _job_runner.stats()
+        yield ("kuiper_jobs_in_flight", "gauge", "Background jobs running in this worker.",
+               [({}, runner["in_flight"])])
+        yield ("kuiper_jobs", "gauge", "Background jobs in the queue, by status.",
+               [({"status": state}, n) for state, n in runner["jobs"].items()])
+        yield ("kuiper_job_failed_attempts_total", "counter", "Job attempts that raised (and were retried or failed).",
+               [({}, runner["failed_attempts"])])
+
+
+metrics.register_collector(_collect_metrics)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint(request: Request):
+    """Prometheus scrape endpoint (text exposition format). Needs the admin key,
+    or the scrape token as a bearer token when KUIPER_METRICS_TOKEN is set."""
+    if not settings.metrics_enabled:
+        raise HTTPException(404, "Not Found")
+    token = settings.metrics_token
+    if not token or request.headers.get("Authorization") != f"Bearer {token}":
+        require_admin(request)
+    return Response(content=await run_io(metrics.render), media_type=metrics.CONTENT_TYPE)
+
+
 # ============================================================================
 # TTS Pronunciation (espeak-ng)
 # ============================================================================
 
 @app.get("/api/tts/pronounce")
-async def tts_pronounce(request: Request, text: str = "", lang: str = "en"):
-    """Synthesize text to speech using espeak-ng. Returns WAV audio."""
+async def tts_pronounce(request: Request, text: str = "", lang: str = "en", voice: str = ""):
+    """Synthesize text to speech using espeak-ng. Returns WAV audio.
+
+    Results are cached by (text, lang, voice); the ETag is the cache key, so
+    revalidation never needs to synthesize.
+    """
     if not text or not text.strip():
         raise HTTPException(400, "Text is required")
-    text_clean = text.strip()[:500]
+    if not tts.valid_voice_name(lang) or (voice and not tts.valid_voice_name(voice)):
+        raise HTTPException(400, "Invalid lang or voice")
+    key = tts.cache_key(text, lang, voice)
+    headers = {
+        "ETag": f'"{key}"',
+        "Cache-Control": "public, max-age=3600",
+        **_cors_headers_for_request(request),
+    }
+    if _if_none_match(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
     try:
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            out_path = f.name
-        try:
-            subprocess.run(
-                ["espeak-ng", "-w", out_path, "-v", f"{lang}", text_clean],
-                check=True,
-                capture_output=True,
-                timeout=10,
-            )
-            with open(out_path, "rb") as f:
-                audio_data = f.read()
-            return Response(
-                content=audio_data,
-                media_type="audio/wav",
-                headers={
-                    "Cache-Control": "public, max-age=3600",
-                    **_cors_headers_for_request(request),
-                },
-            )
-        finally:
-            Path(out_path).unlink(missing_ok=True)
-    except subprocess.TimeoutExpired:
+        audio_data = await tts.pronounce(text, lang, voice, key=key)
+        return Response(content=audio_data, media_type="audio/wav", headers=headers)
+    except TTSTimeoutError:
         raise HTTPException(504, "TTS synthesis timed out")
-    except FileNotFoundError:
+    except TTSUnavailableError:
         logger.warning("espeak-ng not installed, TTS unavailable")
         raise HTTPException(503, "TTS (espeak-ng) is not available")
-    except subprocess.CalledProcessError as e:
+    except TTSError as e:
         logger.error(f"espeak-ng failed: {e}")
         raise HTTPException(500, "TTS synthesis failed")
 
@@ -357,40 +684,63 @@ async def tts_pronounce(request: Request, text: str = "", lang: str = "en"):
 # Scripts Routes
 # ============================================================================
 
+def _if_none_match(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match header matches etag (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [c.strip().removeprefix("W/") for c in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _json_with_etag(request: Request, payload) -> Response:
+    """Serialize payload once, tag it with a content hash and honour If-None-Match.
+    Clients revalidate on every use (no-cache) and get a body-less 304 when unchanged."""
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        **_cors_headers_for_request(request),
+    }
+    if _if_none_match(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _script_summary(script: dict) -> dict:
+    return ScriptSummaryResponse(
+        id=script["id"],
+        name=script["name"],
+        line_count=script["line_count"],
+        created_at=str(script.get("created_at", "")),
+    ).model_dump()
+
+
 @app.get("/api/scripts", response_model=List[ScriptResponse])
-async def list_scripts():
-    """List all available scripts."""
+async def list_scripts(request: Request, summary: bool = False):
+    """List all available scripts. With ?summary=true, omit each script's lines
+    (use /api/scripts/{id}/lines to page through them)."""
     try:
         scripts = await db.list_scripts()
-        return [
-            ScriptResponse(
-                id=s["id"],
-                name=s["name"],
-                lines=s["lines"],
-                line_count=s["line_count"],
-                created_at=str(s.get("created_at", "")),
-            )
-            for s in scripts
-        ]
+        if summary:
+            payload = [_script_summary(s) for s in scripts]
+        else:
+            payload = [{**_script_summary(s), "lines": s["lines"]} for s in scripts]
+        return _json_with_etag(request, payload)
     except Exception as e:
         logger.error(f"Failed to list scripts: {e}")
         raise HTTPException(500, f"Failed to list scripts: {e}")
 
 
 @app.get("/api/scripts/{script_id}", response_model=ScriptResponse)
-async def get_script(script_id: int):
+async def get_script(script_id: int, request: Request):
     """Get a specific script by ID."""
     try:
         script = await db.get_script(script_id)
         if not script:
             raise HTTPException(404, "Script not found")
-        return ScriptResponse(
-            id=script["id"],
-            name=script["name"],
-            lines=script["lines"],
-            line_count=script["line_count"],
-            created_at=str(script.get("created_at", "")),
-        )
+        return _json_with_etag(request, {**_script_summary(script), "lines": script["lines"]})
     except HTTPException:
         raise
     except Exception as e:
@@ -398,6 +748,34 @@ async def get_script(script_id: int):
         raise HTTPException(500, f"Failed to get script: {e}")
 
 
+@app.get("/api/scripts/{script_id}/lines", response_model=ScriptLinesResponse)
+async def get_script_lines(
+    script_id: int,
+    request: Request,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Get a page of a script's lines."""
+    try:
+        script = await db.get_script(script_id)
+        if not script:
+            raise HTTPException(404, "Script not found")
+        lines = script["lines"]
+        page = ScriptLinesResponse(
+            script_id=script["id"],
+            offset=offset,
+            limit=limit,
+            total=len(lines),
+            lines=lines[offset:offset + limit],
+        )
+        return _json_with_etag(request, page.model_dump())
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get script lines: {e}")
+        raise HTTPException(500, f"Failed to get script lines: {e}")
+
+
 # ============================================================================
 # Admin Scripts Routes
 # ============================================================================
@@ -509,10 +887,334 @@ async def create_script_from_file(
         raise HTTPException(500, f"Failed to create script: {e}")
 
 
+@app.get("/api/admin/recordings", response_model=List[RecordingListItem])
+async def admin_list_recordings(
+    request: Request,
+    script_id: Optional[int] = None,
+    recorder_name: Optional[str] = None,
+    is_valid: Optional[bool] = None,
+    min_snr_db: Optional[float] = None,
+    max_noise_floor_db: Optional[float] = None,
+    max_clipped_ratio: Optional[float] = None,
+    max_leading_silence: Optional[float] = None,
+    max_trailing_silence: Optional[float] = None,
+):
+    """List recordings filtered by the stored quality metrics (admin only).
+
+    Bounds apply to the columns saved with each take, so no audio is
+    downloaded; recordings saved before the metrics existed never match one.
+    Every match is returned: rows are read in pages, past PostgREST's max-rows.
+    """
+    require_admin(request)
+    min_values = {"snr_db": min_snr_db}
+    max_values = {
+        "noise_floor_db": max_noise_floor_db,
+        "clipped_ratio": max_clipped_ratio,
+        "leading_silence_seconds": max_leading_silence,
+        "trailing_silence_seconds": max_trailing_silence,
+    }
+    try:
+        recordings = db.iter_recordings(
+            script_id=script_id,
+            recorder_name=recorder_name,
+            columns=_LIST_COLUMNS,
+            is_valid=is_valid,
+            min_values={k: v for k, v in min_values.items() if v is not None},
+            max_values={k: v for k, v in max_values.items() if v is not None},
+        )
+        items = [_recording_list_item(r) async for r in recordings]
+        return sorted(items, key=lambda item: (item.script_id, item.line_index))
+    except Exception as e:
+        logger.error(f"Failed to list recordings: {e}")
+        raise HTTPException(500, f"Failed to list recordings: {e}")
+
+
+# Only what the export needs; the default embed repeats every script's lines per row
+_EXPORT_COLUMNS = "id, storage_path, phrase_text, is_valid, file_size_bytes, peak_amplitude, rms_level, content_sha256"
+
+
+async def _fetch_recording_copy(storage_path: str, cache_key: str = "") -> Tuple[Path, bool]:
+    """A recording's audio for bulk jobs: the cached copy if there is one,
+    otherwise a temp file the caller deletes (bool True). Unlike playback it
+    never fills the cache, so a bulk pass does not flush it."""
+    cache = _audio_cache if _audio_cache is not None else await run_io(_get_audio_cache)
+    if cache is not None and cache_key:
+        path = await run_io(cache.lookup, cache_key)
+        if path is not None:
+            return path, False
+    fd, name = await run_io(tempfile.mkstemp, prefix="kuiper-bulk-", suffix=".wav")
+    os.close(fd)
+    try:
+        await db.download_recording_audio(storage_path, name)
+    except BaseException:
+        os.unlink(name)
+        raise
+    return Path(name), True
+
+
+async def _export_fetch(item: ExportItem, fmt: str = "wav") -> Tuple[Path, bool]:
+    path, temporary = await _fetch_recording_copy(item.storage_path, item.cache_key)
+    if format_of_path(item.storage_path) == fmt:
+        return path, temporary
+    fd, name = await run_io(tempfile.mkstemp, prefix="kuiper-bulk-", suffix=f".{fmt}")
+    os.close(fd)
+    try:
+        await run_cpu(transcode_file, str(path), name, fmt)
+    except BaseException:
+        os.unlink(name)
+        raise
+    finally:
+        if temporary:
+            path.unlink(missing_ok=True)
+    return Path(name), True
+
+
+@app.get("/api/admin/export")
+async def export_dataset(
+    request: Request,
+    script_id: Optional[int] = None,
+    recorder_name: Optional[str] = None,
+    format: str = Query("tar", pattern="^(tar|zip)$"),
+    include_invalid: bool = False,
+    audio: str = Query("wav", pattern="^(wav|flac)$"),
+):
+    """Download recordings as an LJSpeech-style archive (admin only).
+
+    The archive holds wavs/0001.wav, ... and a pipe-delimited metadata.csv
+    (`0001.wav|phrase text`). It is streamed while audio is fetched a few
+    recordings ahead, so memory stays flat however large the dataset is.
+    Only recordings flagged is_valid are included unless include_invalid.
+    audio=flac writes wavs/0001.flac, ... instead; recordings stored in the
+    other format are transcoded on the way.
+    """
+    require_admin(request)
+
+    async def export_items():
+        async for r in db.iter_recordings(script_id=script_id, recorder_name=recorder_name, columns=_EXPORT_COLUMNS):
+            if r.get("storage_path") and (include_invalid or r.get("is_valid", True)):
+                yield ExportItem(
+                    recording_id=r["id"],
+                    storage_path=r["storage_path"],
+                    text=r.get("phrase_text", ""),
+                    cache_key=_recording_etag(r),
+                )
+
+    # Rows are read a page at a time as the archive is written; the first
+    # item is read up front so an empty export is still a 404
+    items = export_items()
+    try:
+        total = await db.count_recordings(script_id=script_id, recorder_name=recorder_name)
+        first = await items.__anext__()
+    except StopAsyncIteration:
+        raise HTTPException(404, "No recordings to export")
+    except Exception as e:
+        logger.error(f"Failed to list recordings for export: {e}")
+        raise HTTPException(500, f"Failed to export recordings: {e}")
+
+    async def all_items():
+        yield first
+        async for item in items:
+            yield item
+
+    parts = ["kuiper"]
+    if script_id is not None:
+        parts.append(f"script{script_id}")
+    if recorder_name:
+        parts.append(re.sub(r"[^\w\-]", "_", recorder_name.strip())[:40])
+    filename = "_".join(parts) + f".{format}"
+    return StreamingResponse(
+        stream_archive(
+            all_items(),
+            functools.partial(_export_fetch, fmt=audio),
+            fmt=format,
+            prefetch=settings.export_prefetch,
+            extension=audio,
+            total=total,
+        ),
+        media_type=ARCHIVE_FORMATS[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            **_cors_headers_for_request(request),
+        },
+    )
+
+
+_ANALYSIS_COLUMNS = "id, storage_path, file_size_bytes, peak_amplitude, rms_level, content_sha256"
+
+
+async def _analyze_storage_path(storage_path: str, cache_key: str, slots: asyncio.Semaphore) -> dict:
+    async with slots:
+        try:
+            path, temporary = await _fetch_recording_copy(storage_path, cache_key)
+        except PoolSaturatedError:
+            raise
+        except Exception as e:
+            return failure_row(storage_path, f"Download failed: {e}")
+        try:
+            return await run_cpu(analyze_file, str(path), storage_path)
+        finally:
+            if temporary:
+                path.unlink(missing_ok=True)
+
+
+@app.post("/api/admin/analyze")
+async def analyze_recordings(
+    request: Request,
+    files: List[UploadFile] = File(default=[]),
+    storage_paths: List[str] = Form(default=[]),
+    script_id: Optional[int] = Form(None),
+    recorder_name: Optional[str] = Form(None),
+    format: str = Form("csv", pattern="^(csv|jsonl|parquet)$"),
+):
+    """Quality report for many recordings at once (admin only).
+
+    Analyzes uploaded WAV files, explicit storage paths, and/or every stored
+    recording matching script_id / recorder_name, in parallel, and returns
+    one row per file: the AudioInfo fields plus the failure reason.
+    X-Analysis-Summary carries the valid / invalid / failed counts.
+    """
+    require_admin(request)
+    try:
+        targets = [(p, "") for p in storage_paths if p]
+        if script_id is not None or recorder_name:
+            async for r in db.iter_recordings(
+                script_id=script_id,
+                recorder_name=recorder_name,
+                columns=_ANALYSIS_COLUMNS,
+            ):
+                if r.get("storage_path"):
+                    targets.append((r["storage_path"], _recording_etag(r)))
+        if not files and not targets:
+            raise HTTPException(400, "Nothing to analyze: send files, storage_paths, script_id or recorder_name")
+
+        rows = [await run_io(analyze_stream, f.file, f.filename or "upload.wav") for f in files]
+        slots = asyncio.Semaphore(max(1, settings.analysis_concurrency))
+        rows += await asyncio.gather(*(_analyze_storage_path(p, key, slots) for p, key in targets))
+        content = await run_cpu(render_report, rows, format)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    except Exception as e:
+        logger.error(f"Batch analysis failed: {e}")
+        raise HTTPException(500, f"Failed to analyze recordings: {e}")
+
+    return Response(
+        content=content,
+        media_type=REPORT_FORMATS[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="kuiper_analysis.{format}"',
+            "X-Analysis-Summary": json.dumps(summarize(rows)),
+            **_cors_headers_for_request(request),
+        },
+    )
+
+
 # ============================================================================
 # Recording Routes
 # ============================================================================
 
+async def _get_script_line(script_id: int, line_index: int) -> dict:
+    """The script, or HTTP 400 if it or the line does not exist."""
+    script = await db.get_script(script_id)
+    if not script:
+        raise HTTPException(400, "Script not found")
+    if line_index < 0 or line_index >= script["line_count"]:
+        raise HTTPException(400, f"Invalid line index {line_index} for script with {script['line_count']} lines")
+    return script
+
+
+async def _analyze_upload(upload: SpooledUpload) -> None:
+    """WAV analysis of a spooled upload, on the CPU pool (KUIPER_CPU_POOL);
+    the read that spooled it stays on the I/O pool."""
+    with metrics.stage_timer("save.analyze"):
+        upload.audio_info = await run_cpu(analyze_payload, upload.payload)
+
+
+async def _encode_for_storage(upload: SpooledUpload) -> None:
+    """Apply KUIPER_NORMALIZE_UPLOADS and KUIPER_STORAGE_FORMAT to an analyzed upload."""
+    # Optionally trim and re-encode before storing; longer takes are rejected
+    # as invalid anyway and are kept as uploaded rather than decoded in memory
+    if settings.normalize_uploads and 0 < upload.audio_info.duration_seconds <= MAX_DURATION_SECONDS:
+        try:
+            upload.replace(*await run_cpu(canonicalize, upload.payload))
+        except ValueError as e:
+            logger.warning(f"Storing upload unchanged, could not normalize it: {e}")
+
+    # Lossless compression for storage; the analysis above still applies
+    if settings.storage_format == "flac" and upload.audio_info.sample_rate > 0:
+        try:
+            upload.replace(await run_cpu(encode, upload.payload, "flac"), format="flac")
+        except (ValueError, CodecUnavailableError) as e:
+            logger.warning(f"Storing upload as WAV, could not encode FLAC: {e}")
+
+
+def _recording_take(script: dict, line_index: int, phrase_text: str, upload: SpooledUpload) -> dict:
+    """db.save_recording / db.save_recordings arguments for one encoded upload."""
+    audio_info = upload.audio_info
+    return {
+        "line_index": line_index,
+        "phrase_text": phrase_text.strip(),
+        "filename": f"{script['name']}_{(line_index + 1):04d}.{upload.format}",
+        "audio_data": upload.payload,
+        "duration_seconds": audio_info.duration_seconds,
+        "peak_amplitude": audio_info.peak_amplitude,
+        "rms_level": audio_info.rms_level,
+        "is_valid": audio_info.is_valid,
+        "metrics": audio_info.extended_metrics(),
+        "original_size_bytes": upload.original_size or upload.size,
+        "content_type": STORAGE_FORMATS[upload.format],
+    }
+
+
+def _saved_response(record: dict, upload: SpooledUpload) -> SaveRecordingResponse:
+    audio_info = upload.audio_info
+    return SaveRecordingResponse(
+        success=True,
+        id=record.get("id"),
+        storage_path=record.get("storage_path"),
+        duration_seconds=audio_info.duration_seconds,
+        peak_amplitude=audio_info.peak_amplitude,
+        rms_level=audio_info.rms_level,
+        is_valid=audio_info.is_valid,
+        file_size_bytes=upload.size,
+        original_size_bytes=upload.original_size or upload.size,
+        **audio_info.extended_metrics(),
+    )
+
+
+async def _store_upload(
+    user_id: str,
+    script_id: int,
+    line_index: int,
+    phrase_text: str,
+    upload: SpooledUpload,
+) -> SaveRecordingResponse:
+    """Validate, optionally re-encode and store an analyzed upload. Shared by
+    the single-request save and resumable upload finalize."""
+    if upload.size == 0:
+        return SaveRecordingResponse(success=False, error="Empty audio data received")
+
+    if not phrase_text or not phrase_text.strip():
+        return SaveRecordingResponse(success=False, error="Phrase text is required")
+
+    script = await _get_script_line(script_id, line_index)
+    if not _defer_post_processing():
+        with metrics.stage_timer("save.encode"):
+            await _encode_for_storage(upload)
+    take = _recording_take(script, line_index, phrase_text, upload)
+
+    # Save to Supabase (storage + metadata). Use user_id as recorder_name for uniqueness.
+    with metrics.stage_timer("save.store"):
+        record = await db.save_recording(script_id=script_id, recorder_name=user_id, user_id=user_id, **take)
+
+    logger.info(f"Saved recording: user={user_id} {take['filename']} ({upload.audio_info.duration_seconds:.2f}s)")
+    response = _saved_response(record, upload)
+    if _defer_post_processing():
+        response.job_id = await _enqueue_post_processing(record)
+    return response
+
+
 @app.post("/api/recording/save", response_model=SaveRecordingResponse)
 async def save_recording(
     request: Request,
@@ -522,109 +1224,398 @@ async def save_recording(
     phrase_text: str = Form(...),
 ):
     """Save an uploaded audio recording. User is identified from JWT (Authorization header)."""
-    user_id = get_current_user_id(request)
+    user_id = await get_current_user_id(request)
+    upload = None
     try:
-        # Validate file size
+        # Read in chunks on the I/O pool, enforcing the size limit; large files
+        # are spooled to disk and streamed to storage from there. The WAV is
+        # then analyzed on the CPU pool.
         max_size_bytes = settings.max_upload_size_mb * 1024 * 1024
-        audio_data = await audio_file.read()
+        with metrics.stage_timer("save.read"):
+            upload = await run_io(
+                spool_upload,
+                audio_file.file,
+                max_size_bytes,
+                settings.upload_memory_limit_mb * 1024 * 1024,
+                analyze=False,
+            )
+        await _analyze_upload(upload)
+        return await _store_upload(user_id, script_id, line_index, phrase_text, upload)
+    except HTTPException:
+        raise
+    except UploadTooLargeError:
+        raise HTTPException(413, f"File too large. Maximum size is {settings.max_upload_size_mb}MB")
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to save recording: {e}")
+        return SaveRecordingResponse(success=False, error=str(e))
+    finally:
+        if upload is not None:
+            upload.cleanup()
 
-        if len(audio_data) > max_size_bytes:
-            raise HTTPException(413, f"File too large. Maximum size is {settings.max_upload_size_mb}MB")
 
-        if len(audio_data) == 0:
-            return SaveRecordingResponse(success=False, error="Empty audio data received")
+@app.post("/api/recording/save-batch", response_model=SaveRecordingBatchResponse)
+async def save_recording_batch(
+    request: Request,
+    script_id: int = Form(...),
+    audio_files: List[UploadFile] = File(...),
+    line_indexes: List[int] = Form(...),
+    phrase_texts: List[str] = Form(...),
+):
+    """
+    Save many takes of one script in one request (e.g. syncing takes
+    recorded offline). audio_files, line_indexes and phrase_texts are
+    parallel lists. Takes are analyzed and uploaded concurrently, rows are
+    written with one bulk upsert, and each item reports its own result.
+    Each take may be up to KUIPER_MAX_UPLOAD_SIZE_MB and the whole request
+    up to KUIPER_BATCH_SAVE_MAX_MB; a larger request is rejected with 413.
+    """
+    user_id = await get_current_user_id(request)
+    count = len(audio_files)
+    if len(line_indexes) != count or len(phrase_texts) != count:
+        raise HTTPException(400, "audio_files, line_indexes and phrase_texts must have the same length")
+    if count > settings.batch_save_max_takes:
+        raise HTTPException(400, f"At most {settings.batch_save_max_takes} takes per batch")
+
+    script = await db.get_script(script_id)
+    if not script:
+        raise HTTPException(400, "Script not found")
+
+    items: List[Optional[SaveRecordingBatchItem]] = [None] * count
+    uploads: List[Optional[SpooledUpload]] = [None] * count
+    slots = asyncio.Semaphore(max(1, settings.batch_save_concurrency))
+    max_size_bytes = settings.max_upload_size_mb * 1024 * 1024
+
+    def fail(i: int, error: str) -> None:
+        items[i] = SaveRecordingBatchItem(line_index=line_indexes[i], success=False, error=error)
+
+    async def prepare(i: int) -> None:
+        async with slots:
+            try:
+                upload = uploads[i] = await run_io(
+                    spool_upload,
+                    audio_files[i].file,
+                    max_size_bytes,
+                    settings.upload_memory_limit_mb * 1024 * 1024,
+                    analyze=False,
+                )
+                if upload.size == 0:
+                    return fail(i, "Empty audio data received")
+                await _analyze_upload(upload)
+                if not _defer_post_processing():
+                    await _encode_for_storage(upload)
+            except UploadTooLargeError:
+                fail(i, f"File too large. Maximum size is {settings.max_upload_size_mb}MB")
+            except Exception as e:
+                fail(i, str(e))
+
+    seen = set()
+    for i, line_index in enumerate(line_indexes):
+        if line_index < 0 or line_index >= script["line_count"]:
+            fail(i, f"Invalid line index {line_index} for script with {script['line_count']} lines")
+        elif line_index in seen:
+            fail(i, f"Duplicate line index {line_index} in batch")
+        elif not phrase_texts[i].strip():
+            fail(i, "Phrase text is required")
+        seen.add(line_index)
 
-        if not phrase_text or not phrase_text.strip():
-            return SaveRecordingResponse(success=False, error="Phrase text is required")
+    try:
+        await asyncio.gather(*(prepare(i) for i in range(count) if items[i] is None))
+        pending = [i for i in range(count) if items[i] is None]
+        takes = [_recording_take(script, line_indexes[i], phrase_texts[i], uploads[i]) for i in pending]
+        results = await db.save_recordings(
+            script_id, user_id, takes, user_id=user_id, concurrency=settings.batch_save_concurrency,
+        ) if takes else []
+        for i, result in zip(pending, results):
+            if isinstance(result, Exception):
+                fail(i, str(result))
+            else:
+                items[i] = SaveRecordingBatchItem(
+                    line_index=line_indexes[i], **_saved_response(result, uploads[i]).model_dump(),
+                )
+                if _defer_post_processing():
+                    items[i].job_id = await _enqueue_post_processing(result)
+    except Exception as e:
+        logger.error(f"Failed to save recording batch: {e}")
+        for i in range(count):
+            if items[i] is None:
+                fail(i, str(e))
+    finally:
+        for upload in uploads:
+            if upload is not None:
+                upload.cleanup()
 
-        # Verify script exists
-        script = await db.get_script(script_id)
-        if not script:
-            raise HTTPException(400, "Script not found")
+    saved = sum(1 for item in items if item.success)
+    logger.info(f"Saved recording batch: user={user_id} script={script_id} {saved}/{count} takes")
+    return SaveRecordingBatchResponse(script_id=script_id, saved=saved, failed=count - saved, items=items)
 
-        if line_index < 0 or line_index >= script["line_count"]:
-            raise HTTPException(400, f"Invalid line index {line_index} for script with {script['line_count']} lines")
 
-        # Analyze the WAV data
-        audio_info = analyze_wav_bytes(audio_data)
+# ============================================================================
+# Resumable Uploads (init, PUT chunks by offset, finalize)
+# ============================================================================
 
-        # Generate filename
-        filename = f"{script['name']}_{(line_index + 1):04d}.wav"
+_upload_sessions: Optional[UploadSessionStore] = None
 
-        # Save to Supabase (storage + metadata). Use user_id as recorder_name for uniqueness.
-        record = await db.save_recording(
-            script_id=script_id,
-            line_index=line_index,
-            phrase_text=phrase_text.strip(),
-            recorder_name=user_id,
-            filename=filename,
-            audio_data=audio_data,
-            duration_seconds=audio_info.duration_seconds,
-            peak_amplitude=audio_info.peak_amplitude,
-            rms_level=audio_info.rms_level,
-            is_valid=audio_info.is_valid,
-            user_id=user_id,
+
+def _get_upload_sessions() -> UploadSessionStore:
+    """Session staging directory (blocking on first use)."""
+    global _upload_sessions
+    if _upload_sessions is None:
+        directory = settings.upload_session_dir or os.path.join(tempfile.gettempdir(), "kuiper-uploads")
+        _upload_sessions = UploadSessionStore(
+            directory, settings.max_upload_size_mb * 1024 * 1024, settings.upload_session_ttl,
         )
+    return _upload_sessions
+
+
+async def _collect_upload_sessions():
+    """Remove abandoned upload sessions, at startup and then periodically."""
+    interval = min(3600.0, max(60.0, settings.upload_session_ttl / 4))
+    while True:
+        try:
+            store = _upload_sessions if _upload_sessions is not None else await run_io(_get_upload_sessions)
+            removed = await run_io(store.collect_garbage)
+            if removed:
+                logger.info(f"Removed {len(removed)} abandoned upload session(s)")
+        except Exception as e:
+            logger.warning(f"Upload session cleanup failed: {e}")
+        await asyncio.sleep(interval)
+
+
+def _upload_session_response(session: UploadSession) -> UploadSessionResponse:
+    expires = datetime.fromtimestamp(session.updated_at + settings.upload_session_ttl, timezone.utc)
+    return UploadSessionResponse(
+        upload_id=session.id,
+        offset=session.offset,
+        size=session.size,
+        max_chunk_bytes=settings.upload_chunk_max_mb * 1024 * 1024,
+        expires_at=expires.isoformat(),
+    )
 
-        logger.info(f"Saved recording: user={user_id} {filename} ({audio_info.duration_seconds:.2f}s)")
 
-        return SaveRecordingResponse(
-            success=True,
-            id=record.get("id"),
-            storage_path=record.get("storage_path"),
-            duration_seconds=audio_info.duration_seconds,
-            peak_amplitude=audio_info.peak_amplitude,
-            rms_level=audio_info.rms_level,
-            is_valid=audio_info.is_valid,
+def _upload_session_http_error(e: Exception) -> HTTPException:
+    if isinstance(e, UploadSessionNotFoundError):
+        return HTTPException(404, "Upload session not found or expired")
+    if isinstance(e, OffsetMismatchError):
+        return HTTPException(409, str(e), headers={"Upload-Offset": str(e.offset)})
+    if isinstance(e, ChecksumMismatchError):
+        return HTTPException(422, str(e))
+    if isinstance(e, UploadTooLargeError):
+        return HTTPException(413, str(e))
+    logger.error(f"Upload session error: {e}")
+    return HTTPException(500, f"Upload failed: {e}")
+
+
+@app.post("/api/recording/uploads", response_model=UploadSessionResponse)
+async def create_upload(request: Request, request_data: CreateUploadRequest):
+    """
+    Start a resumable upload of one take. Send the bytes with PUT
+    /api/recording/uploads/{id}?offset=N (any chunk size up to
+    max_chunk_bytes), then POST .../finalize to save the recording.
+    """
+    user_id = await get_current_user_id(request)
+    try:
+        await _get_script_line(request_data.script_id, request_data.line_index)
+        store = _upload_sessions if _upload_sessions is not None else await run_io(_get_upload_sessions)
+        session = await run_io(
+            store.create,
+            user_id,
+            request_data.script_id,
+            request_data.line_index,
+            request_data.phrase_text,
+            request_data.size,
+            request_data.sha256,
         )
     except HTTPException:
         raise
+    except UploadTooLargeError:
+        raise HTTPException(413, f"File too large. Maximum size is {settings.max_upload_size_mb}MB")
+    except Exception as e:
+        raise _upload_session_http_error(e)
+    return _upload_session_response(session)
+
+
+@app.get("/api/recording/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def get_upload(upload_id: str, request: Request):
+    """Current offset of an upload, to resume after a dropped connection."""
+    user_id = await get_current_user_id(request)
+    try:
+        store = _upload_sessions if _upload_sessions is not None else await run_io(_get_upload_sessions)
+        session = await run_io(store.get, upload_id, user_id)
+    except Exception as e:
+        raise _upload_session_http_error(e)
+    return _upload_session_response(session)
+
+
+@app.put("/api/recording/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def put_upload_chunk(upload_id: str, request: Request, offset: int = Query(..., ge=0)):
+    """
+    Write the request body at offset. A chunk may repeat bytes already
+    received (a retry) but may not leave a gap; 409 carries the server's
+    offset in Upload-Offset. An X-Chunk-SHA256 header (hex) is verified
+    before anything is written.
+    """
+    user_id = await get_current_user_id(request)
+    limit = settings.upload_chunk_max_mb * 1024 * 1024
+    parts, size = [], 0
+    async for piece in request.stream():
+        size += len(piece)
+        if size > limit:
+            raise HTTPException(413, f"Chunk too large. Maximum size is {settings.upload_chunk_max_mb}MB")
+        parts.append(piece)
+    if not size:
+        raise HTTPException(400, "Empty chunk")
+    try:
+        store = _upload_sessions if _upload_sessions is not None else await run_io(_get_upload_sessions)
+        session = await run_io(
+            store.write_chunk, upload_id, user_id, offset, b"".join(parts), request.headers.get("x-chunk-sha256"),
+        )
+    except Exception as e:
+        raise _upload_session_http_error(e)
+    return _upload_session_response(session)
+
+
+@app.post("/api/recording/uploads/{upload_id}/finalize", response_model=SaveRecordingResponse)
+async def finalize_upload(upload_id: str, request: Request):
+    """
+    Verify and analyze the staged file and save it like /api/recording/save.
+    The session is kept if saving fails, so finalize can be retried without
+    sending the audio again.
+    """
+    user_id = await get_current_user_id(request)
+    upload = None
+    try:
+        store = _upload_sessions if _upload_sessions is not None else await run_io(_get_upload_sessions)
+        session = await run_io(store.get, upload_id, user_id)
+        upload = await run_io(store.assemble, upload_id, user_id, False)
+    except Exception as e:
+        if isinstance(e, ChecksumMismatchError):
+            await run_io(store.discard, upload_id)
+        raise _upload_session_http_error(e)
+    try:
+        await _analyze_upload(upload)
+        response = await _store_upload(user_id, session.script_id, session.line_index, session.phrase_text, upload)
+        if response.success:
+            await run_io(store.discard, upload_id)
+        return response
+    except (HTTPException, PoolSaturatedError):
+        raise
     except Exception as e:
         logger.error(f"Failed to save recording: {e}")
         return SaveRecordingResponse(success=False, error=str(e))
+    finally:
+        if upload is not None:
+            upload.cleanup()
 
 
-@app.get("/api/recording/list", response_model=List[RecordingListItem])
+@app.delete("/api/recording/uploads/{upload_id}")
+async def delete_upload(upload_id: str, request: Request):
+    """Abandon an upload and free its staged bytes."""
+    user_id = await get_current_user_id(request)
+    try:
+        store = _upload_sessions if _upload_sessions is not None else await run_io(_get_upload_sessions)
+        await run_io(store.get, upload_id, user_id)
+        await run_io(store.discard, upload_id)
+    except Exception as e:
+        raise _upload_session_http_error(e)
+    return {"success": True}
+
+
+# The RecordingListItem fields; "*, scripts(name, lines)" repeated every
+# script's lines in each row
+_LIST_COLUMNS = ", ".join((
+    "id, script_id, line_index, recorder_name, phrase_text, filename, duration_seconds",
+    "peak_amplitude, rms_level, is_valid, storage_path, created_at, file_size_bytes, original_size_bytes",
+    *EXTENDED_METRICS,
+    "scripts(name)",
+))
+
+
+def _recording_list_item(r: dict) -> RecordingListItem:
+    script_data = r.get("scripts", {})
+    script_name = script_data.get("name", "") if script_data else ""
+    phrase_text = r.get("phrase_text", "")
+    return RecordingListItem(
+        id=r["id"],
+        script_id=r["script_id"],
+        script_name=script_name,
+        line_index=r["line_index"],
+        recorder_name=r.get("recorder_name", ""),
+        phrase_text=phrase_text,
+        text=phrase_text,
+        filename=r["filename"],
+        duration_seconds=r.get("duration_seconds", 0),
+        peak_amplitude=r.get("peak_amplitude", 0),
+        rms_level=r.get("rms_level", 0),
+        is_valid=r.get("is_valid", True),
+        storage_path=r.get("storage_path"),
+        created_at=str(r.get("created_at", "")),
+        file_size_bytes=r.get("file_size_bytes"),
+        original_size_bytes=r.get("original_size_bytes"),
+        **{name: r.get(name) for name in EXTENDED_METRICS},
+    )
+
+
+def _encode_list_cursor(script_id: int, line_index: int) -> str:
+    return base64.urlsafe_b64encode(f"{script_id},{line_index}".encode()).decode().rstrip("=")
+
+
+def _decode_list_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        script_id, line_index = raw.split(",")
+        return int(script_id), int(line_index)
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+
+
+@app.get("/api/recording/list", response_model=RecordingListPage)
 async def list_recordings(
     request: Request,
     script_id: Optional[int] = None,
+    is_valid: Optional[bool] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=1000),
 ):
-    """List recordings for the authenticated user, optionally filtered by script."""
-    user_id = get_current_user_id(request)
-    try:
-        recordings = await db.list_recordings(script_id=script_id, recorder_name=user_id)
-        items = []
-        for r in recordings:
-            script_data = r.get("scripts", {})
-            script_name = script_data.get("name", "") if script_data else ""
-            phrase_text = r.get("phrase_text", "")
-
-            items.append(RecordingListItem(
-                id=r["id"],
-                script_id=r["script_id"],
-                script_name=script_name,
-                line_index=r["line_index"],
-                recorder_name=r.get("recorder_name", ""),
-                phrase_text=phrase_text,
-                text=phrase_text,
-                filename=r["filename"],
-                duration_seconds=r.get("duration_seconds", 0),
-                peak_amplitude=r.get("peak_amplitude", 0),
-                rms_level=r.get("rms_level", 0),
-                is_valid=r.get("is_valid", True),
-                storage_path=r.get("storage_path"),
-                created_at=str(r.get("created_at", "")),
-            ))
-        return items
+    """
+    List the authenticated user's recordings a page at a time, in
+    (script_id, line_index) order, optionally filtered by script, validity
+    and creation time (created_after inclusive, created_before exclusive).
+
+    Pages are keyset-based: pass next_cursor back as cursor until it is null.
+    Takes saved or deleted between pages do not shift the ones not yet read.
+    """
+    user_id = await get_current_user_id(request)
+    after = _decode_list_cursor(cursor) if cursor else None
+    try:
+        recordings = await db.list_recordings(
+            script_id=script_id,
+            recorder_name=user_id,
+            columns=_LIST_COLUMNS,
+            is_valid=is_valid,
+            after=after,
+            limit=limit + 1,
+            created_from=created_after.isoformat() if created_after else None,
+            created_to=created_before.isoformat() if created_before else None,
+        )
     except Exception as e:
         logger.error(f"Failed to list recordings: {e}")
         raise HTTPException(500, f"Failed to list recordings: {e}")
+    # One row past the page tells whether there is another
+    page = recordings[:limit]
+    next_cursor = None
+    if len(recordings) > limit:
+        next_cursor = _encode_list_cursor(page[-1]["script_id"], page[-1]["line_index"])
+    return RecordingListPage(items=[_recording_list_item(r) for r in page], next_cursor=next_cursor)
 
 
 @app.get("/api/recording/progress", response_model=List[RecordingProgressResponse])
 async def get_recording_progress(request: Request):
     """Get recording progress for the authenticated user."""
-    user_id = get_current_user_id(request)
+    user_id = await get_current_user_id(request)
     try:
         progress = await db.get_recording_progress(recorder_name=user_id)
         return [
@@ -635,10 +1626,155 @@ async def get_recording_progress(request: Request):
         raise HTTPException(500, f"Failed to get recording progress: {e}")
 
 
+@app.get("/api/recording/progress/{script_id}/lines", response_model=RecordedLinesResponse)
+async def get_recorded_lines(script_id: int, request: Request, start: int = Query(0, ge=0)):
+    """
+    Which lines of a script the authenticated user has recorded, as a bitset,
+    plus the first unrecorded line at or after start (wrapping to the top).
+    Served from a per-(user, script) index instead of listing recordings.
+    """
+    user_id = await get_current_user_id(request)
+    try:
+        script = await db.get_script(script_id)
+        if not script:
+            raise HTTPException(404, "Script not found")
+        lines = await db.get_recorded_lines(script_id, user_id)
+        total = script["line_count"]
+        payload = RecordedLinesResponse(
+            script_id=script_id,
+            total=total,
+            recorded=lines.count_below(total),
+            bitmap=lines.to_base64(total),
+            next_unrecorded=lines.next_missing(total, start),
+        )
+        return _json_with_etag(request, payload.model_dump())
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get recorded lines: {e}")
+        raise HTTPException(500, f"Failed to get recorded lines: {e}")
+
+
+_audio_cache: Optional[DiskCache] = None
+_audio_fills = SingleFlight()
+
+
+def _get_audio_cache() -> Optional[DiskCache]:
+    """Local read-through cache for recording audio (blocking on first use)."""
+    global _audio_cache
+    if _audio_cache is None and settings.audio_cache_max_mb > 0:
+        directory = settings.audio_cache_dir or os.path.join(tempfile.gettempdir(), "kuiper-audio")
+        _audio_cache = DiskCache("audio_disk", directory, settings.audio_cache_max_mb * 1024 * 1024)
+    return _audio_cache
+
+
+def _recording_etag(record: dict) -> str:
+    """Strong validator (and audio cache key) for a recording's audio: the
+    stored object's content_sha256. Rows saved before migration 006 have
+    none; the storage path is reused when a line is re-recorded, so for
+    those the take's levels are mixed in with its size to tell takes apart."""
+    if record.get("content_sha256"):
+        return record["content_sha256"]
+    material = "|".join(str(record.get(k)) for k in (
+        "storage_path", "file_size_bytes", "peak_amplitude", "rms_level",
+    ))
+    return hashlib.sha1(material.encode()).hexdigest()
+
+
+def _http_date(timestamp: Optional[str]) -> Optional[str]:
+    if not timestamp:
+        return None
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return format_datetime(parsed.astimezone(timezone.utc), usegmt=True)
+
+
+async def _fill_audio_cache(cache: DiskCache, key: str, storage_path: str) -> Path:
+    tmp_path = await run_io(cache.reserve)
+    try:
+        await db.download_recording_audio(storage_path, str(tmp_path))
+        return await run_io(cache.commit, key, tmp_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+async def _local_recording_file(storage_path: str, key: str) -> Tuple[Path, bool]:
+    """
+    A local file holding the recording's audio: from the disk cache, filled
+    from storage on a miss (concurrent misses share one download). With the
+    cache disabled it is a temp file; the bool says the caller must delete it.
+    """
+    cache = _audio_cache if _audio_cache is not None else await run_io(_get_audio_cache)
+    if cache is None:
+        fd, name = tempfile.mkstemp(prefix="kuiper-audio-", suffix=".wav")
+        os.close(fd)
+        try:
+            await db.download_recording_audio(storage_path, name)
+        except BaseException:
+            os.unlink(name)
+            raise
+        return Path(name), True
+
+    path = await run_io(cache.lookup, key)
+    if path is None:
+        path = await _audio_fills.run(key, _fill_audio_cache, cache, key, storage_path)
+    return path, False
+
+
+async def _fill_transcoded(cache: DiskCache, variant: str, storage_path: str, key: str, fmt: str) -> Path:
+    src, _ = await _local_recording_file(storage_path, key)
+    tmp_path = await run_io(cache.reserve)
+    try:
+        await run_cpu(transcode_file, str(src), str(tmp_path), fmt)
+        return await run_io(cache.commit, variant, tmp_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+async def _recording_file_as(storage_path: str, key: str, fmt: str) -> Tuple[Path, bool]:
+    """_local_recording_file() in the requested format. A recording stored in
+    the other format is transcoded once and the result cached under its own key."""
+    if format_of_path(storage_path) == fmt:
+        return await _local_recording_file(storage_path, key)
+
+    cache = _audio_cache if _audio_cache is not None else await run_io(_get_audio_cache)
+    if cache is None:
+        src, temporary = await _local_recording_file(storage_path, key)
+        fd, name = tempfile.mkstemp(prefix="kuiper-audio-", suffix=f".{fmt}")
+        os.close(fd)
+        try:
+            await run_cpu(transcode_file, str(src), name, fmt)
+        except BaseException:
+            os.unlink(name)
+            raise
+        finally:
+            if temporary:
+                src.unlink(missing_ok=True)
+        return Path(name), True
+
+    variant = f"{key}-{fmt}"
+    path = await run_io(cache.lookup, variant)
+    if path is None:
+        path = await _audio_fills.run(variant, _fill_transcoded, cache, variant, storage_path, key, fmt)
+    return path, False
+
+
 @app.get("/api/recordings/{recording_id}/audio")
 async def get_recording_audio(recording_id: int, request: Request):
-    """Stream recording audio. Requires auth; user must own the recording."""
-    user_id = get_current_user_id(request)
+    """Stream recording audio. Requires auth; user must own the recording.
+
+    Supports Range requests (206) for seeking and ETag revalidation (304).
+    Audio is served from a local disk cache filled from storage on first use.
+    WAV or FLAC is chosen from Accept; without a preference the stored
+    format is sent as is.
+    """
+    user_id = await get_current_user_id(request)
     try:
         record = await db.get_recording(recording_id)
         if not record:
@@ -656,16 +1792,30 @@ async def get_recording_audio(recording_id: int, request: Request):
         if not storage_path:
             raise HTTPException(404, "Recording audio not found")
 
-        audio_data = await db.get_recording_audio(storage_path)
+        key = _recording_etag(record)
+        fmt = negotiate(request.headers.get("accept"), format_of_path(storage_path))
+        filename = Path(record["filename"]).with_suffix(f".{fmt}").name
         headers = {
-            "Content-Disposition": f'inline; filename="{record["filename"]}"',
-            "Cache-Control": "public, max-age=3600",
+            "ETag": f'"{key}"' if fmt == "wav" else f'"{key}-{fmt}"',
+            "Content-Disposition": f'inline; filename="{filename}"',
+            # Private: the response depends on the caller's token. no-cache:
+            # revalidate on every play, which is a 304 when unchanged.
+            "Cache-Control": "private, no-cache",
+            "Vary": "Accept",
             **_cors_headers_for_request(request),
         }
-        return Response(
-            content=audio_data,
-            media_type="audio/wav",
+        last_modified = _http_date(record.get("created_at"))
+        if last_modified:
+            headers["Last-Modified"] = last_modified
+        if _if_none_match(request, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+        path, temporary = await _recording_file_as(storage_path, key, fmt)
+        return FileResponse(
+            path,
+            media_type=STORAGE_FORMATS[fmt],
             headers=headers,
+            background=BackgroundTask(path.unlink, missing_ok=True) if temporary else None,
         )
     except HTTPException:
         raise
@@ -674,6 +1824,187 @@ async def get_recording_audio(recording_id: int, request: Request):
         raise HTTPException(500, f"Failed to serve audio: {e}")
 
 
+# ============================================================================
+# Background Jobs (post-processing of saved takes)
+# ============================================================================
+# With KUIPER_POST_PROCESSING=background a take is stored as uploaded and
+# the save responds at once; a job then normalizes / re-encodes it per
+# KUIPER_NORMALIZE_UPLOADS and KUIPER_STORAGE_FORMAT and swaps the stored
+# object. Jobs are keyed by recording and content hash, so a retried save
+# does not queue the same work twice.
+
+_job_queue: Optional[JobQueue] = None
+_job_runner: Optional[JobRunner] = None
+
+POST_PROCESS_JOB = "post_process_recording"
+
+
+def _get_job_queue() -> JobQueue:
+    """The SQLite job queue (blocking on first use)."""
+    global _job_queue
+    if _job_queue is None:
+        path = settings.job_queue_path or os.path.join(tempfile.gettempdir(), "kuiper-jobs.sqlite3")
+        _job_queue = JobQueue(
+            path,
+            max_attempts=settings.job_max_attempts,
+            retry_base=settings.job_retry_base,
+            retry_max=settings.job_retry_max,
+        )
+    return _job_queue
+
+
+async def _run_jobs():
+    """Drain the job queue for the life of the app."""
+    global _job_runner
+    while True:
+        try:
+            queue = _job_queue if _job_queue is not None else await run_io(_get_job_queue)
+            break
+        except Exception as e:
+            logger.error(f"Job queue unavailable, retrying: {e}")
+            await asyncio.sleep(30)
+    _job_runner = JobRunner(
+        queue,
+        {POST_PROCESS_JOB: _post_process_recording},
+        run_io,
+        concurrency=settings.job_concurrency,
+    )
+    await _job_runner.run()
+
+
+def _defer_post_processing() -> bool:
+    """Whether saves leave normalization / re-encoding to a background job."""
+    return settings.post_processing == "background" and (
+        settings.normalize_uploads or settings.storage_format == "flac"
+    )
+
+
+async def _enqueue_post_processing(record: dict) -> Optional[int]:
+    """Queue post-processing of a saved take; returns the job id. A queue
+    failure only leaves the take stored as uploaded, so it does not fail the save."""
+    recording_id, content_sha256 = record.get("id"), record.get("content_sha256")
+    if recording_id is None or not content_sha256:
+        return None
+    try:
+        queue = _job_queue if _job_queue is not None else await run_io(_get_job_queue)
+        job = await run_io(
+            queue.enqueue,
+            POST_PROCESS_JOB,
+            {"recording_id": recording_id, "content_sha256": content_sha256},
+            f"{POST_PROCESS_JOB}:{recording_id}:{content_sha256}",
+        )
+    except Exception as e:
+        logger.error(f"Failed to queue post-processing of recording {recording_id}: {e}")
+        return None
+    if _job_runner is not None:
+        _job_runner.wake()
+    return job.id
+
+
+def _read_stored_take(path: str) -> SpooledUpload:
+    with open(path, "rb") as f:
+        return spool_upload(
+            f,
+            settings.max_upload_size_mb * 1024 * 1024,
+            settings.upload_memory_limit_mb * 1024 * 1024,
+            analyze=False,
+        )
+
+
+async def _post_process_recording(payload: dict) -> None:
+    """Job handler: re-encode one stored take if it is still the current one."""
+    record = await db.get_recording(payload["recording_id"], columns="*")
+    if not record or record.get("content_sha256") != payload["content_sha256"]:
+        logger.info(f"Recording {payload['recording_id']} was deleted or re-recorded; nothing to post-process")
+        return
+    if format_of_path(record["storage_path"]) == "flac":
+        # Only ever stored as FLAC by a previous run of this job
+        return
+
+    fd, path = tempfile.mkstemp(prefix="kuiper-job-", suffix=".wav")
+    os.close(fd)
+    upload = None
+    try:
+        await db.download_recording_audio(record["storage_path"], path)
+        upload = await run_io(_read_stored_take, path)
+        await _analyze_upload(upload)
+        await _encode_for_storage(upload)
+        if upload.original_size is None:
+            return  # nothing to change (e.g. the audio could not be decoded)
+        audio_info = upload.audio_info
+        fields = {
+            "duration_seconds": audio_info.duration_seconds,
+            "peak_amplitude": audio_info.peak_amplitude,
+            "rms_level": audio_info.rms_level,
+            "is_valid": audio_info.is_valid,
+            **audio_info.extended_metrics(),
+        }
+        filename = f"{Path(record['filename']).stem}.{upload.format}"
+        replaced = await db.replace_recording_audio(
+            record, filename, upload.payload, STORAGE_FORMATS[upload.format], fields,
+        )
+        if replaced:
+            logger.info(f"Post-processed recording {record['id']}: {filename} ({upload.size} bytes)")
+        else:
+            logger.info(f"Recording {record['id']} was re-recorded during post-processing; kept the new take")
+    finally:
+        if upload is not None:
+            upload.cleanup()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def _job_response(job: Job) -> JobResponse:
+    return JobResponse(**job.to_dict())
+
+
+@app.get("/api/admin/jobs", response_model=JobListResponse)
+async def admin_list_jobs(
+    request: Request,
+    status: Optional[str] = Query(None, pattern=f"^({'|'.join(JOB_STATUSES)})$"),
+    kind: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=1000),
+):
+    """Background jobs, most recently updated first, with counts per status (admin only)."""
+    require_admin(request)
+    try:
+        queue = _job_queue if _job_queue is not None else await run_io(_get_job_queue)
+        jobs = await run_io(queue.list_jobs, status, kind, limit)
+        counts = await run_io(queue.counts)
+    except Exception as e:
+        logger.error(f"Failed to list jobs: {e}")
+        raise HTTPException(500, f"Failed to list jobs: {e}")
+    return JobListResponse(counts=counts, jobs=[_job_response(job) for job in jobs])
+
+
+@app.get("/api/admin/jobs/{job_id}", response_model=JobResponse)
+async def admin_get_job(job_id: int, request: Request):
+    """One background job (admin only)."""
+    require_admin(request)
+    queue = _job_queue if _job_queue is not None else await run_io(_get_job_queue)
+    job = await run_io(queue.get, job_id)
+    if job is None:
+        raise HTTPException(404, "Job not found")
+    return _job_response(job)
+
+
+@app.post("/api/admin/jobs/{job_id}/retry", response_model=JobResponse)
+async def admin_retry_job(job_id: int, request: Request):
+    """Re-queue a failed job with a fresh attempt budget (admin only)."""
+    require_admin(request)
+    queue = _job_queue if _job_queue is not None else await run_io(_get_job_queue)
+    job = await run_io(queue.retry, job_id)
+    if job is None:
+        raise HTTPException(404, "Job not found")
+    if job.status != "queued":
+        raise HTTPException(409, f"Only failed jobs can be retried (job is {job.status})")
+    if _job_runner is not None:
+        _job_runner.wake()
+    return _job_response(job)
+
+
 # ============================================================================
 # User Settings Routes
 # ============================================================================
@@ -681,7 +2012,7 @@ async def get_recording_audio(recording_id: int, request: Request):
 @app.get("/api/user/settings", response_model=UserSettings)
 async def get_user_settings_route(request: Request):
     """Get per-user audio settings (gain, bass, treble, device)."""
-    user_id = get_current_user_id(request)
+    user_id = await get_current_user_id(request)
     try:
         record = await db.get_user_settings(user_id)
         if not record:
@@ -701,7 +2032,7 @@ async def get_user_settings_route(request: Request):
 @app.put("/api/user/settings", response_model=UserSettings)
 async def update_user_settings_route(request: Request, settings_in: UserSettings):
     """Update per-user audio settings."""
-    user_id = get_current_user_id(request)
+    user_id = await get_current_user_id(request)
     try:
         record = await db.upsert_user_settings(
             user_id=user_id,
@@ -724,7 +2055,7 @@ async def update_user_settings_route(request: Request, settings_in: UserSettings
 @app.delete("/api/recordings/{recording_id}")
 async def delete_recording_route(recording_id: int, request: Request):
     """Delete a recording owned by the authenticated user."""
-    user_id = get_current_user_id(request)
+    user_id = await get_current_user_id(request)
     try:
         record = await db.get_recording(recording_id)
         if not record:
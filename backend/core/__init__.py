@@ -2,10 +2,11 @@
 
 SAMPLE_RATE = 22050
 
-from .audio_processor import AudioInfo, analyze_wav_bytes
+from .audio_processor import AudioInfo, WavStreamAnalyzer, analyze_wav_bytes
 
 __all__ = [
     "SAMPLE_RATE",
     "AudioInfo",
+    "WavStreamAnalyzer",
     "analyze_wav_bytes",
 ]
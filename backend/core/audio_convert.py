@@ -0,0 +1,231 @@
+# Audio Conversion
+# Decodes WAV bytes and converts them to training-ready mono 16-bit audio (numpy only)
+
+import hashlib
+import math
+from dataclasses import asdict, dataclass
+from typing import Tuple
+
+import numpy as np
+
+from . import SAMPLE_RATE
+
+# Bump when the conversion output changes so incremental builds redo everything
+CONVERT_VERSION = 1
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+_RESAMPLE_BLOCK = 16384
+
+
+@dataclass(frozen=True)
+class ConvertOptions:
+    """Target format and processing for convert_wav()."""
+
+    sample_rate: int = SAMPLE_RATE
+    trim_db: float = -40.0  # silence is quieter than the loudest frame by this much
+    trim_pad_ms: float = 100.0  # silence kept before the first / after the last voiced frame
+    target_dbfs: float = -20.0  # RMS of the voiced frames after normalization
+    peak_dbfs: float = -1.0  # normalization gain never pushes peaks above this
+    trim: bool = True
+    normalize: bool = True
+
+    def fingerprint(self) -> str:
+        """Stable hash of the options and converter version."""
+        params = sorted(asdict(self).items())
+        return hashlib.sha256(repr((CONVERT_VERSION, params)).encode()).hexdigest()[:16]
+
+
+@dataclass
+class ConvertedAudio:
+    """Result of convert_wav()."""
+
+    data: bytes
+    source_rate: int
+    source_channels: int
+    source_seconds: float
+    duration_seconds: float
+
+
+def decode_wav(data: bytes) -> Tuple[np.ndarray, int]:
+    """
+    Decode a PCM (8/16/24/32-bit) or IEEE float WAV file.
+
+    Returns (samples, sample_rate) with samples as float32 in [-1, 1],
+    shaped (frames, channels). Raises ValueError for anything else.
+    """
+    if len(data) < 12 or data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise ValueError("Not a valid WAV file")
+    pos = 12
+    fmt = None
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        size = int.from_bytes(data[pos + 4:pos + 8], "little")
+        body = pos + 8
+        if chunk_id == b'fmt ':
+            fmt = data[body:body + size]
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError("data chunk before fmt chunk")
+            return _decode_samples(fmt, data[body:body + size])
+        pos = body + size + (size & 1)
+    raise ValueError("fmt chunk and/or data chunk missing")
+
+
+def _decode_samples(fmt: bytes, raw: bytes) -> Tuple[np.ndarray, int]:
+    if len(fmt) < 16:
+        raise ValueError("fmt chunk too short")
+    format_tag = int.from_bytes(fmt[0:2], "little")
+    channels = int.from_bytes(fmt[2:4], "little")
+    sample_rate = int.from_bytes(fmt[4:8], "little")
+    bits = int.from_bytes(fmt[14:16], "little")
+    if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        format_tag = int.from_bytes(fmt[24:26], "little")
+    if channels == 0 or sample_rate == 0:
+        raise ValueError("bad channel count or sample rate")
+
+    width = (bits + 7) // 8
+    usable = len(raw) - len(raw) % (width * channels)
+    raw = raw[:usable]
+    if format_tag == WAVE_FORMAT_IEEE_FLOAT and width in (4, 8):
+        samples = np.frombuffer(raw, dtype="<f4" if width == 4 else "<f8").astype(np.float32)
+    elif format_tag != WAVE_FORMAT_PCM:
+        raise ValueError(f"unknown format: {format_tag}")
+    elif width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        samples = ints.astype(np.float32) / 8388608
+    elif width == 4:
+        samples = (np.frombuffer(raw, dtype="<i4") / 2147483648).astype(np.float32)
+    else:
+        raise ValueError(f"unsupported bit depth: {bits}")
+    return samples.reshape(-1, channels), sample_rate
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Encode mono float samples in [-1, 1] as a 16-bit PCM WAV file."""
+    pcm = np.clip(np.round(samples * 32767), -32768, 32767).astype("<i2").tobytes()
+    header = b"".join([
+        b"RIFF", (36 + len(pcm)).to_bytes(4, "little"), b"WAVE",
+        b"fmt ", (16).to_bytes(4, "little"),
+        WAVE_FORMAT_PCM.to_bytes(2, "little"), (1).to_bytes(2, "little"),
+        sample_rate.to_bytes(4, "little"), (sample_rate * 2).to_bytes(4, "little"),
+        (2).to_bytes(2, "little"), (16).to_bytes(2, "little"),
+        b"data", len(pcm).to_bytes(4, "little"),
+    ])
+    return header + pcm
+
+
+def to_mono(samples: np.ndarray) -> np.ndarray:
+    """Average (frames, channels) down to one channel."""
+    if samples.ndim == 1:
+        return samples
+    if samples.shape[1] == 1:
+        return samples[:, 0]
+    return samples.mean(axis=1, dtype=np.float32)
+
+
+def resample(
+    samples: np.ndarray,
+    src_rate: int,
+    dst_rate: int,
+    zero_crossings: int = 16,
+    rolloff: float = 0.945,
+    beta: float = 8.6,
+) -> np.ndarray:
+    """
+    Band-limited resampling of a mono signal (Kaiser-windowed sinc).
+
+    The rate ratio is reduced to up/down integers, so there are only `up`
+    distinct filter phases; they are tabulated once and applied to blocks
+    of output samples with a gather + dot product.
+    """
+    if src_rate == dst_rate or samples.size == 0:
+        return samples.astype(np.float32, copy=False)
+    g = math.gcd(src_rate, dst_rate)
+    up, down = dst_rate // g, src_rate // g
+    cutoff = min(1.0, dst_rate / src_rate) * rolloff
+    half = math.ceil(zero_crossings / cutoff)
+
+    # table[p, j]: weight of input base+offsets[j] for an output at base + p/up
+    offsets = np.arange(-half + 1, half + 1)
+    u = (np.arange(up) / up)[:, None] - offsets[None, :]
+    window = np.i0(beta * np.sqrt(np.clip(1 - (u / half) ** 2, 0, None))) / np.i0(beta)
+    table = cutoff * np.sinc(cutoff * u) * window
+    table = (table / table.sum(axis=1, keepdims=True)).astype(np.float32)
+
+    padded = np.concatenate([
+        np.zeros(half, np.float32), samples.astype(np.float32, copy=False), np.zeros(half + 1, np.float32),
+    ])
+    n_out = -(-samples.size * up // down)
+    out = np.empty(n_out, np.float32)
+    for start in range(0, n_out, _RESAMPLE_BLOCK):
+        pos = np.arange(start, min(start + _RESAMPLE_BLOCK, n_out), dtype=np.int64) * down
+        base, phase = pos // up, pos % up
+        taps = padded[base[:, None] + (offsets + half)[None, :]]
+        out[start:start + pos.size] = np.einsum("ij,ij->i", taps, table[phase])
+    return out
+
+
+def _frame_rms(samples: np.ndarray, frame: int) -> np.ndarray:
+    frames = samples.size // frame
+    if frames == 0:
+        return np.sqrt(np.mean(samples ** 2, keepdims=True))
+    blocks = samples[:frames * frame].reshape(frames, frame)
+    return np.sqrt(np.mean(blocks.astype(np.float64) ** 2, axis=1))
+
+
+def trim_silence(samples: np.ndarray, sample_rate: int, threshold_db: float = -40.0, pad_ms: float = 100.0) -> np.ndarray:
+    """Cut leading/trailing frames quieter than threshold_db below the loudest 20 ms frame."""
+    frame = max(1, sample_rate // 50)
+    rms = _frame_rms(samples, frame)
+    loudest = rms.max()
+    if loudest <= 0:
+        raise ValueError("Audio is silent")
+    voiced = np.flatnonzero(rms >= loudest * 10 ** (threshold_db / 20))
+    pad = int(sample_rate * pad_ms / 1000)
+    start = max(0, voiced[0] * frame - pad)
+    end = min(samples.size, (voiced[-1] + 1) * frame + pad)
+    return samples[start:end]
+
+
+def normalize_loudness(samples: np.ndarray, sample_rate: int, target_dbfs: float = -20.0, peak_dbfs: float = -1.0) -> np.ndarray:
+    """
+    Scale so the RMS of the voiced 20 ms frames (within 40 dB of the loudest)
+    hits target_dbfs, without letting the peak exceed peak_dbfs.
+    """
+    rms = _frame_rms(samples, max(1, sample_rate // 50))
+    loudest = rms.max()
+    peak = float(np.abs(samples).max()) if samples.size else 0.0
+    if loudest <= 0 or peak <= 0:
+        raise ValueError("Audio is silent")
+    voiced = rms[rms >= loudest * 0.01]
+    level = math.sqrt(float(np.mean(voiced ** 2)))
+    gain = min(10 ** (target_dbfs / 20) / level, 10 ** (peak_dbfs / 20) / peak)
+    return (samples * gain).astype(np.float32)
+
+
+def convert_wav(data: bytes, options: ConvertOptions = ConvertOptions()) -> ConvertedAudio:
+    """Decode, downmix, resample, trim and normalize one WAV file; raises ValueError if unusable."""
+    samples, rate = decode_wav(data)
+    channels = samples.shape[1]
+    source_seconds = samples.shape[0] / rate
+    mono = resample(to_mono(samples), rate, options.sample_rate)
+    if options.trim:
+        mono = trim_silence(mono, options.sample_rate, options.trim_db, options.trim_pad_ms)
+    if options.normalize:
+        mono = normalize_loudness(mono, options.sample_rate, options.target_dbfs, options.peak_dbfs)
+    return ConvertedAudio(
+        data=encode_wav(mono, options.sample_rate),
+        source_rate=rate,
+        source_channels=channels,
+        source_seconds=round(source_seconds, 3),
+        duration_seconds=round(mono.size / options.sample_rate, 3),
+    )
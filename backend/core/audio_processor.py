@@ -1,12 +1,14 @@
 # Audio Processor Module
 # Handles WAV audio analysis from bytes (no filesystem or microphone access)
 
-import io
-import wave
-import struct
 import math
+import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional
+
+import numpy as np
+
+from .metrics import STAGE_SECONDS
 
 
 @dataclass
@@ -21,89 +23,144 @@ class AudioInfo:
     peak_amplitude: float
     rms_level: float
     is_valid: bool
+    # Frame-based metrics; None when the audio could not be analyzed
+    noise_floor_db: Optional[float] = None
+    snr_db: Optional[float] = None
+    clipped_ratio: Optional[float] = None
+    leading_silence_seconds: Optional[float] = None
+    trailing_silence_seconds: Optional[float] = None
+    dc_offset: Optional[float] = None
     error: Optional[str] = None
 
+    def extended_metrics(self) -> Dict[str, Optional[float]]:
+        """The frame-based metrics, keyed by their recordings column name
+        (stored as NULL for audio that could not be analyzed)."""
+        return {name: getattr(self, name) for name in EXTENDED_METRICS}
+
+
+# Frame-based metrics stored next to peak_amplitude / rms_level
+EXTENDED_METRICS = (
+    "noise_floor_db",
+    "snr_db",
+    "clipped_ratio",
+    "leading_silence_seconds",
+    "trailing_silence_seconds",
+    "dc_offset",
+)
+
 
 # Quality thresholds
 MIN_DURATION_SECONDS = 0.5
 MAX_DURATION_SECONDS = 30.0
 MIN_RMS_LEVEL = 0.01
 CLIPPING_THRESHOLD = 0.99
+MAX_CLIPPED_RATIO = 0.001  # a take clips when more than 0.1% of samples reach the threshold
 
+# Frame analysis
+FRAME_SECONDS = 0.02
+SILENCE_THRESHOLD_DB = -40.0  # frames this far below the loudest frame count as silence
+NOISE_PERCENTILE = 10  # noise floor: this percentile of frame levels
+SPEECH_PERCENTILE = 95  # speech level, for SNR
+LEVEL_FLOOR_DB = -100.0  # level reported for digital silence
 
-def analyze_wav_bytes(data: bytes) -> AudioInfo:
-    """
-    Analyze WAV audio data from bytes.
 
-    Args:
-        data: Raw WAV file bytes (including header)
+# PCM sample layout per supported bit depth: (numpy dtype, zero offset, full scale)
+_PCM_FORMATS = {
+    8: (np.uint8, 128, 128.0),
+    16: (np.dtype("<i2"), 0, 32768.0),
+}
 
-    Returns:
-        AudioInfo with file properties and quality metrics
+
+def _invalid(error: str) -> AudioInfo:
+    return AudioInfo(
+        sample_rate=0, channels=0, duration_seconds=0,
+        samples=0, bit_depth=0, peak_amplitude=0,
+        rms_level=0, is_valid=False,
+        error=error,
+    )
+
+
+def _db(level: np.ndarray) -> np.ndarray:
+    return 20 * np.log10(np.maximum(level, 10 ** (LEVEL_FLOOR_DB / 20)))
+
+
+class _FrameMetrics:
     """
-    if len(data) < 44:
-        return AudioInfo(
-            sample_rate=0, channels=0, duration_seconds=0,
-            samples=0, bit_depth=0, peak_amplitude=0,
-            rms_level=0, is_valid=False,
-            error="Audio data too small to be a valid WAV file"
-        )
+    Short-time energy over fixed frames, accumulated chunk by chunk.
 
-    # Check WAV header
-    if data[:4] != b'RIFF' or data[8:12] != b'WAVE':
-        return AudioInfo(
-            sample_rate=0, channels=0, duration_seconds=0,
-            samples=0, bit_depth=0, peak_amplitude=0,
-            rms_level=0, is_valid=False,
-            error="Not a valid WAV file"
-        )
+    Each chunk of centered, interleaved samples is handled in one
+    vectorized pass (frame energies, running sum, and a clipped-sample
+    count only when the chunk reaches the threshold); a partial frame is
+    carried over to the next chunk. Per-frame energies are kept (50 floats
+    per second of audio) for the whole-file statistics.
+    """
 
-    try:
-        with wave.open(io.BytesIO(data), "rb") as wf:
-            channels = wf.getnchannels()
-            sample_rate = wf.getframerate()
-            num_samples = wf.getnframes()
-            bit_depth = wf.getsampwidth() * 8
-            duration = num_samples / sample_rate if sample_rate > 0 else 0
-
-            frames = wf.readframes(num_samples)
-    except Exception as e:
-        return AudioInfo(
-            sample_rate=0, channels=0, duration_seconds=0,
-            samples=0, bit_depth=0, peak_amplitude=0,
-            rms_level=0, is_valid=False,
-            error=f"Failed to parse WAV: {e}"
-        )
+    def __init__(self, sample_rate: int, channels: int, full_scale: float):
+        self.frame_len = max(1, int(sample_rate * FRAME_SECONDS)) * channels
+        self.frame_seconds = self.frame_len / channels / sample_rate if sample_rate else 0.0
+        self.full_scale = full_scale
+        self._clip_level = CLIPPING_THRESHOLD * full_scale
+        self._carry = np.empty(0)
+        self._energies = []
+        self.clipped = 0
+        self.total = 0.0
+        self.count = 0
 
-    # Calculate peak and RMS from sample data
-    peak = 0.0
-    rms = 0.0
-    total_samples = num_samples * channels
+    def feed(self, samples: np.ndarray, peak: float) -> None:
+        if peak >= self._clip_level:
+            self.clipped += int(np.count_nonzero(np.abs(samples) >= self._clip_level))
+        self.total += float(samples.sum())
+        self.count += samples.size
+        if self._carry.size:
+            need = self.frame_len - self._carry.size
+            self._carry = np.concatenate([self._carry, samples[:need]])
+            samples = samples[need:]
+            if self._carry.size < self.frame_len:
+                return
+            self._energies.append(np.array([np.dot(self._carry, self._carry) / self.frame_len]))
+        frames = samples.size // self.frame_len
+        if frames:
+            blocks = samples[:frames * self.frame_len].reshape(frames, self.frame_len)
+            self._energies.append(np.einsum("ij,ij->i", blocks, blocks) / self.frame_len)
+        self._carry = samples[frames * self.frame_len:].copy()
 
-    if bit_depth == 16 and total_samples > 0:
-        try:
-            format_str = f"<{total_samples}h"
-            values = struct.unpack(format_str, frames)
-            max_val = 32768.0
-            normalized = [v / max_val for v in values]
-            peak = max(abs(v) for v in normalized)
-            rms = math.sqrt(sum(v ** 2 for v in normalized) / len(normalized))
-        except Exception:
-            peak = 0.0
-            rms = 0.0
-    elif bit_depth == 8 and total_samples > 0:
-        try:
-            format_str = f"<{total_samples}B"
-            values = struct.unpack(format_str, frames)
-            max_val = 128.0
-            normalized = [(v - 128) / max_val for v in values]
-            peak = max(abs(v) for v in normalized)
-            rms = math.sqrt(sum(v ** 2 for v in normalized) / len(normalized))
-        except Exception:
-            peak = 0.0
-            rms = 0.0
-
-    # Validate
+    def result(self) -> Dict[str, float]:
+        energies = list(self._energies)
+        if self._carry.size:
+            energies.append(np.array([np.dot(self._carry, self._carry) / self._carry.size]))
+        if not energies or not self.count:
+            return {}
+        levels = _db(np.sqrt(np.concatenate(energies)) / self.full_scale)
+        noise = float(np.percentile(levels, NOISE_PERCENTILE))
+        speech = float(np.percentile(levels, SPEECH_PERCENTILE))
+        voiced = np.flatnonzero(levels > max(levels.max() + SILENCE_THRESHOLD_DB, LEVEL_FLOOR_DB))
+        if voiced.size:
+            leading = voiced[0] * self.frame_seconds
+            trailing = (levels.size - 1 - voiced[-1]) * self.frame_seconds
+        else:
+            leading = trailing = levels.size * self.frame_seconds
+        return {
+            "noise_floor_db": round(noise, 1),
+            "snr_db": round(speech - noise, 1),
+            "clipped_ratio": round(self.clipped / self.count, 6),
+            "leading_silence_seconds": round(float(leading), 3),
+            "trailing_silence_seconds": round(float(trailing), 3),
+            "dc_offset": round(self.total / self.count / self.full_scale, 5),
+        }
+
+
+def _validate(
+    sample_rate: int,
+    channels: int,
+    num_samples: int,
+    bit_depth: int,
+    peak: float,
+    rms: float,
+    metrics: Optional[Dict[str, float]] = None,
+) -> AudioInfo:
+    """Apply the quality thresholds and build the AudioInfo."""
+    metrics = metrics or {}
+    duration = num_samples / sample_rate if sample_rate > 0 else 0
     is_valid = True
     error = None
 
@@ -116,9 +173,9 @@ def analyze_wav_bytes(data: bytes) -> AudioInfo:
     elif rms < MIN_RMS_LEVEL:
         is_valid = False
         error = f"Audio too quiet (RMS {rms:.3f})"
-    elif peak >= CLIPPING_THRESHOLD:
+    elif metrics.get("clipped_ratio", 0.0) > MAX_CLIPPED_RATIO:
         is_valid = False
-        error = "Audio is clipping"
+        error = f"Audio is clipping ({metrics['clipped_ratio']:.2%} of samples)"
 
     return AudioInfo(
         sample_rate=sample_rate,
@@ -130,4 +187,204 @@ def analyze_wav_bytes(data: bytes) -> AudioInfo:
         rms_level=round(rms, 4),
         is_valid=is_valid,
         error=error,
+        **metrics,
     )
+
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+FLAC_MAGIC = b"fLaC"
+
+
+class WavStreamAnalyzer:
+    """
+    Incremental WAV analysis over arbitrary chunks of a file.
+
+    The RIFF header is parsed as bytes arrive and peak/RMS are accumulated
+    per chunk, so memory use does not depend on file size:
+
+        analyzer = WavStreamAnalyzer()
+        for chunk in chunks:
+            analyzer.feed(chunk)
+        info = analyzer.result()
+    """
+
+    def __init__(self):
+        self.total_bytes = 0
+        self._pending = bytearray()  # unparsed header bytes / partial sample
+        self._state = "riff"  # riff -> chunks -> data -> done
+        self._skip = 0  # bytes left in a chunk we ignore
+        self._data_left = 0
+        self._error: Optional[str] = None
+        self.sample_rate = 0
+        self.channels = 0
+        self.sample_width = 0
+        self.num_samples = 0
+        self._fmt = None
+        self._sample_count = 0
+        self._max = None
+        self._min = None
+        self._sum_squares = 0.0
+        self._frames: Optional[_FrameMetrics] = None
+        self._busy = 0.0  # seconds spent analyzing, reported as stage "audio.analyze"
+
+    def feed(self, chunk: bytes) -> "WavStreamAnalyzer":
+        start = time.perf_counter()
+        self._feed(chunk)
+        self._busy += time.perf_counter() - start
+        return self
+
+    def _feed(self, chunk: bytes) -> None:
+        self.total_bytes += len(chunk)
+        if self._error is not None or self._state == "done":
+            return
+        if self._state == "data":
+            self._consume_samples(chunk)
+            return
+        self._pending += chunk
+        try:
+            self._parse_header()
+        except ValueError as e:
+            self._error = f"Failed to parse WAV: {e}"
+
+    def _parse_header(self) -> None:
+        buf = self._pending
+        if self._state == "riff":
+            if len(buf) < 12:
+                return
+            if buf[:4] != b'RIFF' or buf[8:12] != b'WAVE':
+                self._error = "Not a valid WAV file"
+                return
+            del buf[:12]
+            self._state = "chunks"
+
+        while self._state == "chunks":
+            if self._skip:
+                n = min(self._skip, len(buf))
+                del buf[:n]
+                self._skip -= n
+                if self._skip:
+                    return
+            if len(buf) < 8:
+                return
+            chunk_id = bytes(buf[:4])
+            size = int.from_bytes(buf[4:8], "little")
+            if chunk_id == b'fmt ':
+                if len(buf) < 8 + size:
+                    return
+                self._parse_fmt(bytes(buf[8:8 + size]))
+                del buf[:8 + size + (size & 1)]
+            elif chunk_id == b'data':
+                if not self.sample_width:
+                    raise ValueError("data chunk before fmt chunk")
+                del buf[:8]
+                frame_size = self.channels * self.sample_width
+                self.num_samples = size // frame_size
+                self._data_left = size
+                self._state = "data"
+                rest = bytes(buf)
+                buf.clear()
+                self._consume_samples(rest)
+            else:
+                del buf[:8]
+                self._skip = size + (size & 1)
+
+    def _parse_fmt(self, fmt: bytes) -> None:
+        if len(fmt) < 16:
+            raise ValueError("fmt chunk too short")
+        format_tag = int.from_bytes(fmt[0:2], "little")
+        channels = int.from_bytes(fmt[2:4], "little")
+        sample_rate = int.from_bytes(fmt[4:8], "little")
+        bits = int.from_bytes(fmt[14:16], "little")
+        if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+            format_tag = int.from_bytes(fmt[24:26], "little")
+        if format_tag != WAVE_FORMAT_PCM:
+            raise ValueError(f"unknown format: {format_tag}")
+        if channels == 0:
+            raise ValueError("bad # of channels")
+        sample_width = (bits + 7) // 8
+        if sample_width == 0:
+            raise ValueError("bad sample width")
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self._fmt = _PCM_FORMATS.get(sample_width * 8)
+        if self._fmt is not None:
+            self._frames = _FrameMetrics(sample_rate, channels, self._fmt[2])
+
+    def _consume_samples(self, chunk: bytes) -> None:
+        if len(chunk) > self._data_left:
+            chunk = chunk[:self._data_left]
+        self._data_left -= len(chunk)
+        if self._data_left == 0:
+            self._state = "done"
+        if self._fmt is None or not chunk:
+            return  # unsupported bit depth: levels stay 0
+
+        if self._pending:
+            chunk = bytes(self._pending) + chunk
+            self._pending.clear()
+        usable = len(chunk) - len(chunk) % self.sample_width
+        if usable < len(chunk):
+            self._pending += chunk[usable:]
+        if not usable:
+            return
+
+        dtype, offset, _ = self._fmt
+        samples = np.frombuffer(chunk, dtype=dtype, count=usable // self.sample_width)
+        hi, lo = int(samples.max()), int(samples.min())
+        self._max = hi if self._max is None else max(self._max, hi)
+        self._min = lo if self._min is None else min(self._min, lo)
+        centered = samples.astype(np.float64)
+        if offset:
+            centered -= offset
+        self._sum_squares += float(np.dot(centered, centered))
+        self._sample_count += samples.size
+        self._frames.feed(centered, max(hi - offset, offset - lo))
+
+    def result(self) -> AudioInfo:
+        start = time.perf_counter()
+        info = self._result()
+        STAGE_SECONDS.observe(self._busy + time.perf_counter() - start, "audio.analyze")
+        return info
+
+    def _result(self) -> AudioInfo:
+        if self.total_bytes < 44:
+            return _invalid("Audio data too small to be a valid WAV file")
+        if self._error is not None:
+            return _invalid(self._error)
+        if self._state in ("riff", "chunks"):
+            return _invalid("Failed to parse WAV: fmt chunk and/or data chunk missing")
+
+        peak = 0.0
+        rms = 0.0
+        metrics = {}
+        if self._sample_count and self.num_samples:
+            _, offset, full_scale = self._fmt
+            peak = max(self._max - offset, offset - self._min) / full_scale
+            rms = math.sqrt(self._sum_squares / self._sample_count) / full_scale
+            metrics = self._frames.result()
+        return _validate(
+            self.sample_rate, self.channels, self.num_samples,
+            self.sample_width * 8, peak, rms, metrics,
+        )
+
+
+def analyze_wav_bytes(data: bytes) -> AudioInfo:
+    """
+    Analyze WAV audio data from bytes.
+
+    Args:
+        data: Raw WAV file bytes (including header), or a FLAC file, which
+            is decoded to WAV first
+
+    Returns:
+        AudioInfo with file properties and quality metrics
+    """
+    if data[:4] == FLAC_MAGIC:
+        from .codecs import CodecUnavailableError, encode
+        try:
+            data = encode(data, "wav")
+        except (ValueError, CodecUnavailableError) as e:
+            return _invalid(f"Failed to decode FLAC: {e}")
+    return WavStreamAnalyzer().feed(data).result()
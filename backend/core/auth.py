@@ -0,0 +1,144 @@
+# Access Token Verification
+# Supabase JWT checks against a locally held JWKS, with verified tokens cached until they expire
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+import jwt
+from jwt import PyJWK, PyJWKClient
+
+from .cache import TTLCache
+
+logger = logging.getLogger('kuiper.auth')
+
+
+class TokenError(Exception):
+    """The token is missing, malformed, expired or fails verification."""
+
+    def __init__(self, message: str, expired: bool = False):
+        super().__init__(message)
+        self.expired = expired
+
+
+class KeysUnavailableError(TokenError):
+    """The JWKS could not be fetched, so no token can be checked."""
+
+
+class TokenVerifier:
+    """
+    Verifies access tokens and returns their subject (user id).
+
+    Signing keys are held in memory by kid and refreshed off the request
+    path: refresh() is run by a background task, and a token signed with an
+    unknown kid (key rotation) waits for one shared refresh instead of each
+    request fetching the JWKS. Tokens that verified are cached by SHA-256
+    until their exp, so repeat requests skip signature verification.
+
+    verify() is meant for the event loop; refresh() blocks on the network
+    and is passed to run_io (see refresh_async).
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        audience: str = "authenticated",
+        algorithms=("RS256", "ES256"),
+        cache_entries: int = 4096,
+        min_refresh_interval: float = 30.0,
+    ):
+        self.audience = audience
+        self.algorithms = list(algorithms)
+        self.min_refresh_interval = min_refresh_interval
+        self._client = PyJWKClient(jwks_url, cache_jwk_set=False)
+        self._keys: Dict[str, PyJWK] = {}
+        self._refreshed_at = 0.0
+        self._attempted_at: Optional[float] = None
+        self._refreshing: Optional[asyncio.Future] = None
+        self._tokens = TTLCache("jwt_tokens", max_entries=cache_entries, ttl=3600.0)
+        self.verifications = 0
+
+    def refresh(self) -> int:
+        """Fetch the JWKS and replace the key set (blocking). Returns the key count."""
+        jwk_set = self._client.get_jwk_set(refresh=True)
+        self._keys = {key.key_id: key for key in jwk_set.keys if key.key_id}
+        self._refreshed_at = time.monotonic()
+        return len(self._keys)
+
+    async def refresh_async(self, run_io: Callable) -> None:
+        """refresh() on the I/O pool, shared by concurrent callers."""
+        if self._refreshing is None:
+            self._attempted_at = time.monotonic()
+            self._refreshing = asyncio.ensure_future(run_io(self.refresh))
+            self._refreshing.add_done_callback(lambda _: setattr(self, "_refreshing", None))
+        await asyncio.shield(self._refreshing)
+
+    async def _key_for(self, kid: Optional[str], run_io: Callable) -> PyJWK:
+        key = self._keys.get(kid)
+        # Join a refresh in flight; otherwise start one unless one was tried
+        # recently (tokens with made-up kids must not hammer the JWKS endpoint)
+        if key is None and (
+            self._refreshing is not None
+            or self._attempted_at is None
+            or time.monotonic() - self._attempted_at >= self.min_refresh_interval
+        ):
+            try:
+                await self.refresh_async(run_io)
+            except Exception as e:
+                logger.warning(f"JWKS refresh failed: {e}")
+            key = self._keys.get(kid)
+        if not self._keys:
+            raise KeysUnavailableError("No signing keys loaded (JWKS unreachable)")
+        if key is None:
+            raise TokenError(f"Unknown signing key {kid!r}")
+        return key
+
+    async def verify(self, token: str, run_io: Callable) -> str:
+        """
+        The token's sub claim.
+
+        Raises:
+            TokenError: invalid, expired or signed by an unknown key
+            KeysUnavailableError: no signing keys could be fetched yet
+        """
+        digest = hashlib.sha256(token.encode()).digest()
+        user_id = self._tokens.get(digest)
+        if user_id is not None:
+            return user_id
+
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except jwt.InvalidTokenError as e:
+            raise TokenError(str(e))
+        key = await self._key_for(kid, run_io)
+        try:
+            payload = jwt.decode(
+                token,
+                key.key,
+                algorithms=self.algorithms,
+                audience=self.audience,
+                options={"verify_aud": True},
+            )
+        except jwt.ExpiredSignatureError as e:
+            raise TokenError(str(e), expired=True)
+        except jwt.InvalidTokenError as e:
+            raise TokenError(str(e))
+        self.verifications += 1
+
+        user_id = payload.get("sub")
+        if not user_id:
+            raise TokenError("missing user id")
+        user_id = str(user_id)
+        exp = payload.get("exp")
+        if exp is not None:
+            self._tokens.set(digest, user_id, ttl=float(exp) - time.time())
+        return user_id
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._keys),
+            "key_age_seconds": round(time.monotonic() - self._refreshed_at, 1) if self._refreshed_at else None,
+            "verifications": self.verifications,
+        }
@@ -0,0 +1,138 @@
+# Batch Analysis
+# Analyzes many WAV files in parallel and renders AudioInfo reports (CSV, JSON lines, Parquet)
+
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .audio_processor import FLAC_MAGIC, AudioInfo, WavStreamAnalyzer, analyze_wav_bytes
+
+CHUNK_SIZE = 1024 * 1024
+
+REPORT_COLUMNS = ("source", "size_bytes") + tuple(f.name for f in fields(AudioInfo))
+REPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def report_row(source: str, size: int, info: AudioInfo) -> Dict[str, Any]:
+    return {"source": source, "size_bytes": size, **asdict(info)}
+
+
+def failure_row(source: str, error: str) -> Dict[str, Any]:
+    """Row for a file that could not be read at all (missing, download failed)."""
+    row = dict.fromkeys(REPORT_COLUMNS)
+    row.update(source=source, is_valid=False, error=error)
+    return row
+
+
+def analyze_stream(src: BinaryIO, source: str, chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+    """Analyze a file object chunk by chunk; memory does not grow with file
+    size. FLAC files are read whole and decoded."""
+    analyzer = WavStreamAnalyzer()
+    chunk = src.read(chunk_size)
+    if chunk[:4] == FLAC_MAGIC:
+        data = chunk + src.read()
+        return report_row(source, len(data), analyze_wav_bytes(data))
+    while chunk:
+        analyzer.feed(chunk)
+        chunk = src.read(chunk_size)
+    return report_row(source, analyzer.total_bytes, analyzer.result())
+
+
+def analyze_file(path: str, source: Optional[str] = None) -> Dict[str, Any]:
+    """Report row for one WAV on disk. Picklable, for process pools."""
+    source = source or path
+    try:
+        with open(path, "rb") as f:
+            return analyze_stream(f, source)
+    except OSError as e:
+        return failure_row(source, f"Failed to read file: {e.strerror or e}")
+
+
+def _analyze_pair(pair) -> Dict[str, Any]:
+    return analyze_file(*pair)
+
+
+def analyze_files(
+    paths: Sequence[str],
+    sources: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze files across a process pool, yielding rows in input order.
+
+    With one worker (or one file) everything runs in-process, which is
+    faster than starting a pool for small batches.
+    """
+    pairs = list(zip(paths, sources or paths))
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(pairs) <= 1:
+        yield from map(_analyze_pair, pairs)
+        return
+    chunksize = max(1, len(pairs) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_analyze_pair, pairs, chunksize=chunksize)
+
+
+def summarize(rows: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """Counts of valid, invalid (failed a quality check) and unreadable files."""
+    counts = {"files": 0, "valid": 0, "invalid": 0, "failed": 0, "bytes": 0}
+    for row in rows:
+        counts["files"] += 1
+        counts["bytes"] += row["size_bytes"] or 0
+        if row["is_valid"]:
+            counts["valid"] += 1
+        elif row["sample_rate"] is None:
+            counts["failed"] += 1
+        else:
+            counts["invalid"] += 1
+    return counts
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def render_report(rows: List[Dict[str, Any]], fmt: str = "csv") -> bytes:
+    """
+    Serialize report rows with REPORT_COLUMNS as the columns.
+
+    Raises:
+        ValueError: unknown format, or parquet without pyarrow installed
+    """
+    if fmt == "csv":
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=REPORT_COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+        return out.getvalue().encode("utf-8")
+    if fmt == "jsonl":
+        return "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+    if fmt == "parquet":
+        if not parquet_available():
+            raise ValueError("Parquet reports require pyarrow (pip install pyarrow)")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Explicit types: a column that is all None (e.g. error) would otherwise be null-typed
+        types = {int: pa.int64(), float: pa.float64(), bool: pa.bool_()}
+        schema = pa.schema(
+            [("source", pa.string()), ("size_bytes", pa.int64())]
+            + [(f.name, types.get(f.type, pa.string())) for f in fields(AudioInfo)]
+        )
+        table = pa.table({name: [row[name] for row in rows] for name in REPORT_COLUMNS}, schema=schema)
+        out = io.BytesIO()
+        pq.write_table(table, out)
+        return out.getvalue()
+    raise ValueError(f"Unknown report format: {fmt}")
@@ -0,0 +1,220 @@
+# In-Process Caches
+# Size-bounded LRU caches: in-memory with per-entry TTL, and on-disk with a byte cap
+
+import asyncio
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    A size-bounded LRU mapping whose entries expire after ttl seconds.
+
+    Not thread-safe; meant to be used from the event loop thread. A ttl of 0
+    disables caching (every get is a miss and set is a no-op).
+    """
+
+    def __init__(self, name: str, max_entries: int = 256, ttl: float = 60.0):
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _registry[name] = self
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class DiskCache:
+    """
+    A directory of files named by cache key, capped at max_bytes.
+
+    Writes are atomic (temp file + rename), so several uvicorn workers can
+    share one directory. Hits refresh the file's mtime; when the total size
+    goes over the cap the least recently used files are deleted until it is
+    back under 90% of the cap. Blocking; call through the I/O pool.
+    """
+
+    def __init__(self, name: str, directory: str, max_bytes: int, suffix: str = ".wav"):
+        self.name = name
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._remove_stale_temp_files()
+        self._size = sum(size for _, size, _ in self._entries())
+        _registry[name] = self
+
+    def _remove_stale_temp_files(self, max_age: float = 3600.0) -> None:
+        """Temp files left behind by a crashed writer."""
+        cutoff = time.time() - max_age
+        for path in self.directory.glob(".tmp-*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{self.suffix}"
+
+    def _entries(self):
+        for path in self.directory.glob(f"*/*{self.suffix}"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            yield path, st.st_size, st.st_mtime
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Path of the cached file for key, or None. Counts as a use."""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self.lookup(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def reserve(self) -> Path:
+        """A temp file inside the cache directory to be filled and passed to
+        commit() (same filesystem, so the rename is atomic)."""
+        fd, name = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        os.close(fd)
+        return Path(name)
+
+    def commit(self, key: str, tmp_path: Path) -> Path:
+        """Move a filled reserve() file into place under key."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        size = tmp_path.stat().st_size
+        os.replace(tmp_path, path)
+        self._size += size
+        if self._size > self.max_bytes:
+            self._evict()
+        return path
+
+    def set(self, key: str, data: bytes) -> None:
+        tmp_path = self.reserve()
+        try:
+            tmp_path.write_bytes(data)
+            self.commit(key, tmp_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _evict(self) -> None:
+        # Rescan: other workers may have added or removed files
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+        self._size = total
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "directory": str(self.directory),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class SingleFlight:
+    """
+    Collapses concurrent loads of the same key into one.
+
+    The load runs as its own task, so a caller that is cancelled (client
+    went away) does not cancel it for the others waiting on the same key.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+
+    async def run(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args))
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+
+_registry: Dict[str, Any] = {}
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every cache created in this process."""
+    return {name: cache.stats() for name, cache in _registry.items()}
@@ -0,0 +1,131 @@
+# Audio Codecs
+# Lossless FLAC encoding/decoding for stored recordings (soundfile / libsndfile)
+
+import io
+from pathlib import Path
+from typing import Optional, Union
+
+from .audio_processor import FLAC_MAGIC
+from .metrics import stage_timer
+
+STORAGE_FORMATS = {"wav": "audio/wav", "flac": "audio/flac"}
+
+# Media types each format answers to in an Accept header
+_MEDIA_TYPES = {
+    "wav": ("audio/wav", "audio/x-wav", "audio/wave", "audio/vnd.wave"),
+    "flac": ("audio/flac", "audio/x-flac"),
+}
+
+# FLAC has no unsigned 8-bit samples; WAV has no signed ones
+_FLAC_SUBTYPES = {"PCM_U8": "PCM_S8", "PCM_S8": "PCM_S8", "PCM_16": "PCM_16", "PCM_24": "PCM_24"}
+_WAV_SUBTYPES = {"PCM_S8": "PCM_U8", "PCM_16": "PCM_16", "PCM_24": "PCM_24"}
+
+
+class CodecUnavailableError(RuntimeError):
+    """Raised when FLAC is requested but soundfile/libsndfile is not installed."""
+
+
+def _soundfile():
+    try:
+        import soundfile
+    except (ImportError, OSError) as e:
+        raise CodecUnavailableError(f"FLAC support requires soundfile ({e})")
+    return soundfile
+
+
+def flac_available() -> bool:
+    try:
+        return "FLAC" in _soundfile().available_formats()
+    except CodecUnavailableError:
+        return False
+
+
+def sniff_format(head: bytes) -> str:
+    """'flac' or 'wav' from the first bytes of a file."""
+    return "flac" if head[:4] == FLAC_MAGIC else "wav"
+
+
+def format_of_path(storage_path: str) -> str:
+    """Stored format of a recording, from its storage path's extension."""
+    return "flac" if storage_path.lower().endswith(".flac") else "wav"
+
+
+def _transcode(data: bytes, fmt: str) -> bytes:
+    sf = _soundfile()
+    try:
+        with sf.SoundFile(io.BytesIO(data)) as src:
+            subtypes = _FLAC_SUBTYPES if fmt == "flac" else _WAV_SUBTYPES
+            subtype = subtypes.get(src.subtype)
+            if subtype is None:
+                raise ValueError(f"cannot store {src.subtype} audio losslessly as {fmt}")
+            # int32 holds every supported depth exactly, so the round trip is lossless
+            samples = src.read(dtype="int32", always_2d=True)
+            rate = src.samplerate
+    except sf.LibsndfileError as e:
+        raise ValueError(f"Failed to decode audio: {e}")
+    out = io.BytesIO()
+    sf.write(out, samples, rate, format=fmt.upper(), subtype=subtype)
+    return out.getvalue()
+
+
+def encode(payload: Union[bytes, str], fmt: str) -> bytes:
+    """
+    Re-encode WAV or FLAC audio as fmt ('wav' or 'flac'), keeping sample
+    rate, channels and bit depth. payload is bytes or a file path.
+    CPU-bound; run it on the CPU pool.
+
+    Raises:
+        ValueError: the audio cannot be decoded or has no lossless mapping
+        CodecUnavailableError: soundfile is not installed
+    """
+    if isinstance(payload, str):
+        payload = Path(payload).read_bytes()
+    if sniff_format(payload) == fmt:
+        return payload
+    with stage_timer(f"audio.encode.{fmt}"):
+        return _transcode(payload, fmt)
+
+
+def transcode_file(src: Union[str, Path], dst: Union[str, Path], fmt: str) -> None:
+    """Write src (WAV or FLAC) to dst as fmt."""
+    Path(dst).write_bytes(encode(str(src), fmt))
+
+
+def negotiate(accept: Optional[str], stored: str) -> str:
+    """
+    Pick 'wav' or 'flac' for an Accept header. The most specific matching
+    media range decides each format's quality; ties (including */* or no
+    header) go to the stored format, which needs no transcoding.
+    """
+    if not accept:
+        return stored
+    ranges = []
+    for part in accept.split(","):
+        media, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    pass
+        ranges.append((media.strip().lower(), q))
+
+    def quality(fmt: str) -> float:
+        best, specificity = 0.0, -1
+        for media, q in ranges:
+            if media in _MEDIA_TYPES[fmt]:
+                level = 2
+            elif media == "audio/*":
+                level = 1
+            elif media == "*/*":
+                level = 0
+            else:
+                continue
+            if level > specificity:
+                best, specificity = q, level
+        return best
+
+    other = "wav" if stored == "flac" else "flac"
+    return other if quality(other) > quality(stored) else stored
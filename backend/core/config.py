@@ -59,7 +59,86 @@ class Settings(BaseSettings):
         env="KUIPER_CORS_ORIGINS"
     )
     max_upload_size_mb: int = Field(default=100, env="KUIPER_MAX_UPLOAD_SIZE_MB")
+    upload_memory_limit_mb: int = Field(default=4, env="KUIPER_UPLOAD_MEMORY_LIMIT_MB")  # larger uploads spool to disk
+    # Trim silence and re-encode uploads as mono 16-bit at SAMPLE_RATE before storing them
+    normalize_uploads: bool = Field(default=False, env="KUIPER_NORMALIZE_UPLOADS")
+    storage_format: str = Field(default="wav", env="KUIPER_STORAGE_FORMAT")  # "wav" or "flac" (lossless)
+    # "background": store takes as uploaded and normalize / re-encode them in a job;
+    # "inline": do it before the save responds
+    post_processing: str = Field(default="background", env="KUIPER_POST_PROCESSING")
+    # Background jobs: SQLite queue shared by the workers on this host
+    job_queue_path: str = Field(default="", env="KUIPER_JOB_QUEUE_PATH")  # "" = temp dir
+    job_concurrency: int = Field(default=2, env="KUIPER_JOB_CONCURRENCY")  # jobs in flight per worker
+    job_max_attempts: int = Field(default=5, env="KUIPER_JOB_MAX_ATTEMPTS")
+    job_retry_base: float = Field(default=5.0, env="KUIPER_JOB_RETRY_BASE")  # seconds, doubled per attempt
+    job_retry_max: float = Field(default=600.0, env="KUIPER_JOB_RETRY_MAX")
+    # Batch save: takes per request, and takes analyzed / uploaded at once
+    batch_save_max_takes: int = Field(default=100, env="KUIPER_BATCH_SAVE_MAX_TAKES")
+    # Whole save-batch request body; 0 = max_upload_size_mb per take x batch_save_max_takes
+    batch_save_max_mb: int = Field(default=0, env="KUIPER_BATCH_SAVE_MAX_MB")
+    batch_save_concurrency: int = Field(default=8, env="KUIPER_BATCH_SAVE_CONCURRENCY")
+    # Resumable uploads: chunks staged on local disk until finalize
+    upload_session_dir: str = Field(default="", env="KUIPER_UPLOAD_SESSION_DIR")  # "" = temp dir
+    upload_session_ttl: float = Field(default=86400.0, env="KUIPER_UPLOAD_SESSION_TTL")  # seconds idle before removal
+    upload_chunk_max_mb: int = Field(default=8, env="KUIPER_UPLOAD_CHUNK_MAX_MB")
     rate_limit_per_minute: int = Field(default=120, env="KUIPER_RATE_LIMIT")
+    rate_limit_backend: str = Field(default="memory", env="KUIPER_RATE_LIMIT_BACKEND")  # "memory" or "sqlite"
+    rate_limit_db_path: str = Field(default="", env="KUIPER_RATE_LIMIT_DB")  # sqlite file shared by workers; "" = temp dir
+
+    # Prometheus metrics on /metrics (request histograms, stage timers, cache / pool / queue gauges)
+    metrics_enabled: bool = Field(default=True, env="KUIPER_METRICS_ENABLED")
+    # Bearer token a scraper may send instead of X-Admin-Key; "" = admin key only
+    metrics_token: str = Field(default="", env="KUIPER_METRICS_TOKEN")
+
+    # Access tokens: verified tokens cached until exp; signing keys refreshed in the background
+    auth_cache_entries: int = Field(default=4096, env="KUIPER_AUTH_CACHE_ENTRIES")
+    jwks_refresh_interval: float = Field(default=600.0, env="KUIPER_JWKS_REFRESH_INTERVAL")  # seconds
+
+    # Worker pools (audio analysis and blocking Supabase I/O run off the event loop)
+    cpu_pool_kind: str = Field(default="thread", env="KUIPER_CPU_POOL")  # "thread" or "process"
+    cpu_workers: int = Field(default=0, env="KUIPER_CPU_WORKERS")  # 0 = os.cpu_count()
+    io_workers: int = Field(default=16, env="KUIPER_IO_WORKERS")
+    worker_queue_limit: int = Field(default=64, env="KUIPER_WORKER_QUEUE_LIMIT")
+    worker_acquire_timeout: float = Field(default=5.0, env="KUIPER_WORKER_ACQUIRE_TIMEOUT")
+
+    # Database client: "async" (pooled httpx connections) or "sync" (blocking client on the I/O pool)
+    db_backend: str = Field(default="async", env="KUIPER_DB_BACKEND")
+    db_max_connections: int = Field(default=20, env="KUIPER_DB_MAX_CONNECTIONS")
+    db_max_keepalive: int = Field(default=10, env="KUIPER_DB_MAX_KEEPALIVE")
+    db_max_concurrency: int = Field(default=32, env="KUIPER_DB_MAX_CONCURRENCY")
+    db_timeout: float = Field(default=30.0, env="KUIPER_DB_TIMEOUT")  # seconds, per call
+
+    # Script catalog cache (invalidated by admin writes; TTL lets other workers converge)
+    script_cache_ttl: float = Field(default=60.0, env="KUIPER_SCRIPT_CACHE_TTL")  # 0 disables
+    script_cache_size: int = Field(default=512, env="KUIPER_SCRIPT_CACHE_SIZE")
+
+    # Per-(recorder, script) recorded-lines bitsets (updated by this worker's saves and
+    # deletes; TTL bounds staleness from other workers)
+    recorded_lines_cache_ttl: float = Field(default=300.0, env="KUIPER_RECORDED_LINES_CACHE_TTL")  # 0 disables
+    recorded_lines_cache_size: int = Field(default=4096, env="KUIPER_RECORDED_LINES_CACHE_SIZE")
+
+    # TTS engine: "auto" (warm libespeak-ng worker processes if the library loads, else
+    # one espeak-ng process per call), "pool" or "subprocess"
+    tts_engine: str = Field(default="auto", env="KUIPER_TTS_ENGINE")
+    tts_workers: int = Field(default=2, env="KUIPER_TTS_WORKERS")
+    tts_library: str = Field(default="", env="KUIPER_TTS_LIBRARY")  # path to libespeak-ng; "" = search
+    tts_data_path: str = Field(default="", env="KUIPER_TTS_DATA_PATH")  # dir containing espeak-ng-data
+
+    # TTS pronunciation cache (memory LRU in front of a size-capped directory)
+    tts_cache_entries: int = Field(default=256, env="KUIPER_TTS_CACHE_ENTRIES")
+    tts_cache_ttl: float = Field(default=86400.0, env="KUIPER_TTS_CACHE_TTL")  # seconds, memory tier
+    tts_cache_dir: str = Field(default="", env="KUIPER_TTS_CACHE_DIR")  # "" = temp dir
+    tts_cache_max_mb: int = Field(default=256, env="KUIPER_TTS_CACHE_MAX_MB")  # 0 disables the disk tier
+
+    # Recording audio read-through cache (local copies of storage objects, served with Range support)
+    audio_cache_dir: str = Field(default="", env="KUIPER_AUDIO_CACHE_DIR")  # "" = temp dir
+    audio_cache_max_mb: int = Field(default=512, env="KUIPER_AUDIO_CACHE_MAX_MB")  # 0 = no cache
+
+    # Dataset export: recordings fetched ahead of the one being written
+    export_prefetch: int = Field(default=8, env="KUIPER_EXPORT_PREFETCH")
+
+    # Batch analysis: recordings downloaded and analyzed at once per request
+    analysis_concurrency: int = Field(default=8, env="KUIPER_ANALYSIS_CONCURRENCY")
 
     # Logging
     log_level: str = Field(default="INFO", env="KUIPER_LOG_LEVEL")
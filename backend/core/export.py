@@ -0,0 +1,215 @@
+# Dataset Export
+# Streams recordings as an LJSpeech-style tar or zip (wavs/0001.wav + metadata.csv)
+
+import asyncio
+import collections
+import io
+import logging
+import os
+import tarfile
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Tuple, Union
+
+from .workers import run_io
+
+logger = logging.getLogger('kuiper.export')
+
+CHUNK_SIZE = 256 * 1024
+ARCHIVE_FORMATS = {"tar": "application/x-tar", "zip": "application/zip"}
+
+
+@dataclass
+class ExportItem:
+    """One recording to export: where its audio lives and its transcript."""
+
+    recording_id: int
+    storage_path: str
+    text: str
+    cache_key: str = ""
+
+
+# Fetches an item's audio to a local file; returns (path, delete_after_use)
+Fetcher = Callable[[ExportItem], Awaitable[Tuple[Path, bool]]]
+
+
+def metadata_line(filename: str, text: str) -> str:
+    """One metadata.csv row: `0001.wav|text`, with the delimiter and line
+    breaks removed from the text."""
+    clean = " ".join(text.replace("|", " ").split())
+    return f"{filename}|{clean}\n"
+
+
+class _Spool(io.RawIOBase):
+    """Write-only sink that archive writers append to; drained after each
+    write so only the current chunk is held."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _TarWriter:
+    def __init__(self, spool: _Spool):
+        self.spool = spool
+        self._written = 0
+
+    def start(self, name: str, size: int) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        self.spool.write(info.tobuf(format=tarfile.PAX_FORMAT))
+        self._written = 0
+
+    def write(self, data: bytes) -> None:
+        self.spool.write(data)
+        self._written += len(data)
+
+    def finish(self) -> None:
+        remainder = self._written % tarfile.BLOCKSIZE
+        if remainder:
+            self.spool.write(b"\0" * (tarfile.BLOCKSIZE - remainder))
+
+    def close(self) -> None:
+        self.spool.write(b"\0" * (2 * tarfile.BLOCKSIZE))
+
+
+class _ZipWriter:
+    def __init__(self, spool: _Spool):
+        self.spool = spool
+        # The spool is not seekable, so zipfile writes data descriptors
+        self._zip = zipfile.ZipFile(spool, mode="w", compression=zipfile.ZIP_STORED)
+        self._entry = None
+
+    def start(self, name: str, size: int) -> None:
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.file_size = size
+        info.external_attr = 0o644 << 16
+        self._entry = self._zip.open(info, mode="w")
+
+    def write(self, data: bytes) -> None:
+        self._entry.write(data)
+
+    def finish(self) -> None:
+        self._entry.close()
+        self._entry = None
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+async def _iterate(items: Iterable[ExportItem]) -> AsyncIterator[ExportItem]:
+    for item in items:
+        yield item
+
+
+async def stream_archive(
+    items: Union[Iterable[ExportItem], AsyncIterable[ExportItem]],
+    fetch: Fetcher,
+    fmt: str = "tar",
+    prefetch: int = 8,
+    chunk_size: int = CHUNK_SIZE,
+    extension: str = "wav",
+    total: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Yield an archive of wavs/NNNN.<extension> plus metadata.csv, in item order.
+
+    Up to `prefetch` items are fetched ahead of the one being written, so
+    memory is bounded by one chunk plus whatever fetch() keeps in flight,
+    however many items there are. Items whose audio cannot be fetched are
+    logged and left out of both the archive and metadata.csv.
+
+    items may be an async iterable (e.g. a paged database scan), read only
+    as far as the prefetch window; total, an upper bound on its length,
+    then sets the zero padding of the file names.
+    """
+    if not hasattr(items, "__aiter__"):
+        items = list(items)
+        total = len(items)
+        items = _iterate(items)
+    spool = _Spool()
+    writer = _ZipWriter(spool) if fmt == "zip" else _TarWriter(spool)
+    width = max(4, len(str(total or 0)))
+    pending = collections.deque()
+    remaining = items.__aiter__()
+    seen = 0
+
+    async def top_up():
+        nonlocal seen
+        while len(pending) < max(1, prefetch):
+            try:
+                item = await remaining.__anext__()
+            except StopAsyncIteration:
+                return
+            seen += 1
+            pending.append((item, asyncio.ensure_future(fetch(item))))
+
+    metadata = []
+    try:
+        await top_up()
+        while pending:
+            item, task = pending.popleft()
+            await top_up()
+            try:
+                path, temporary = await task
+            except Exception as e:
+                logger.warning(f"Export: skipping recording {item.recording_id}: {e}")
+                continue
+            try:
+                filename = f"{len(metadata) + 1:0{width}d}.{extension}"
+                f = await run_io(open, path, "rb")
+                try:
+                    writer.start(f"wavs/{filename}", os.fstat(f.fileno()).st_size)
+                    while True:
+                        chunk = await run_io(f.read, chunk_size)
+                        if not chunk:
+                            break
+                        writer.write(chunk)
+                        yield spool.drain()
+                    writer.finish()
+                finally:
+                    f.close()
+            finally:
+                if temporary:
+                    Path(path).unlink(missing_ok=True)
+            metadata.append(metadata_line(filename, item.text))
+
+        csv = "".join(metadata).encode("utf-8")
+        writer.start("metadata.csv", len(csv))
+        writer.write(csv)
+        writer.finish()
+        writer.close()
+        yield spool.drain()
+        logger.info(f"Export: wrote {len(metadata)} of {seen} recordings ({fmt})")
+    finally:
+        if hasattr(remaining, "aclose"):
+            await remaining.aclose()
+        for _, task in pending:
+            task.cancel()
+        for _, task in pending:
+            try:
+                path, temporary = await task
+            except BaseException:
+                continue
+            if temporary:
+                Path(path).unlink(missing_ok=True)
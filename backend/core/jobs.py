@@ -0,0 +1,362 @@
+# Background Jobs
+# Persistent SQLite job queue with leases, retries with backoff and idempotent keys
+
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger('kuiper.jobs')
+
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+
+@dataclass
+class Job:
+    id: int
+    kind: str
+    key: Optional[str]
+    payload: Dict[str, Any]
+    status: str
+    attempts: int
+    max_attempts: int
+    run_at: float  # when a queued job may next run (epoch seconds)
+    created_at: float
+    updated_at: float
+    last_error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+_COLUMNS = "id, kind, key, payload, status, attempts, max_attempts, run_at, created_at, updated_at, last_error"
+
+
+def _job(row) -> Job:
+    return Job(*row[:3], json.loads(row[3]), *row[4:])
+
+
+class JobQueue:
+    """
+    Jobs kept in a SQLite file, so they survive restarts and every uvicorn
+    worker on the host drains the same queue.
+
+    A claimed job is leased: it is marked running until lease seconds from
+    now, and a worker that dies mid-job leaves it to be claimed again once
+    the lease runs out. Failures are retried with exponential backoff
+    (plus jitter) until max_attempts, then the job stays failed for an admin
+    to look at. Blocking; call through the I/O pool.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = 5,
+        retry_base: float = 5.0,
+        retry_max: float = 600.0,
+        lease: float = 300.0,
+        retention: float = 7 * 86400.0,
+    ):
+        self.path = path
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease = lease
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " kind TEXT NOT NULL,"
+            " key TEXT UNIQUE,"
+            " payload TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " max_attempts INTEGER NOT NULL,"
+            " run_at REAL NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " last_error TEXT,"
+            " locked_until REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, run_at)")
+
+    def _transaction(self, fn: Callable, *args):
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(conn, *args)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return result
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], key: Optional[str] = None, delay: float = 0.0) -> Job:
+        """
+        Add a job, or return the existing one with the same key.
+
+        A key that is queued or running is not enqueued twice (a retried
+        request or a double submit). A done or failed job with the key is
+        re-queued with the new payload, since the work has been asked for
+        again.
+        """
+        def run(conn):
+            now = time.time()
+            if key is not None:
+                row = conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    job = _job(row)
+                    if job.status in ("queued", "running"):
+                        return job
+                    conn.execute(
+                        "UPDATE jobs SET payload = ?, status = 'queued', attempts = 0, max_attempts = ?,"
+                        " run_at = ?, updated_at = ?, last_error = NULL, locked_until = NULL WHERE id = ?",
+                        (json.dumps(payload), self.max_attempts, now + delay, now, job.id),
+                    )
+                    return self._get(conn, job.id)
+            cursor = conn.execute(
+                "INSERT INTO jobs (kind, key, payload, status, max_attempts, run_at, created_at, updated_at)"
+                " VALUES (?, ?, ?, 'queued', ?, ?, ?, ?)",
+                (kind, key, json.dumps(payload), self.max_attempts, now + delay, now, now),
+            )
+            return self._get(conn, cursor.lastrowid)
+
+        return self._transaction(run)
+
+    def claim(self, kinds: Optional[List[str]] = None) -> Optional[Job]:
+        """Lease the next due job (oldest run_at first), or None if none is due.
+        A running job whose lease has expired counts as due."""
+        def run(conn):
+            now = time.time()
+            query = (
+                f"SELECT {_COLUMNS} FROM jobs"
+                " WHERE ((status = 'queued' AND run_at <= ?) OR (status = 'running' AND locked_until <= ?))"
+            )
+            params: list = [now, now]
+            if kinds is not None:
+                query += f" AND kind IN ({', '.join('?' * len(kinds))})"
+                params += kinds
+            row = conn.execute(query + " ORDER BY run_at LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            job = _job(row)
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ?, locked_until = ?"
+                " WHERE id = ?",
+                (now, now + self.lease, job.id),
+            )
+            job.status = "running"
+            job.attempts += 1
+            job.updated_at = now
+            return job
+
+        return self._transaction(run)
+
+    def complete(self, job_id: int) -> None:
+        def run(conn):
+            conn.execute(
+                "UPDATE jobs SET status = 'done', updated_at = ?, last_error = NULL, locked_until = NULL WHERE id = ?",
+                (time.time(), job_id),
+            )
+
+        self._transaction(run)
+
+    def fail(self, job_id: int, error: str) -> Optional[Job]:
+        """Record a failed attempt: re-queue with backoff, or mark failed once
+        max_attempts is used up. Returns the updated job."""
+        def run(conn):
+            job = self._get(conn, job_id)
+            if job is None:
+                return None
+            now = time.time()
+            if job.attempts < job.max_attempts:
+                backoff = min(self.retry_max, self.retry_base * 2 ** (job.attempts - 1))
+                status, run_at = "queued", now + backoff * random.uniform(0.75, 1.25)
+            else:
+                status, run_at = "failed", job.run_at
+            conn.execute(
+                "UPDATE jobs SET status = ?, run_at = ?, updated_at = ?, last_error = ?, locked_until = NULL"
+                " WHERE id = ?",
+                (status, run_at, now, error[:2000], job_id),
+            )
+            return self._get(conn, job_id)
+
+        return self._transaction(run)
+
+    def retry(self, job_id: int) -> Optional[Job]:
+        """Re-queue a failed job now with a fresh attempt budget."""
+        def run(conn):
+            job = self._get(conn, job_id)
+            if job is None or job.status != "failed":
+                return job
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', attempts = 0, run_at = ?, updated_at = ? WHERE id = ?",
+                (now, now, job_id),
+            )
+            return self._get(conn, job_id)
+
+        return self._transaction(run)
+
+    @staticmethod
+    def _get(conn, job_id: int) -> Optional[Job]:
+        row = conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job(row) if row is not None else None
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self._lock:
+            return self._get(self._conn, job_id)
+
+    def list_jobs(
+        self,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Job]:
+        """Most recently updated first."""
+        query = f"SELECT {_COLUMNS} FROM jobs WHERE 1 = 1"
+        params: list = []
+        if status is not None:
+            query += " AND status = ?"
+            params.append(status)
+        if kind is not None:
+            query += " AND kind = ?"
+            params.append(kind)
+        query += " ORDER BY updated_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [_job(row) for row in self._conn.execute(query, params)]
+
+    def purge(self) -> int:
+        """Delete done jobs older than retention; returns how many."""
+        def run(conn):
+            cutoff = time.time() - self.retention
+            return conn.execute("DELETE FROM jobs WHERE status = 'done' AND updated_at < ?", (cutoff,)).rowcount
+
+        return self._transaction(run)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {**{status: 0 for status in JOB_STATUSES}, **dict(rows)}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class JobRunner:
+    """
+    Drains a JobQueue on the event loop with at most concurrency jobs in
+    flight in this process. Handlers get the job's payload and must be
+    idempotent: a job may run again after a crash or a lost lease.
+
+    run() polls every poll_interval seconds, and wake() (called after an
+    enqueue in this process) starts waiting jobs without that delay.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, JobHandler],
+        run_io: Callable,
+        concurrency: int = 2,
+        poll_interval: float = 1.0,
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.run_io = run_io
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._wakeup = asyncio.Event()
+        self._tasks: set = set()
+        self.completed = 0
+        self.failed_attempts = 0
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        kinds = list(self.handlers)
+        next_purge = 0.0
+        while True:
+            try:
+                if time.monotonic() >= next_purge:
+                    purged = await self.run_io(self.queue.purge)
+                    if purged:
+                        logger.info(f"Purged {purged} finished jobs")
+                    next_purge = time.monotonic() + 3600.0
+                # Claim while there are free slots and due jobs
+                while True:
+                    await self._slots.acquire()
+                    try:
+                        job = await self.run_io(self.queue.claim, kinds)
+                    except BaseException:
+                        self._slots.release()
+                        raise
+                    if job is None:
+                        self._slots.release()
+                        break
+                    task = asyncio.create_task(self._run_job(job))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job queue poll failed: {e}")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_job(self, job: Job) -> None:
+        try:
+            await self.handlers[job.kind](job.payload)
+        except asyncio.CancelledError:
+            # Shutting down: the lease runs out and another worker picks it up
+            raise
+        except Exception as e:
+            self.failed_attempts += 1
+            updated = await self.run_io(self.queue.fail, job.id, f"{type(e).__name__}: {e}")
+            if updated is not None and updated.status == "failed":
+                logger.error(f"Job {job.id} ({job.kind}) failed after {updated.attempts} attempts: {e}")
+            else:
+                logger.warning(f"Job {job.id} ({job.kind}) attempt {job.attempts} failed, will retry: {e}")
+        else:
+            self.completed += 1
+            await self.run_io(self.queue.complete, job.id)
+        finally:
+            self._slots.release()
+            self.wake()
+
+    async def stop(self) -> None:
+        """Cancel jobs in flight (their leases expire and they are retried)."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": os.path.basename(self.queue.path),
+            "concurrency": self.concurrency,
+            "in_flight": len(self._tasks),
+            "completed": self.completed,
+            "failed_attempts": self.failed_attempts,
+            "jobs": self.queue.counts(),
+        }
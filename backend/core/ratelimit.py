@@ -0,0 +1,233 @@
+# Rate Limiting
+# Sliding-window request counters with an in-memory or shared SQLite backend
+
+import asyncio
+import math
+import sqlite3
+from abc import ABC, abstractmethod
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+
+def _sliding_window(
+    window_index: int,
+    current: int,
+    previous: int,
+    now: float,
+    limit: int,
+    window: float,
+) -> Tuple[bool, int, int, int, int]:
+    """
+    Roll a (window_index, current, previous) counter forward to now and try to
+    count one request against it.
+
+    The request rate is estimated as the current window's count plus the
+    previous window's count weighted by how much of it still overlaps the
+    last `window` seconds. Returns (allowed, retry_after, window_index,
+    current, previous) with the updated counter.
+    """
+    index = int(now // window)
+    if index != window_index:
+        previous = current if index == window_index + 1 else 0
+        current = 0
+        window_index = index
+    elapsed = now - index * window
+    estimate = previous * (1.0 - elapsed / window) + current
+    if estimate < limit:
+        return True, 0, window_index, current + 1, previous
+    if current >= limit or previous == 0:
+        wait = window - elapsed
+    else:
+        # Time until the previous window's weight has decayed enough
+        wait = window * (1.0 - (limit - current) / previous) - elapsed
+    return False, max(1, math.ceil(wait)), window_index, current, previous
+
+
+class RateLimiter(ABC):
+    """
+    Base class for rate limiter backends.
+
+    hit() counts one request for key and returns (allowed, retry_after
+    seconds). Memory use is bounded: one fixed-size counter per key, and keys
+    idle for two windows are evicted.
+    """
+
+    backend = "base"
+
+    def __init__(self, limit: int, window: float = 60.0):
+        self.limit = limit
+        self.window = window
+        self.allowed = 0
+        self.rejected = 0
+
+    @abstractmethod
+    async def hit(self, key: str) -> Tuple[bool, int]:
+        ...
+
+    @abstractmethod
+    def keys(self) -> int:
+        """Keys currently tracked. May block (sqlite); call through the I/O pool."""
+
+    def close(self) -> None:
+        pass
+
+    def _record(self, allowed: bool) -> None:
+        if allowed:
+            self.allowed += 1
+        else:
+            self.rejected += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "limit": self.limit,
+            "window_seconds": self.window,
+            "keys": self.keys(),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
+
+
+class MemoryRateLimiter(RateLimiter):
+    """
+    Per-process counters. Not shared between uvicorn workers, so with N
+    workers a client can get up to N x limit requests through.
+    """
+
+    backend = "memory"
+
+    def __init__(self, limit: int, window: float = 60.0, max_keys: int = 100_000):
+        super().__init__(limit, window)
+        self.max_keys = max(1, max_keys)
+        self.evictions = 0
+        # key -> [window_index, current, previous]
+        self._counters: Dict[str, list] = {}
+        self._next_sweep = time.time() + window
+
+    async def hit(self, key: str) -> Tuple[bool, int]:
+        now = time.time()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        counter = self._counters.get(key)
+        if counter is None:
+            if len(self._counters) >= self.max_keys:
+                self._sweep(now)
+                if len(self._counters) >= self.max_keys:
+                    # Still full of active keys: drop the oldest
+                    del self._counters[next(iter(self._counters))]
+                    self.evictions += 1
+            counter = self._counters[key] = [0, 0, 0]
+
+        allowed, retry_after, counter[0], counter[1], counter[2] = _sliding_window(
+            counter[0], counter[1], counter[2], now, self.limit, self.window
+        )
+        self._record(allowed)
+        return allowed, retry_after
+
+    def _sweep(self, now: float) -> None:
+        """Drop keys whose last request is more than one full window old."""
+        oldest_live = int(now // self.window) - 1
+        stale = [key for key, counter in self._counters.items() if counter[0] < oldest_live]
+        for key in stale:
+            del self._counters[key]
+        self.evictions += len(stale)
+        self._next_sweep = now + self.window
+
+    def keys(self) -> int:
+        return len(self._counters)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "max_keys": self.max_keys, "evictions": self.evictions}
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """
+    Counters kept in a SQLite file, so every uvicorn worker on the host
+    enforces the same limit. Each hit is one short write transaction; it is
+    blocking and serialized by a lock anyway, so hit() runs it on a thread of
+    its own rather than the shared I/O pool, where it would queue behind (and
+    be refused along with) the requests it is limiting.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str, limit: int, window: float = 60.0):
+        super().__init__(limit, window)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            " key TEXT PRIMARY KEY,"
+            " window_index INTEGER NOT NULL,"
+            " current INTEGER NOT NULL,"
+            " previous INTEGER NOT NULL)"
+        )
+        self._next_sweep = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kuiper-ratelimit")
+
+    async def hit(self, key: str) -> Tuple[bool, int]:
+        loop = asyncio.get_running_loop()
+        allowed, retry_after = await loop.run_in_executor(self._executor, self.hit_sync, key)
+        self._record(allowed)
+        return allowed, retry_after
+
+    def hit_sync(self, key: str) -> Tuple[bool, int]:
+        now = time.time()
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if now >= self._next_sweep:
+                    self._delete_stale(now)
+                row = conn.execute(
+                    "SELECT window_index, current, previous FROM rate_limits WHERE key = ?", (key,)
+                ).fetchone()
+                allowed, retry_after, index, current, previous = _sliding_window(
+                    *(row or (0, 0, 0)), now, self.limit, self.window
+                )
+                if allowed or row is None or row[0] != index:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO rate_limits (key, window_index, current, previous)"
+                        " VALUES (?, ?, ?, ?)",
+                        (key, index, current, previous),
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return allowed, retry_after
+
+    def _delete_stale(self, now: float) -> None:
+        self._conn.execute("DELETE FROM rate_limits WHERE window_index < ?", (int(now // self.window) - 1,))
+        self._next_sweep = now + self.window
+
+    def keys(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
+
+
+def create_rate_limiter(
+    backend: str,
+    limit: int,
+    window: float = 60.0,
+    path: Optional[str] = None,
+) -> RateLimiter:
+    """Build the limiter for a backend name ("memory" or "sqlite")."""
+    if backend == "memory":
+        return MemoryRateLimiter(limit, window)
+    if backend == "sqlite":
+        if not path:
+            raise ValueError("The sqlite rate limit backend needs a database path")
+        return SQLiteRateLimiter(path, limit, window)
+    raise ValueError(f"Unknown rate limit backend: {backend}")
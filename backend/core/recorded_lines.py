@@ -0,0 +1,86 @@
+# Recorded Lines
+# Compact bitset of the line indexes one recorder has a take for in one script
+
+import base64
+from typing import Iterable, List, Optional
+
+
+class RecordedLines:
+    """
+    Bit i is set when line i has a take. Stored as a bytearray, least
+    significant bit first within each byte, so a 1,547-line script is
+    194 bytes; it grows as higher indexes are added.
+    """
+
+    def __init__(self, indexes: Iterable[int] = ()):
+        self._bits = bytearray()
+        self._count = 0
+        for index in indexes:
+            self.add(index)
+
+    def add(self, index: int) -> None:
+        if index < 0:
+            raise ValueError(f"Line index must be >= 0, got {index}")
+        byte, bit = divmod(index, 8)
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte + 1 - len(self._bits)))
+        if not self._bits[byte] >> bit & 1:
+            self._bits[byte] |= 1 << bit
+            self._count += 1
+
+    def discard(self, index: int) -> None:
+        byte, bit = divmod(index, 8)
+        if 0 <= byte < len(self._bits) and self._bits[byte] >> bit & 1:
+            self._bits[byte] &= ~(1 << bit) & 0xFF
+            self._count -= 1
+
+    def __contains__(self, index: int) -> bool:
+        byte, bit = divmod(index, 8)
+        return 0 <= byte < len(self._bits) and bool(self._bits[byte] >> bit & 1)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def indexes(self) -> List[int]:
+        return [i for i in range(len(self._bits) * 8) if i in self]
+
+    def next_missing(self, total: int, start: int = 0) -> Optional[int]:
+        """
+        The first line in [start, total) without a take, wrapping around to
+        [0, start); None when all total lines are recorded. Full bytes are
+        skipped whole, so this is a scan of total / 8 bytes at worst.
+        """
+        if total <= 0 or self.count_below(total) >= total:
+            return None
+        start = min(max(start, 0), total - 1)
+        for lo, hi in ((start, total), (0, start)):
+            index = lo
+            while index < hi:
+                byte, bit = divmod(index, 8)
+                if byte >= len(self._bits):
+                    return index
+                if bit == 0 and self._bits[byte] == 0xFF:
+                    index += 8
+                    continue
+                if not self._bits[byte] >> bit & 1:
+                    return index
+                index += 1
+        return None
+
+    def count_below(self, total: int) -> int:
+        """Recorded lines among 0..total-1 (a script may have shrunk since)."""
+        full, rest = divmod(total, 8)
+        count = sum(bin(b).count("1") for b in self._bits[:full])
+        if rest and full < len(self._bits):
+            count += bin(self._bits[full] & ((1 << rest) - 1)).count("1")
+        return count
+
+    def to_base64(self, total: int) -> str:
+        """The first total bits, padded with zeros to whole bytes, base64-encoded."""
+        size = (total + 7) // 8
+        bits = bytearray(self._bits[:size])
+        bits.extend(bytes(size - len(bits)))
+        if total % 8:
+            bits[-1] &= (1 << total % 8) - 1
+        return base64.b64encode(bytes(bits)).decode()
+
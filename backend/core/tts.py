@@ -0,0 +1,142 @@
+# TTS Pronunciation
+# Content-addressed memory + disk cache in front of the TTS engine
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from typing import Any, Dict, Optional
+
+from .cache import DiskCache, SingleFlight, TTLCache
+from .config import get_settings
+from .metrics import stage_timer
+from .tts_engines import TTSEngine, create_engine
+from .workers import run_io
+
+logger = logging.getLogger('kuiper.tts')
+
+MAX_TEXT_LENGTH = 500
+
+# espeak-ng voice names and variants, e.g. "en", "en-us", "f3"
+_VOICE_NAME = re.compile(r"^[A-Za-z0-9_-]{1,32}$")
+
+
+def normalize_text(text: str) -> str:
+    return text.strip()[:MAX_TEXT_LENGTH]
+
+
+def valid_voice_name(name: str) -> bool:
+    return bool(_VOICE_NAME.match(name)) and not name.startswith("-")
+
+
+_engine: Optional[TTSEngine] = None
+_engine_lock: Optional[asyncio.Lock] = None
+
+
+async def start_engine() -> TTSEngine:
+    """Create and start the configured engine once (workers are spawned off
+    the event loop)."""
+    global _engine, _engine_lock
+    if _engine is None:
+        if _engine_lock is None:
+            _engine_lock = asyncio.Lock()
+        async with _engine_lock:
+            if _engine is None:
+                settings = get_settings()
+                _engine = await run_io(
+                    create_engine,
+                    settings.tts_engine,
+                    settings.tts_workers,
+                    settings.worker_acquire_timeout,
+                    settings.tts_library,
+                    settings.tts_data_path,
+                )
+                logger.info(f"TTS engine: {_engine.name} ({_engine.version})")
+    return _engine
+
+
+async def stop_engine() -> None:
+    global _engine
+    if _engine is not None:
+        await _engine.close()
+        _engine = None
+
+
+def engine_version() -> str:
+    """Version of the running engine. Part of every cache key, so switching
+    or upgrading engines never serves old audio under the same ETag."""
+    return _engine.version if _engine is not None else "unknown"
+
+
+def cache_key(text: str, lang: str, voice: str = "") -> str:
+    """Content address for a pronunciation: sha256 of engine, voice and text."""
+    material = "\0".join([engine_version(), lang, voice, normalize_text(text)])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+_memory: Optional[TTLCache] = None
+_disk: Optional[DiskCache] = None
+_loads = SingleFlight()
+synthesized = 0
+
+
+def _get_memory_cache() -> TTLCache:
+    global _memory
+    if _memory is None:
+        settings = get_settings()
+        _memory = TTLCache("tts", max_entries=settings.tts_cache_entries, ttl=settings.tts_cache_ttl)
+    return _memory
+
+
+def _get_disk_cache() -> Optional[DiskCache]:
+    global _disk
+    settings = get_settings()
+    if _disk is None and settings.tts_cache_max_mb > 0:
+        directory = settings.tts_cache_dir or os.path.join(tempfile.gettempdir(), "kuiper-tts")
+        _disk = DiskCache("tts_disk", directory, settings.tts_cache_max_mb * 1024 * 1024)
+    return _disk
+
+
+async def _load(key: str, text: str, lang: str, voice: str) -> bytes:
+    global synthesized
+    disk = _disk if _disk is not None else await run_io(_get_disk_cache)
+    with stage_timer("tts.disk_read"):
+        audio = await run_io(disk.get, key) if disk is not None else None
+    if audio is None:
+        engine = await start_engine()
+        with stage_timer("tts.synthesize"):
+            audio = await engine.synthesize(normalize_text(text), lang, voice)
+        synthesized += 1
+        if disk is not None:
+            try:
+                await run_io(disk.set, key, audio)
+            except OSError as e:
+                logger.warning(f"Could not write TTS cache entry: {e}")
+    _get_memory_cache().set(key, audio)
+    return audio
+
+
+async def pronounce(text: str, lang: str, voice: str = "", key: Optional[str] = None) -> bytes:
+    """
+    WAV audio for text, from memory, then disk, then the engine.
+
+    Concurrent requests for the same key share one synthesis. Raises
+    TTSError subclasses or PoolSaturatedError.
+    """
+    key = key or cache_key(text, lang, voice)
+    memory = _get_memory_cache()
+    audio = memory.get(key)
+    if audio is None:
+        audio = await _loads.run(key, _load, key, text, lang, voice)
+    return audio
+
+
+def tts_cache_stats() -> Dict[str, Any]:
+    return {
+        "memory": _get_memory_cache().stats(),
+        "disk": _disk.stats() if _disk is not None else None,
+        "synthesized": synthesized,
+        "engine": _engine.stats() if _engine is not None else None,
+    }
@@ -0,0 +1,414 @@
+# TTS Engines
+# espeak-ng synthesis, either as warm worker processes or one process per call
+
+import asyncio
+import ctypes
+import ctypes.util
+import io
+import logging
+import multiprocessing
+import os
+import struct
+import subprocess
+import time
+import wave
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from .workers import PoolSaturatedError, run_io
+
+logger = logging.getLogger('kuiper.tts')
+
+SYNTHESIS_TIMEOUT = 10.0  # seconds
+WORKER_START_TIMEOUT = 30.0  # seconds
+
+
+class TTSError(RuntimeError):
+    """Synthesis failed."""
+
+
+class TTSUnavailableError(TTSError):
+    """No espeak-ng binary or library on this host."""
+
+
+class TTSTimeoutError(TTSError):
+    """Synthesis took longer than the timeout."""
+
+
+def voice_spec(lang: str, voice: str = "") -> str:
+    """espeak-ng voice argument: language plus optional variant, e.g. en+f3."""
+    return f"{lang}+{voice}" if voice else lang
+
+
+def _fix_wav_sizes(data: bytes) -> bytes:
+    """espeak-ng --stdout cannot seek back, so its RIFF and data sizes are
+    placeholders. Rewrite them from the actual length."""
+    if len(data) < 44 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return data
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        if chunk_id == b"data":
+            fixed = bytearray(data)
+            fixed[4:8] = struct.pack("<I", len(data) - 8)
+            fixed[pos + 4:pos + 8] = struct.pack("<I", len(data) - pos - 8)
+            return bytes(fixed)
+        size = struct.unpack("<I", data[pos + 4:pos + 8])[0]
+        pos += 8 + size + (size & 1)
+    return data
+
+
+class TTSEngine(ABC):
+    """
+    Base class for synthesis backends.
+
+    start() is blocking and done once (at app startup, off the event loop);
+    synthesize() returns WAV bytes and raises TTSUnavailableError,
+    TTSTimeoutError, TTSError or PoolSaturatedError.
+    """
+
+    name = "base"
+
+    def __init__(self, workers: int, acquire_timeout: float, timeout: float = SYNTHESIS_TIMEOUT):
+        self.workers = max(1, workers)
+        self.acquire_timeout = acquire_timeout
+        self.timeout = timeout
+        self.version = "unknown"
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self._total_seconds = 0.0
+
+    def start(self) -> None:
+        pass
+
+    @abstractmethod
+    async def synthesize(self, text: str, lang: str, voice: str = "") -> bytes:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+    def _record(self, started: float) -> None:
+        self.completed += 1
+        self._total_seconds += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "engine": self.name,
+            "version": self.version,
+            "workers": self.workers,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "avg_ms": round(self._total_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+        }
+
+
+class SubprocessEngine(TTSEngine):
+    """
+    One espeak-ng process per call, WAV read from its stdout. At most
+    `workers` run at once; the process is killed on timeout.
+    """
+
+    name = "subprocess"
+
+    def __init__(self, workers: int, acquire_timeout: float, timeout: float = SYNTHESIS_TIMEOUT):
+        super().__init__(workers, acquire_timeout, timeout)
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def start(self) -> None:
+        try:
+            result = subprocess.run(["espeak-ng", "--version"], capture_output=True, timeout=5)
+            self.version = result.stdout.decode(errors="replace").strip() or "espeak-ng"
+        except (OSError, subprocess.SubprocessError):
+            self.version = "unavailable"
+
+    async def synthesize(self, text: str, lang: str, voice: str = "") -> bytes:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise PoolSaturatedError("tts")
+        started = time.perf_counter()
+        try:
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    "espeak-ng", "--stdout", "-v", voice_spec(lang, voice), text,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            except FileNotFoundError:
+                raise TTSUnavailableError("espeak-ng is not installed")
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), self.timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                self.timeouts += 1
+                raise TTSTimeoutError(f"espeak-ng took longer than {self.timeout}s")
+            if proc.returncode != 0:
+                self.failed += 1
+                raise TTSError(f"espeak-ng exited with {proc.returncode}: {stderr.decode(errors='replace').strip()}")
+            self._record(started)
+            return _fix_wav_sizes(stdout)
+        finally:
+            self._slots.release()
+
+
+# ----------------------------------------------------------------------------
+# Warm worker processes around libespeak-ng
+# ----------------------------------------------------------------------------
+
+AUDIO_OUTPUT_SYNCHRONOUS = 2
+POS_CHARACTER = 1
+espeakCHARS_UTF8 = 1
+
+_SynthCallback = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ctypes.c_short), ctypes.c_int, ctypes.c_void_p)
+
+
+def find_espeak_library(path: str = "") -> Optional[str]:
+    return path or ctypes.util.find_library("espeak-ng")
+
+
+def _espeak_worker(conn, library: str, data_path: str) -> None:
+    """
+    Worker process: load libespeak-ng once, then synthesize requests from conn
+    until it is closed. Replies ("ok", wav_bytes) or ("error", message); the
+    first message is ("ready", version) or ("unavailable", message).
+    """
+    try:
+        lib = ctypes.CDLL(library)
+        lib.espeak_Initialize.restype = ctypes.c_int
+        lib.espeak_Initialize.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+        lib.espeak_Info.restype = ctypes.c_char_p
+        lib.espeak_Info.argtypes = [ctypes.c_void_p]
+        lib.espeak_SetVoiceByName.argtypes = [ctypes.c_char_p]
+        lib.espeak_Synth.argtypes = [
+            ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint, ctypes.c_int,
+            ctypes.c_uint, ctypes.c_uint, ctypes.c_void_p, ctypes.c_void_p,
+        ]
+        sample_rate = lib.espeak_Initialize(AUDIO_OUTPUT_SYNCHRONOUS, 0, data_path.encode() or None, 0)
+        if sample_rate <= 0:
+            raise OSError("espeak_Initialize failed")
+        version = lib.espeak_Info(None).decode()
+    except (OSError, AttributeError) as e:
+        conn.send(("unavailable", str(e)))
+        return
+
+    chunks: List[bytes] = []
+
+    def on_samples(wav, num_samples, events):
+        if wav and num_samples > 0:
+            chunks.append(ctypes.string_at(wav, num_samples * 2))
+        return 0
+
+    callback = _SynthCallback(on_samples)
+    lib.espeak_SetSynthCallback(callback)
+    conn.send(("ready", f"libespeak-ng {version}"))
+
+    while True:
+        try:
+            text, spec = conn.recv()
+        except (EOFError, OSError):
+            return
+        chunks.clear()
+        if lib.espeak_SetVoiceByName(spec.encode()) != 0:
+            conn.send(("error", f"Unknown voice: {spec}"))
+            continue
+        encoded = text.encode("utf-8")
+        status = lib.espeak_Synth(encoded, len(encoded) + 1, 0, POS_CHARACTER, 0, espeakCHARS_UTF8, None, None)
+        if status != 0:
+            conn.send(("error", f"espeak_Synth returned {status}"))
+            continue
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(sample_rate)
+            wf.writeframes(b"".join(chunks))
+        conn.send(("ok", buf.getvalue()))
+
+
+class _Worker:
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+
+    def kill(self) -> None:
+        self.conn.close()
+        self.process.kill()
+        self.process.join()
+
+
+class EspeakPoolEngine(TTSEngine):
+    """
+    A fixed set of long-lived worker processes, each holding an initialized
+    libespeak-ng (the library keeps global state, so one per process).
+    Requests take an idle worker from an asyncio queue, waiting up to
+    acquire_timeout before PoolSaturatedError; replies are read when the
+    worker's pipe becomes readable, so the event loop never blocks. A worker
+    that times out or dies is replaced.
+    """
+
+    name = "pool"
+
+    def __init__(
+        self,
+        workers: int,
+        acquire_timeout: float,
+        library: str,
+        data_path: str = "",
+        timeout: float = SYNTHESIS_TIMEOUT,
+    ):
+        super().__init__(workers, acquire_timeout, timeout)
+        self.library = library
+        self.data_path = data_path
+        self.restarts = 0
+        self._ctx = multiprocessing.get_context("spawn")
+        self._all: List[_Worker] = []
+        self._idle: Optional[asyncio.Queue] = None
+
+    def _spawn(self) -> _Worker:
+        parent, child = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_espeak_worker,
+            args=(child, self.library, self.data_path),
+            name="kuiper-tts",
+            daemon=True,
+        )
+        process.start()
+        child.close()
+        worker = _Worker(process, parent)
+        if not parent.poll(WORKER_START_TIMEOUT):
+            worker.kill()
+            raise TTSUnavailableError("espeak-ng worker did not start")
+        try:
+            kind, detail = parent.recv()
+        except EOFError:
+            worker.kill()
+            raise TTSUnavailableError("espeak-ng worker exited during startup")
+        if kind != "ready":
+            worker.kill()
+            raise TTSUnavailableError(detail)
+        self.version = detail
+        return worker
+
+    def start(self) -> None:
+        """Spawn all workers. Blocking; raises TTSUnavailableError."""
+        self._all = [self._spawn() for _ in range(self.workers)]
+
+    async def _replace(self, worker: _Worker) -> None:
+        worker.kill()
+        self._all.remove(worker)
+        self.restarts += 1
+        try:
+            fresh = await run_io(self._spawn)
+        except (TTSError, PoolSaturatedError) as e:
+            logger.error(f"Could not restart TTS worker: {e}")
+            return
+        self._all.append(fresh)
+        self._idle.put_nowait(fresh)
+
+    async def _request(self, worker: _Worker, message) -> tuple:
+        loop = asyncio.get_running_loop()
+        reply = loop.create_future()
+        fd = worker.conn.fileno()
+
+        def readable():
+            loop.remove_reader(fd)
+            if reply.done():
+                return
+            try:
+                reply.set_result(worker.conn.recv())
+            except (EOFError, OSError) as e:
+                reply.set_exception(TTSError(f"TTS worker died: {e}"))
+
+        worker.conn.send(message)
+        loop.add_reader(fd, readable)
+        try:
+            return await asyncio.wait_for(reply, self.timeout)
+        finally:
+            loop.remove_reader(fd)
+
+    async def synthesize(self, text: str, lang: str, voice: str = "") -> bytes:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for worker in self._all:
+                self._idle.put_nowait(worker)
+        if not self._all:
+            raise TTSUnavailableError("No TTS workers running")
+        try:
+            worker = await asyncio.wait_for(self._idle.get(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise PoolSaturatedError("tts")
+
+        started = time.perf_counter()
+        try:
+            kind, payload = await self._request(worker, (text, voice_spec(lang, voice)))
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            await self._replace(worker)
+            raise TTSTimeoutError(f"espeak-ng took longer than {self.timeout}s")
+        except TTSError:
+            self.failed += 1
+            await self._replace(worker)
+            raise
+        except BaseException:
+            # Cancelled mid-request: the reply would be read by the next caller
+            await asyncio.shield(self._replace(worker))
+            raise
+        self._idle.put_nowait(worker)
+        if kind != "ok":
+            self.failed += 1
+            raise TTSError(payload)
+        self._record(started)
+        return payload
+
+    async def close(self) -> None:
+        for worker in self._all:
+            worker.kill()
+        self._all = []
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "idle": self._idle.qsize() if self._idle is not None else len(self._all),
+            "restarts": self.restarts,
+        }
+
+
+def create_engine(
+    kind: str,
+    workers: int,
+    acquire_timeout: float,
+    library: str = "",
+    data_path: str = "",
+) -> TTSEngine:
+    """
+    Build and start an engine. Blocking. kind is "pool", "subprocess" or
+    "auto" (pool when libespeak-ng can be loaded, else subprocess).
+    """
+    if kind not in ("auto", "pool", "subprocess"):
+        raise ValueError(f"Unknown TTS engine: {kind}")
+    if kind in ("auto", "pool"):
+        found = find_espeak_library(library)
+        if found:
+            engine = EspeakPoolEngine(workers, acquire_timeout, found, data_path or os.environ.get("ESPEAK_DATA_PATH", ""))
+            try:
+                engine.start()
+                return engine
+            except TTSUnavailableError as e:
+                if kind == "pool":
+                    raise
+                logger.warning(f"libespeak-ng worker pool unavailable ({e}); using espeak-ng subprocesses")
+        elif kind == "pool":
+            raise TTSUnavailableError("libespeak-ng not found")
+    engine = SubprocessEngine(workers, acquire_timeout)
+    engine.start()
+    return engine
@@ -0,0 +1,232 @@
+# Resumable Uploads
+# Upload sessions staged on local disk chunk by chunk, verified by checksum and finalized as one file
+
+import hashlib
+import json
+import os
+import re
+import secrets
+import shutil
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from .audio_processor import WavStreamAnalyzer
+from .uploads import CHUNK_SIZE, SpooledUpload, UploadTooLargeError
+
+_SESSION_ID = re.compile(r"^[0-9a-f]{32}$")
+_META = "session.json"
+_DATA = "data.part"
+
+
+class UploadSessionNotFoundError(LookupError):
+    """No such session, it belongs to someone else, or it expired."""
+
+
+class OffsetMismatchError(ValueError):
+    """A chunk did not start at or before the bytes received so far, or a
+    session was finalized before all of it arrived. offset is what the
+    server has; the client resumes from there."""
+
+    def __init__(self, message: str, offset: int):
+        super().__init__(message)
+        self.offset = offset
+
+
+class ChecksumMismatchError(ValueError):
+    """A chunk or the assembled file does not match the SHA-256 the client sent."""
+
+
+@dataclass
+class UploadSession:
+    id: str
+    user_id: str
+    script_id: int
+    line_index: int
+    phrase_text: str
+    size: int  # total bytes the client will send
+    sha256: Optional[str]  # of the whole file, checked on finalize when given
+    created_at: float
+    offset: int = 0  # bytes received so far (not persisted; the data file's size)
+    updated_at: float = 0.0
+
+
+class UploadSessionStore:
+    """
+    One directory per session holding session.json (written once at init)
+    and data.part, which chunks are written into at their offsets.
+
+    The data file is the session's only mutable state: its size is the
+    resume offset and its mtime the last activity, so several uvicorn
+    workers can share the directory and a retried chunk simply overwrites
+    the same bytes. Blocking; call through the I/O pool.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, ttl: float = 86400.0):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _dir(self, session_id: str) -> Path:
+        if not _SESSION_ID.match(session_id):
+            raise UploadSessionNotFoundError(session_id)
+        return self.directory / session_id
+
+    def create(
+        self,
+        user_id: str,
+        script_id: int,
+        line_index: int,
+        phrase_text: str,
+        size: int,
+        sha256: Optional[str] = None,
+    ) -> UploadSession:
+        """
+        Start a session for size bytes.
+
+        Raises:
+            UploadTooLargeError: size is over the upload limit
+        """
+        if size > self.max_bytes:
+            raise UploadTooLargeError(self.max_bytes)
+        session = UploadSession(
+            id=secrets.token_hex(16),
+            user_id=user_id,
+            script_id=script_id,
+            line_index=line_index,
+            phrase_text=phrase_text,
+            size=size,
+            sha256=sha256.lower() if sha256 else None,
+            created_at=time.time(),
+        )
+        path = self._dir(session.id)
+        path.mkdir()
+        (path / _DATA).touch()
+        meta = {k: v for k, v in asdict(session).items() if k not in ("offset", "updated_at")}
+        tmp = path / f".{_META}.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, path / _META)
+        session.updated_at = session.created_at
+        return session
+
+    def get(self, session_id: str, user_id: str) -> UploadSession:
+        """The session with its current offset. Raises UploadSessionNotFoundError
+        if it does not exist, has expired or is not user_id's."""
+        path = self._dir(session_id)
+        try:
+            meta = json.loads((path / _META).read_text())
+            st = (path / _DATA).stat()
+        except (FileNotFoundError, ValueError):
+            raise UploadSessionNotFoundError(session_id)
+        if meta["user_id"] != user_id or st.st_mtime < time.time() - self.ttl:
+            raise UploadSessionNotFoundError(session_id)
+        return UploadSession(**meta, offset=st.st_size, updated_at=st.st_mtime)
+
+    def write_chunk(
+        self,
+        session_id: str,
+        user_id: str,
+        offset: int,
+        data: bytes,
+        sha256: Optional[str] = None,
+    ) -> UploadSession:
+        """
+        Write data at offset and return the session with its new offset.
+
+        offset may be below the current offset (a retried chunk) but not
+        past it, so the file never has holes.
+
+        Raises:
+            UploadSessionNotFoundError, OffsetMismatchError,
+            ChecksumMismatchError: nothing was written
+            UploadTooLargeError: the chunk runs past the declared size
+        """
+        session = self.get(session_id, user_id)
+        if sha256 and hashlib.sha256(data).hexdigest() != sha256.lower():
+            raise ChecksumMismatchError("Chunk checksum mismatch")
+        if offset < 0 or offset > session.offset:
+            raise OffsetMismatchError(f"Expected a chunk at or before offset {session.offset}", session.offset)
+        if offset + len(data) > session.size:
+            raise UploadTooLargeError(session.size)
+        fd = os.open(self._dir(session_id) / _DATA, os.O_WRONLY)
+        try:
+            written = 0
+            while written < len(data):
+                written += os.pwrite(fd, memoryview(data)[written:], offset + written)
+        finally:
+            os.close(fd)
+        session.offset = max(session.offset, offset + len(data))
+        session.updated_at = time.time()
+        return session
+
+    def assemble(self, session_id: str, user_id: str, analyze: bool = True) -> SpooledUpload:
+        """
+        Verify a complete session and analyze it in one streaming pass.
+        With analyze=False it is only verified (audio_info None), for callers
+        that analyze on the CPU pool (core.uploads.analyze_payload).
+
+        The returned upload points at a hard link to the staged data, so its
+        cleanup() (or re-encoding) leaves the session intact for a retried
+        finalize; call discard() once the recording is saved.
+
+        Raises:
+            UploadSessionNotFoundError
+            OffsetMismatchError: not all bytes have arrived
+            ChecksumMismatchError: the file does not match the declared SHA-256
+        """
+        session = self.get(session_id, user_id)
+        if session.offset != session.size:
+            raise OffsetMismatchError(f"Upload incomplete: {session.offset} of {session.size} bytes", session.offset)
+        path = self._dir(session_id)
+        analyzer = WavStreamAnalyzer() if analyze else None
+        digest = hashlib.sha256()
+        with open(path / _DATA, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                if analyzer is not None:
+                    analyzer.feed(chunk)
+                digest.update(chunk)
+        if session.sha256 and digest.hexdigest() != session.sha256:
+            raise ChecksumMismatchError("File checksum mismatch; restart the upload")
+
+        link = path / f"assembled-{secrets.token_hex(4)}.wav"
+        try:
+            os.link(path / _DATA, link)
+        except OSError:
+            shutil.copyfile(path / _DATA, link)
+        audio_info = analyzer.result() if analyzer is not None else None
+        return SpooledUpload(size=session.size, audio_info=audio_info, path=str(link))
+
+    def discard(self, session_id: str) -> None:
+        shutil.rmtree(self._dir(session_id), ignore_errors=True)
+
+    def collect_garbage(self) -> List[str]:
+        """Remove sessions with no activity for ttl seconds; returns their ids."""
+        cutoff = time.time() - self.ttl
+        removed = []
+        for path in self.directory.iterdir():
+            if not _SESSION_ID.match(path.name):
+                continue
+            try:
+                active = (path / _DATA).stat().st_mtime
+            except FileNotFoundError:
+                # Half-created or half-removed; judge by the directory itself
+                try:
+                    active = path.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+            if active < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+                removed.append(path.name)
+        return removed
+
+    def stats(self) -> dict:
+        sessions = staged = 0
+        for path in self.directory.glob(f"*/{_DATA}"):
+            try:
+                staged += path.stat().st_size
+            except FileNotFoundError:
+                continue
+            sessions += 1
+        return {"sessions": sessions, "staged_bytes": staged, "ttl_seconds": self.ttl}
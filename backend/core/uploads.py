@@ -0,0 +1,152 @@
+# Upload Spooling
+# Reads uploaded audio in chunks with a hard size limit, analyzing as it goes
+
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO, Optional, Tuple, Union
+
+from .audio_convert import ConvertOptions, convert_wav
+from .audio_processor import AudioInfo, WavStreamAnalyzer, analyze_wav_bytes
+from .metrics import stage_timer
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised as soon as an upload crosses its size limit."""
+
+    def __init__(self, limit_bytes: int):
+        super().__init__(f"Upload exceeds {limit_bytes} bytes")
+        self.limit_bytes = limit_bytes
+
+
+@dataclass
+class SpooledUpload:
+    """An upload that has been size-checked and analyzed.
+
+    Small uploads are held in memory (data); larger ones live in a temp file
+    (path) so they can be streamed to storage. Call cleanup() when done.
+    """
+
+    size: int
+    audio_info: Optional[AudioInfo]  # None until analyzed (spool_upload(analyze=False))
+    data: Optional[bytes] = None
+    path: Optional[str] = None
+    original_size: Optional[int] = None  # set when the audio was re-encoded
+    format: str = "wav"  # "wav" or "flac" (core.codecs.STORAGE_FORMATS)
+
+    def replace(self, data: bytes, audio_info: Optional[AudioInfo] = None, format: str = "wav") -> None:
+        """Swap in re-encoded audio, remembering the uploaded size. The
+        analysis is kept when the encoding is lossless (audio_info None)."""
+        if self.original_size is None:
+            self.original_size = self.size
+        self.cleanup()
+        self.data = data
+        self.size = len(data)
+        self.format = format
+        if audio_info is not None:
+            self.audio_info = audio_info
+
+    @property
+    def payload(self) -> Union[bytes, str]:
+        """Bytes, or a file path storage clients can stream from."""
+        return self.data if self.path is None else self.path
+
+    def cleanup(self) -> None:
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+
+def spool_upload(
+    src: BinaryIO,
+    max_bytes: int,
+    memory_limit: int = 4 * 1024 * 1024,
+    chunk_size: int = CHUNK_SIZE,
+    analyze: bool = True,
+) -> SpooledUpload:
+    """
+    Copy src in chunks, enforcing max_bytes and running WAV analysis
+    incrementally. Blocking; run it on a worker pool.
+
+    The copy is I/O-bound but the analysis is numpy work. With analyze=False
+    the upload is only spooled (audio_info None), so the read can stay on
+    the I/O pool and analyze_payload() run on the CPU pool.
+
+    Raises:
+        UploadTooLargeError: as soon as more than max_bytes have been read
+    """
+    analyzer = WavStreamAnalyzer() if analyze else None
+    chunks = []
+    size = 0
+    spool = None
+    try:
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLargeError(max_bytes)
+            if analyzer is not None:
+                analyzer.feed(chunk)
+            if spool is None and size > memory_limit:
+                spool = tempfile.NamedTemporaryFile(prefix="kuiper-upload-", suffix=".wav", delete=False)
+                spool.writelines(chunks)
+                chunks = []
+            if spool is not None:
+                spool.write(chunk)
+            else:
+                chunks.append(chunk)
+    except BaseException:
+        if spool is not None:
+            spool.close()
+            os.unlink(spool.name)
+        raise
+
+    audio_info = analyzer.result() if analyzer is not None else None
+    if spool is not None:
+        spool.close()
+        return SpooledUpload(size=size, audio_info=audio_info, path=spool.name)
+    return SpooledUpload(size=size, audio_info=audio_info, data=b"".join(chunks))
+
+
+def analyze_payload(payload: Union[bytes, str], chunk_size: int = CHUNK_SIZE) -> AudioInfo:
+    """
+    Analyze spooled audio (SpooledUpload.payload), streaming a spooled file
+    in chunks. CPU-bound and picklable; run it on the CPU pool.
+    """
+    analyzer = WavStreamAnalyzer()
+    if isinstance(payload, str):
+        with open(payload, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                analyzer.feed(chunk)
+    else:
+        for start in range(0, len(payload), chunk_size):
+            analyzer.feed(payload[start:start + chunk_size])
+    return analyzer.result()
+
+
+# Storage normalization: keep the levels as recorded, only trim and re-encode
+CANONICAL_OPTIONS = ConvertOptions(normalize=False)
+
+
+def canonicalize(payload: Union[bytes, str], options: ConvertOptions = CANONICAL_OPTIONS) -> Tuple[bytes, AudioInfo]:
+    """
+    Trim leading/trailing silence and re-encode as mono 16-bit PCM at
+    options.sample_rate, returning the new WAV and its analysis.
+
+    payload is WAV bytes or a path (SpooledUpload.payload). CPU-bound and
+    picklable; run it on the CPU pool. Raises ValueError if the audio
+    cannot be decoded or is silent.
+    """
+    if isinstance(payload, str):
+        with open(payload, "rb") as f:
+            payload = f.read()
+    with stage_timer("audio.normalize"):
+        data = convert_wav(payload, options).data
+    return data, analyze_wav_bytes(data)
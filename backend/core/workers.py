@@ -0,0 +1,181 @@
+# Worker Pools
+# Bounded executors that keep CPU-bound analysis and blocking I/O off the event loop
+
+import asyncio
+import functools
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from .config import get_settings
+
+logger = logging.getLogger('kuiper.workers')
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when a pool's queue stays full for longer than the acquire timeout."""
+
+    def __init__(self, pool_name: str, retry_after: int = 1):
+        super().__init__(f"Worker pool '{pool_name}' is saturated")
+        self.pool_name = pool_name
+        self.retry_after = retry_after
+
+
+def _timed_call(fn: Callable[..., Any], *args, **kwargs):
+    """Run fn in the worker and report when it actually started (wall clock,
+    so it is comparable across processes)."""
+    return time.time(), fn(*args, **kwargs)
+
+
+class WorkerPool:
+    """
+    An executor with admission control.
+
+    At most max_workers jobs run at once and at most max_queue more wait for
+    a worker. Callers beyond that block for up to acquire_timeout seconds and
+    then get PoolSaturatedError, so overload turns into a fast 503 instead of
+    an unbounded backlog.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: str = "thread",
+        max_workers: int = 4,
+        max_queue: int = 32,
+        acquire_timeout: float = 5.0,
+    ):
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.acquire_timeout = acquire_timeout
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._last_wait = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=f"kuiper-{self.name}",
+                )
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+        return self._slots
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) in the pool and await its result."""
+        slots = self._get_slots()
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            logger.warning(f"Worker pool '{self.name}' saturated ({self._in_flight} in flight)")
+            raise PoolSaturatedError(self.name, retry_after=max(1, int(self.acquire_timeout)))
+
+        self._in_flight += 1
+        submitted = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(_timed_call, fn, *args, **kwargs)
+            started, result = await loop.run_in_executor(self._get_executor(), call)
+            wait = max(0.0, started - submitted)
+            self._last_wait = wait
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            self._completed += 1
+            return result
+        finally:
+            self._in_flight -= 1
+            slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, utilisation and wait times (milliseconds)."""
+        running = min(self._in_flight, self.max_workers)
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": running,
+            "queued": self._in_flight - running,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "last_wait_ms": round(self._last_wait * 1000, 2),
+            "avg_wait_ms": round(self._total_wait / self._completed * 1000, 2) if self._completed else 0.0,
+            "max_wait_ms": round(self._max_wait * 1000, 2),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# ============================================================================
+# Shared pools
+# ============================================================================
+
+_pools: Dict[str, WorkerPool] = {}
+
+
+def get_cpu_pool() -> WorkerPool:
+    """Pool for CPU-bound work (audio analysis). Thread or process per settings."""
+    if "cpu" not in _pools:
+        settings = get_settings()
+        _pools["cpu"] = WorkerPool(
+            "cpu",
+            kind=settings.cpu_pool_kind,
+            max_workers=settings.cpu_workers or (os.cpu_count() or 1),
+            max_queue=settings.worker_queue_limit,
+            acquire_timeout=settings.worker_acquire_timeout,
+        )
+    return _pools["cpu"]
+
+
+def get_io_pool() -> WorkerPool:
+    """Thread pool for blocking network I/O (synchronous Supabase calls)."""
+    if "io" not in _pools:
+        settings = get_settings()
+        _pools["io"] = WorkerPool(
+            "io",
+            kind="thread",
+            max_workers=settings.io_workers,
+            max_queue=settings.worker_queue_limit,
+            acquire_timeout=settings.worker_acquire_timeout,
+        )
+    return _pools["io"]
+
+
+async def run_cpu(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run CPU-bound fn off the event loop."""
+    return await get_cpu_pool().run(fn, *args, **kwargs)
+
+
+async def run_io(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run blocking I/O fn off the event loop."""
+    return await get_io_pool().run(fn, *args, **kwargs)
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every pool created so far."""
+    return {name: pool.stats() for name, pool in _pools.items()}
+
+
+def shutdown_pools() -> None:
+    for pool in _pools.values():
+        pool.shutdown()
+    _pools.clear()
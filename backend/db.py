@@ -1,14 +1,32 @@
 # Supabase Database Layer
 # Manages connection to Supabase for scripts and recordings
 
+import asyncio
+import hashlib
 import logging
-from typing import Optional, List, Dict, Any
-from supabase import create_client, Client
+import os
+from typing import Optional, List, Dict, Any, AsyncIterator, Callable, Iterable, Tuple, Union
+from urllib.parse import quote
+
+import httpx
+from postgrest import APIError
+from storage3.exceptions import StorageApiError
+from supabase import create_client, Client, acreate_client, AsyncClient, AsyncClientOptions
+from core.audio_processor import EXTENDED_METRICS
+from core.cache import TTLCache
 from core.config import get_settings
+from core.metrics import stage_timer
+from core.recorded_lines import RecordedLines
+from core.workers import run_io
 
 logger = logging.getLogger('kuiper.db')
 
 _client: Optional[Client] = None
+_async_client: Optional[AsyncClient] = None
+_http_client: Optional[httpx.AsyncClient] = None
+_async_init_lock = asyncio.Lock()
+_async_slots: Optional[asyncio.Semaphore] = None
+_progress_rpc_available = True
 
 
 def get_supabase() -> Client:
@@ -20,70 +38,207 @@ def get_supabase() -> Client:
     return _client
 
 
+def _get_http_client() -> httpx.AsyncClient:
+    """The pooled httpx.AsyncClient shared by all Supabase traffic."""
+    global _http_client
+    if _http_client is None:
+        settings = get_settings()
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.db_max_connections,
+                max_keepalive_connections=settings.db_max_keepalive,
+            ),
+            timeout=settings.db_timeout,
+        )
+    return _http_client
+
+
+async def get_async_supabase() -> AsyncClient:
+    """Get the async Supabase client singleton.
+
+    All PostgREST and Storage traffic shares one httpx.AsyncClient, so
+    connections are pooled and kept alive across requests.
+    """
+    global _async_client
+    if _async_client is None:
+        async with _async_init_lock:
+            if _async_client is None:
+                settings = get_settings()
+                _async_client = await acreate_client(
+                    settings.supabase_url,
+                    settings.supabase_key,
+                    options=AsyncClientOptions(httpx_client=_get_http_client()),
+                )
+    return _async_client
+
+
+async def close_db() -> None:
+    """Close pooled connections held by the async client."""
+    global _async_client, _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+    _async_client = None
+    _http_client = None
+
+
+def _use_async() -> bool:
+    return get_settings().db_backend.lower() == "async"
+
+
+async def _get_client():
+    """Client for the configured backend (KUIPER_DB_BACKEND: async or sync)."""
+    if _use_async():
+        return await get_async_supabase()
+    return get_supabase()
+
+
+async def _call(fn: Callable, *args, **kwargs):
+    """Run one Supabase call without blocking the event loop.
+
+    Async backend: awaited directly, bounded by db_max_concurrency and
+    db_timeout. Sync backend: executed on the I/O worker pool.
+    """
+    if not _use_async():
+        return await run_io(fn, *args, **kwargs)
+
+    global _async_slots
+    settings = get_settings()
+    if _async_slots is None:
+        _async_slots = asyncio.Semaphore(settings.db_max_concurrency)
+    async with _async_slots:
+        return await asyncio.wait_for(fn(*args, **kwargs), timeout=settings.db_timeout)
+
+
+async def _execute(query):
+    """Execute a PostgREST query builder."""
+    return await _call(query.execute)
+
+
+# ============================================================================
+# Script Catalog Cache
+# ============================================================================
+# Scripts only change through the admin routes, which invalidate the cache;
+# the TTL bounds staleness for other workers. _catalog_version stops a read
+# that started before an invalidation from caching what it fetched.
+
+_script_cache: Optional[TTLCache] = None
+_catalog_version = 0
+
+
+def _get_script_cache() -> TTLCache:
+    global _script_cache
+    if _script_cache is None:
+        settings = get_settings()
+        _script_cache = TTLCache(
+            "scripts",
+            max_entries=settings.script_cache_size,
+            ttl=settings.script_cache_ttl,
+        )
+    return _script_cache
+
+
+def _cache_scripts(scripts: List[Dict[str, Any]], version: int, full_list: bool = False) -> None:
+    if version != _catalog_version:
+        return
+    cache = _get_script_cache()
+    for script in scripts:
+        cache.set(("id", script["id"]), script)
+        cache.set(("name", script["name"]), script)
+    if full_list:
+        cache.set(("all",), scripts)
+
+
+def invalidate_script_cache() -> None:
+    """Drop all cached scripts (called after any script write)."""
+    global _catalog_version
+    _catalog_version += 1
+    if _script_cache is not None:
+        _script_cache.clear()
+
+
 # ============================================================================
 # Scripts
 # ============================================================================
 
 async def list_scripts() -> List[Dict[str, Any]]:
     """List all scripts ordered by creation order (id)."""
-    client = get_supabase()
-    result = client.table("scripts").select("*").order("id").execute()
+    cached = _get_script_cache().get(("all",))
+    if cached is not None:
+        return cached
+    version = _catalog_version
+    client = await _get_client()
+    result = await _execute(client.table("scripts").select("*").order("id"))
+    _cache_scripts(result.data, version, full_list=True)
     return result.data
 
 
 async def get_script(script_id: int) -> Optional[Dict[str, Any]]:
     """Get a script by ID."""
-    client = get_supabase()
-    result = client.table("scripts").select("*").eq("id", script_id).execute()
+    cached = _get_script_cache().get(("id", script_id))
+    if cached is not None:
+        return cached
+    version = _catalog_version
+    client = await _get_client()
+    result = await _execute(client.table("scripts").select("*").eq("id", script_id))
+    _cache_scripts(result.data, version)
     return result.data[0] if result.data else None
 
 
 async def get_script_by_name(name: str) -> Optional[Dict[str, Any]]:
     """Get a script by name."""
-    client = get_supabase()
-    result = client.table("scripts").select("*").eq("name", name).execute()
+    cached = _get_script_cache().get(("name", name))
+    if cached is not None:
+        return cached
+    version = _catalog_version
+    client = await _get_client()
+    result = await _execute(client.table("scripts").select("*").eq("name", name))
+    _cache_scripts(result.data, version)
     return result.data[0] if result.data else None
 
 
 async def create_script(name: str, lines: List[str]) -> Dict[str, Any]:
     """Create a new script."""
-    client = get_supabase()
-    result = client.table("scripts").insert({
+    client = await _get_client()
+    result = await _execute(client.table("scripts").insert({
         "name": name,
         "lines": lines,
         "line_count": len(lines),
-    }).execute()
+    }))
+    invalidate_script_cache()
     return result.data[0]
 
 
 async def update_script(script_id: int, name: str, lines: List[str]) -> Optional[Dict[str, Any]]:
     """Update an existing script."""
-    client = get_supabase()
-    result = client.table("scripts").update({
+    client = await _get_client()
+    result = await _execute(client.table("scripts").update({
         "name": name,
         "lines": lines,
         "line_count": len(lines),
-    }).eq("id", script_id).execute()
+    }).eq("id", script_id))
+    invalidate_script_cache()
     return result.data[0] if result.data else None
 
 
 async def delete_script(script_id: int) -> bool:
     """Delete a script and its recordings."""
-    client = get_supabase()
+    client = await _get_client()
     # Delete associated recordings first (storage files)
-    recordings = client.table("recordings").select("storage_path").eq("script_id", script_id).execute()
+    recordings = await _execute(client.table("recordings").select("storage_path").eq("script_id", script_id))
     if recordings.data:
         paths = [r["storage_path"] for r in recordings.data if r.get("storage_path")]
         if paths:
             try:
-                client.storage.from_("recordings").remove(paths)
+                await _call(client.storage.from_("recordings").remove, paths)
             except Exception as e:
                 logger.warning(f"Failed to delete storage files: {e}")
 
     # Delete recordings from DB
-    client.table("recordings").delete().eq("script_id", script_id).execute()
+    await _execute(client.table("recordings").delete().eq("script_id", script_id))
+    _clear_recorded_lines()
     # Delete script
-    result = client.table("scripts").delete().eq("id", script_id).execute()
+    result = await _execute(client.table("scripts").delete().eq("id", script_id))
+    invalidate_script_cache()
     return len(result.data) > 0
 
 
@@ -91,115 +246,502 @@ async def delete_script(script_id: int) -> bool:
 # Recordings
 # ============================================================================
 
+# Columns added by migrations 004 (quality metrics), 005 and 006. Until a
+# project has applied them, PostgREST answers PGRST204 when a write names one
+# and 42703 when a select does; the recording queries then drop that
+# migration's columns and retry, like the recording_counts() fallback.
+_MIGRATED_COLUMNS = {
+    "004_extended_audio_metrics": set(EXTENDED_METRICS),
+    "005_recording_original_size": {"original_size_bytes"},
+    "006_recording_content_hash": {"content_sha256"},
+}
+_missing_columns: set = set()
+
+
+def _unknown_migration(e: APIError) -> Optional[str]:
+    """The migration whose column a PostgREST error says does not exist, if any."""
+    if e.code not in ("PGRST204", "42703"):
+        return None
+    message = e.message or ""
+    for migration, columns in _MIGRATED_COLUMNS.items():
+        if any(f"'{column}'" in message or f".{column} " in message for column in columns):
+            return migration
+    return None
+
+
+def _present_columns(columns: Iterable[str]) -> List[str]:
+    return [c for c in columns if c not in _missing_columns]
+
+
+async def _execute_without_missing(build: Callable[[], Any]):
+    """
+    Execute the query build() returns; build() leaves out the columns in
+    _missing_columns. On an error naming a column of a migration not yet
+    seen missing, remember that migration's columns and build it again.
+    """
+    while True:
+        try:
+            return await _execute(build())
+        except APIError as e:
+            migration = _unknown_migration(e)
+            if migration is None or _MIGRATED_COLUMNS[migration] <= _missing_columns:
+                raise
+            _missing_columns.update(_MIGRATED_COLUMNS[migration])
+            logger.warning(
+                f"recordings is missing the columns of migration {migration}; run "
+                f"supabase/migrations/{migration}.sql. Recordings are saved without them until then."
+            )
+
+
+def _select_list(columns: str) -> str:
+    """A select list without the migrated columns known to be missing."""
+    if not _missing_columns:
+        return columns
+    return ", ".join(c for c in (part.strip() for part in columns.split(",")) if c not in _missing_columns)
+
+
 def _sanitize_recorder_name(name: str) -> str:
     """Sanitize recorder name for use in storage paths (no spaces, special chars)."""
     import re
     return re.sub(r'[^\w\-]', '_', name.strip())[:100] or "unknown"
 
 
+def _content_sha256(audio_data: Union[bytes, str]) -> str:
+    """SHA-256 of audio bytes or of a file (read in chunks). Blocking for paths."""
+    digest = hashlib.sha256()
+    if isinstance(audio_data, str):
+        with open(audio_data, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    else:
+        digest.update(audio_data)
+    return digest.hexdigest()
+
+
 async def save_recording(
     script_id: int,
     line_index: int,
     phrase_text: str,
     recorder_name: str,
     filename: str,
-    audio_data: bytes,
+    audio_data: Union[bytes, str],
     duration_seconds: float = 0,
     peak_amplitude: float = 0,
     rms_level: float = 0,
     is_valid: bool = True,
     user_id: Optional[str] = None,
+    metrics: Optional[Dict[str, float]] = None,
+    original_size_bytes: Optional[int] = None,
+    content_type: str = "audio/wav",
 ) -> Dict[str, Any]:
     """Save a recording. Uploads audio to Supabase Storage, metadata to DB.
     Uses upsert to allow re-recording the same line by the same recorder.
     Storage path: recordings/{recorder_name}/{script_id}/{filename}
+    audio_data may be the WAV bytes or a local file path (streamed from disk).
+    metrics are extra quality columns (AudioInfo.extended_metrics()).
+    file_size_bytes is the stored size; original_size_bytes the uploaded size
+    when the audio was re-encoded before storage. The filename's extension
+    (.wav / .flac) must match content_type.
+
+    The object is written with one upsert, and skipped when the line already
+    holds the same bytes (content_sha256); the row is written only after the
+    object is in place, so a failed save never leaves a line without audio.
+    A previous take stored under another path (the other format) is removed
+    last.
     """
-    client = get_supabase()
-    safe_name = _sanitize_recorder_name(recorder_name)
-    storage_path = f"{safe_name}/{script_id}/{filename}"
-
-    # Upload audio to Supabase Storage
-    try:
-        # Remove existing file if re-recording
-        try:
-            client.storage.from_("recordings").remove([storage_path])
-        except Exception:
-            pass
-
-        client.storage.from_("recordings").upload(
-            storage_path,
-            audio_data,
-            file_options={"content-type": "audio/wav", "upsert": "true"},
-        )
-    except Exception as e:
-        logger.error(f"Failed to upload audio to storage: {e}")
-        raise
-
-    # Upsert metadata in DB
-    record = {
-        "script_id": script_id,
+    take = {
         "line_index": line_index,
         "phrase_text": phrase_text,
-        "recorder_name": recorder_name.strip(),
         "filename": filename,
-        "storage_path": storage_path,
+        "audio_data": audio_data,
         "duration_seconds": duration_seconds,
         "peak_amplitude": peak_amplitude,
         "rms_level": rms_level,
         "is_valid": is_valid,
-        "file_size_bytes": len(audio_data),
+        "metrics": metrics,
+        "original_size_bytes": original_size_bytes,
+        "content_type": content_type,
     }
-    if user_id:
-        record["user_id"] = user_id
+    (result,) = await save_recordings(script_id, recorder_name, [take], user_id=user_id)
+    if isinstance(result, Exception):
+        raise result
+    return result
 
-    result = client.table("recordings").upsert(
-        record,
-        on_conflict="script_id,line_index,recorder_name",
-    ).execute()
 
-    return result.data[0]
+async def save_recordings(
+    script_id: int,
+    recorder_name: str,
+    takes: List[Dict[str, Any]],
+    user_id: Optional[str] = None,
+    concurrency: int = 8,
+) -> List[Union[Dict[str, Any], Exception]]:
+    """
+    Save several takes of one script by one recorder: one read of the lines'
+    current rows, the storage uploads (at most concurrency at once, skipping
+    unchanged bytes), then one bulk upsert of the rows whose audio is stored.
+
+    Each take is a dict of save_recording's per-line arguments (line_index,
+    phrase_text, filename, audio_data, and optionally duration_seconds,
+    peak_amplitude, rms_level, is_valid, metrics, original_size_bytes,
+    content_type); line_index values must be distinct. Returns, in take
+    order, the saved row or the exception that failed that take; a failed
+    bulk upsert fails every uploaded take.
+    """
+    client = await _get_client()
+    safe_name = _sanitize_recorder_name(recorder_name)
+    recorder = recorder_name.strip()
+
+    with stage_timer("db.save.read"):
+        existing = await _execute_without_missing(lambda: (
+            client.table("recordings")
+            .select(_select_list("line_index, storage_path, content_sha256"))
+            .eq("script_id", script_id)
+            .eq("recorder_name", recorder)
+            .in_("line_index", sorted({take["line_index"] for take in takes}))
+        ))
+    previous = {row["line_index"]: row for row in existing.data}
+
+    slots = asyncio.Semaphore(max(1, concurrency))
+
+    async def store(take: Dict[str, Any]) -> Dict[str, Any]:
+        audio_data = take["audio_data"]
+        storage_path = f"{safe_name}/{script_id}/{take['filename']}"
+        with stage_timer("db.save.hash"):
+            content_sha256 = (
+                await run_io(_content_sha256, audio_data) if isinstance(audio_data, str) else _content_sha256(audio_data)
+            )
+        old = previous.get(take["line_index"])
+        unchanged = (
+            old is not None
+            and old.get("storage_path") == storage_path
+            and old.get("content_sha256") == content_sha256
+        )
+        if not unchanged:
+            async with slots:
+                try:
+                    with stage_timer("db.save.upload"):
+                        await _call(
+                            client.storage.from_("recordings").upload,
+                            storage_path,
+                            audio_data,
+                            file_options={"content-type": take.get("content_type", "audio/wav"), "upsert": "true"},
+                        )
+                except Exception as e:
+                    logger.error(f"Failed to upload audio to storage: {e}")
+                    raise
+
+        record = {
+            "script_id": script_id,
+            "line_index": take["line_index"],
+            "phrase_text": take["phrase_text"],
+            "recorder_name": recorder,
+            "filename": take["filename"],
+            "storage_path": storage_path,
+            "duration_seconds": take.get("duration_seconds", 0),
+            "peak_amplitude": take.get("peak_amplitude", 0),
+            "rms_level": take.get("rms_level", 0),
+            "is_valid": take.get("is_valid", True),
+            "file_size_bytes": os.path.getsize(audio_data) if isinstance(audio_data, str) else len(audio_data),
+            "content_sha256": content_sha256,
+        }
+        if take.get("original_size_bytes") is not None:
+            record["original_size_bytes"] = take["original_size_bytes"]
+        if take.get("metrics"):
+            record.update(take["metrics"])
+        if user_id:
+            record["user_id"] = user_id
+        return record
+
+    results: List[Union[Dict[str, Any], Exception]] = list(
+        await asyncio.gather(*(store(take) for take in takes), return_exceptions=True)
+    )
+    stored = [i for i, r in enumerate(results) if not isinstance(r, BaseException)]
+    if not stored:
+        return results
+
+    # Bulk upserts need the same keys on every row
+    rows = [results[i] for i in stored]
+    columns = set().union(*rows)
+    try:
+        with stage_timer("db.save.upsert"):
+            saved = await _execute_without_missing(lambda: client.table("recordings").upsert(
+                [{column: row.get(column) for column in _present_columns(columns)} for row in rows],
+                on_conflict="script_id,line_index,recorder_name",
+            ))
+    except Exception as e:
+        for i in stored:
+            results[i] = e
+        return results
+    by_line = {row["line_index"]: row for row in saved.data}
+    for i in stored:
+        results[i] = by_line.get(results[i]["line_index"], results[i])
+    _update_recorded_lines(recorder, script_id, added=(results[i]["line_index"] for i in stored))
+
+    stale = []
+    for i in stored:
+        old_path = previous.get(results[i]["line_index"], {}).get("storage_path")
+        if old_path and old_path != results[i]["storage_path"]:
+            stale.append(old_path)
+    if stale:
+        try:
+            with stage_timer("db.save.remove"):
+                await _call(client.storage.from_("recordings").remove, stale)
+        except Exception as e:
+            logger.warning(f"Failed to delete replaced takes {stale}: {e}")
+
+    return results
 
 
 async def list_recordings(
     script_id: Optional[int] = None,
     recorder_name: Optional[str] = None,
+    columns: str = "*, scripts(name, lines)",
+    is_valid: Optional[bool] = None,
+    min_values: Optional[Dict[str, float]] = None,
+    max_values: Optional[Dict[str, float]] = None,
+    after: Optional[Tuple[int, int]] = None,
+    limit: Optional[int] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    after_id: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
-    """List recordings, optionally filtered by script and/or recorder name."""
-    client = get_supabase()
-    query = client.table("recordings").select("*, scripts(name, lines)")
+    """List recordings, optionally filtered by script and/or recorder name.
+    columns is the PostgREST select list; the default embeds each row's script.
+    min_values / max_values bound numeric columns, e.g. {"snr_db": 20};
+    rows where the column is NULL never match a bound.
+
+    Rows come in (script_id, line_index) order. For keyset pagination pass
+    the last row's (script_id, line_index) as after and a page size as
+    limit; columns must then include script_id and line_index. after_id
+    instead keys the pages on id (unique across recorders) and returns rows
+    in id order; see iter_recordings.
+    created_from / created_to bound created_at (ISO 8601; from inclusive,
+    to exclusive).
+    """
+    client = await _get_client()
+    result = await _execute_without_missing(lambda: _recordings_query(
+        client, script_id, recorder_name, columns, is_valid, min_values, max_values,
+        after, limit, created_from, created_to, after_id,
+    ))
+    return result.data
+
+
+def _recordings_query(
+    client,
+    script_id: Optional[int],
+    recorder_name: Optional[str],
+    columns: str,
+    is_valid: Optional[bool],
+    min_values: Optional[Dict[str, float]],
+    max_values: Optional[Dict[str, float]],
+    after: Optional[Tuple[int, int]],
+    limit: Optional[int],
+    created_from: Optional[str],
+    created_to: Optional[str],
+    after_id: Optional[int],
+):
+    query = client.table("recordings").select(_select_list(columns))
     if script_id is not None:
         query = query.eq("script_id", script_id)
     if recorder_name is not None:
         query = query.eq("recorder_name", recorder_name.strip())
-    result = query.order("script_id").order("line_index").execute()
-    return result.data
+    if is_valid is not None:
+        query = query.eq("is_valid", str(is_valid).lower())
+    for column, value in (min_values or {}).items():
+        query = query.gte(column, value)
+    for column, value in (max_values or {}).items():
+        query = query.lte(column, value)
+    if created_from is not None:
+        query = query.gte("created_at", created_from)
+    if created_to is not None:
+        query = query.lt("created_at", created_to)
+    if after is not None:
+        last_script, last_line = after
+        query = query.or_(
+            f"script_id.gt.{int(last_script)},and(script_id.eq.{int(last_script)},line_index.gt.{int(last_line)})"
+        )
+    if after_id is not None:
+        query = query.gt("id", after_id).order("id")
+    else:
+        query = query.order("script_id").order("line_index")
+    if limit is not None:
+        query = query.limit(limit)
+    return query
 
 
-async def get_recording(recording_id: int) -> Optional[Dict[str, Any]]:
+async def iter_recordings(
+    script_id: Optional[int] = None,
+    recorder_name: Optional[str] = None,
+    columns: str = "*",
+    page_size: int = 1000,
+    **filters,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Every recording matching list_recordings' filters, in id order, read
+    page_size rows at a time with a keyset on id. A single select is cut
+    off at the project's PostgREST max-rows without an error, and a page
+    may come back shorter than page_size for the same reason, so only an
+    empty page ends the scan. columns must include id.
+    """
+    after_id = 0
+    while True:
+        rows = await list_recordings(
+            script_id=script_id,
+            recorder_name=recorder_name,
+            columns=columns,
+            after_id=after_id,
+            limit=page_size,
+            **filters,
+        )
+        if not rows:
+            return
+        for row in rows:
+            yield row
+        after_id = rows[-1]["id"]
+
+
+async def count_recordings(script_id: Optional[int] = None, recorder_name: Optional[str] = None) -> int:
+    """Exact number of recordings matching the filters; no rows are transferred."""
+    client = await _get_client()
+    query = client.table("recordings").select("id", count="exact", head=True)
+    if script_id is not None:
+        query = query.eq("script_id", script_id)
+    if recorder_name is not None:
+        query = query.eq("recorder_name", recorder_name.strip())
+    result = await _execute(query)
+    return result.count or 0
+
+
+async def get_recording(recording_id: int, columns: str = "*, scripts(name, lines)") -> Optional[Dict[str, Any]]:
     """Get a recording by ID."""
-    client = get_supabase()
-    result = client.table("recordings").select("*, scripts(name, lines)").eq("id", recording_id).execute()
+    client = await _get_client()
+    result = await _execute(client.table("recordings").select(columns).eq("id", recording_id))
     return result.data[0] if result.data else None
 
 
+async def replace_recording_audio(
+    record: Dict[str, Any],
+    filename: str,
+    audio_data: Union[bytes, str],
+    content_type: str,
+    fields: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """
+    Swap a saved take's audio for a re-encoded version of it (background
+    post-processing). record is the row as read before processing; the row
+    is only updated if it still holds that take (same content_sha256), so a
+    take re-recorded in the meantime wins. fields are extra columns to set,
+    e.g. metrics of normalized audio.
+
+    The new audio is uploaded under its own path (<stem>.<sha[:12]>.<ext>),
+    never over the take's current object, so a take re-recorded at the same
+    path while the job ran is left alone. The previous object is removed
+    once the row points at the new one. Returns False if the take was
+    superseded or deleted; only the re-encoded object is then removed.
+    """
+    client = await _get_client()
+    old_path = record["storage_path"]
+    content_sha256 = (
+        await run_io(_content_sha256, audio_data) if isinstance(audio_data, str) else _content_sha256(audio_data)
+    )
+    stem, ext = filename.rsplit(".", 1)
+    storage_path = f"{old_path.rsplit('/', 1)[0]}/{stem}.{content_sha256[:12]}.{ext}"
+    await _call(
+        client.storage.from_("recordings").upload,
+        storage_path,
+        audio_data,
+        file_options={"content-type": content_type, "upsert": "true"},
+    )
+    update = {
+        **(fields or {}),
+        "filename": filename,
+        "storage_path": storage_path,
+        "file_size_bytes": os.path.getsize(audio_data) if isinstance(audio_data, str) else len(audio_data),
+        "content_sha256": content_sha256,
+    }
+    result = await _execute_without_missing(lambda: (
+        client.table("recordings")
+        .update({column: update[column] for column in _present_columns(update)})
+        .eq("id", record["id"])
+        .eq("content_sha256", record["content_sha256"])
+    ))
+    if not result.data:
+        current = await get_recording(record["id"], columns="storage_path")
+        if not current or current.get("storage_path") != storage_path:
+            try:
+                await _call(client.storage.from_("recordings").remove, [storage_path])
+            except Exception as e:
+                logger.warning(f"Failed to delete superseded re-encode {storage_path}: {e}")
+        return False
+    if storage_path != old_path:
+        try:
+            await _call(client.storage.from_("recordings").remove, [old_path])
+        except Exception as e:
+            logger.warning(f"Failed to delete replaced take {old_path}: {e}")
+    return True
+
+
 async def get_recording_audio(storage_path: str) -> bytes:
     """Download recording audio from Supabase Storage."""
-    client = get_supabase()
-    return client.storage.from_("recordings").download(storage_path)
+    client = await _get_client()
+    with stage_timer("db.audio.download"):
+        return await _call(client.storage.from_("recordings").download, storage_path)
+
+
+async def download_recording_audio(storage_path: str, dest_path: str, chunk_size: int = 256 * 1024) -> int:
+    """Stream recording audio from Supabase Storage into dest_path without
+    holding the whole object in memory. Returns the number of bytes written.
+    """
+    settings = get_settings()
+    url = f"{settings.supabase_url.rstrip('/')}/storage/v1/object/recordings/{quote(storage_path)}"
+    headers = {"Authorization": f"Bearer {settings.supabase_key}", "apikey": settings.supabase_key}
+    written = 0
+    with stage_timer("db.audio.download"):
+        async with _get_http_client().stream("GET", url, headers=headers) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise StorageApiError(response.text[:200], "download_failed", response.status_code)
+            with open(dest_path, "wb") as f:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    await run_io(f.write, chunk)
+                    written += len(chunk)
+    return written
+
+
+async def _recorded_counts(client, recorder_name: Optional[str]) -> Dict[int, int]:
+    """Recorded line counts per script_id in a single round trip.
+
+    Uses the recording_counts() RPC (migration 003). If the function is not
+    deployed yet, falls back to reading every script_id, paged by id so the
+    project's max-rows cap cannot cut the count short.
+    """
+    global _progress_rpc_available
+    if _progress_rpc_available:
+        try:
+            result = await _execute(client.rpc("recording_counts", {"p_recorder_name": recorder_name}))
+            return {row["script_id"]: row["recorded"] for row in result.data}
+        except APIError as e:
+            if e.code != "PGRST202":
+                raise
+            _progress_rpc_available = False
+            logger.warning("recording_counts() RPC not found; run migration 003. Counting client-side.")
+
+    counts: Dict[int, int] = {}
+    async for row in iter_recordings(recorder_name=recorder_name, columns="id, script_id"):
+        counts[row["script_id"]] = counts.get(row["script_id"], 0) + 1
+    return counts
 
 
 async def get_recording_progress(recorder_name: Optional[str] = None) -> List[Dict[str, Any]]:
-    """Get recording progress per script, optionally filtered by recorder name."""
-    client = get_supabase()
-    scripts = await list_scripts()
+    """Get recording progress per script, optionally filtered by recorder name.
+    One grouped count query, merged with the cached script catalog."""
+    client = await _get_client()
+    name = recorder_name.strip() if recorder_name is not None else None
+    scripts, counts = await asyncio.gather(list_scripts(), _recorded_counts(client, name))
 
     progress = []
     for script in scripts:
-        query = client.table("recordings").select("id", count="exact").eq("script_id", script["id"])
-        if recorder_name is not None:
-            query = query.eq("recorder_name", recorder_name.strip())
-        result = query.execute()
-        recorded = result.count or 0
+        recorded = counts.get(script["id"], 0)
         total = script["line_count"]
         percent = round((recorded / total * 100), 1) if total > 0 else 0
         progress.append({
@@ -216,7 +758,7 @@ async def get_recording_progress(recorder_name: Optional[str] = None) -> List[Di
 
 async def delete_recording(recording_id: int) -> bool:
     """Delete a recording from storage and database."""
-    client = get_supabase()
+    client = await _get_client()
     record = await get_recording(recording_id)
     if not record:
         return False
@@ -224,28 +766,114 @@ async def delete_recording(recording_id: int) -> bool:
     storage_path = record.get("storage_path")
     if storage_path:
         try:
-            client.storage.from_("recordings").remove([storage_path])
+            with stage_timer("db.delete.remove"):
+                await _call(client.storage.from_("recordings").remove, [storage_path])
             logger.info(f"Deleted storage file: {storage_path}")
         except Exception as e:
             logger.warning(f"Failed to delete from storage {storage_path}: {e}")
             # Continue to delete DB row - orphaned file is better than orphaned row
 
-    result = client.table("recordings").delete().eq("id", recording_id).execute()
+    with stage_timer("db.delete.row"):
+        result = await _execute(client.table("recordings").delete().eq("id", recording_id))
     deleted_count = len(result.data) if result.data is not None else 0
     if deleted_count == 0:
         logger.warning(f"Delete recording {recording_id}: no rows affected (RLS or missing row?)")
         return False
+    _update_recorded_lines(record["recorder_name"], record["script_id"], removed=[record["line_index"]])
     return True
 
 
+# ============================================================================
+# Recorded Lines Index
+# ============================================================================
+# One RecordedLines bitset per (recorder, script), loaded once with a
+# line_index-only keyset scan and then kept current by this worker's saves
+# and deletes, so "which lines are done" needs no round trip. The TTL bounds
+# staleness from writes made by other workers; _recorded_lines_version stops
+# a load that raced a write from caching what it read.
+
+_recorded_lines_cache: Optional[TTLCache] = None
+_recorded_lines_version = 0
+_RECORDED_LINES_PAGE = 1000  # Supabase's default max-rows
+
+
+def _get_recorded_lines_cache() -> TTLCache:
+    global _recorded_lines_cache
+    if _recorded_lines_cache is None:
+        settings = get_settings()
+        _recorded_lines_cache = TTLCache(
+            "recorded_lines",
+            max_entries=settings.recorded_lines_cache_size,
+            ttl=settings.recorded_lines_cache_ttl,
+        )
+    return _recorded_lines_cache
+
+
+def _update_recorded_lines(
+    recorder_name: str,
+    script_id: int,
+    added: Iterable[int] = (),
+    removed: Iterable[int] = (),
+) -> None:
+    global _recorded_lines_version
+    _recorded_lines_version += 1
+    if _recorded_lines_cache is None:
+        return
+    lines = _recorded_lines_cache.get((recorder_name.strip(), script_id))
+    if lines is None:
+        return
+    for index in added:
+        lines.add(index)
+    for index in removed:
+        lines.discard(index)
+
+
+def _clear_recorded_lines() -> None:
+    global _recorded_lines_version
+    _recorded_lines_version += 1
+    if _recorded_lines_cache is not None:
+        _recorded_lines_cache.clear()
+
+
+async def get_recorded_lines(script_id: int, recorder_name: str) -> RecordedLines:
+    """The line indexes recorder_name has a take for in script_id, as a bitset.
+    Do not modify the result; it is shared with the cache."""
+    recorder = recorder_name.strip()
+    cache = _get_recorded_lines_cache()
+    lines = cache.get((recorder, script_id))
+    if lines is not None:
+        return lines
+
+    version = _recorded_lines_version
+    lines = RecordedLines()
+    after = None
+    while True:
+        rows = await list_recordings(
+            script_id=script_id,
+            recorder_name=recorder,
+            columns="script_id, line_index",
+            after=after,
+            limit=_RECORDED_LINES_PAGE,
+        )
+        # A short page is not the end: the project's max-rows may be below the page size
+        if not rows:
+            break
+        for row in rows:
+            lines.add(row["line_index"])
+        after = (rows[-1]["script_id"], rows[-1]["line_index"])
+    if version == _recorded_lines_version:
+        cache.set((recorder, script_id), lines)
+    return lines
+
+
 # ============================================================================
 # User Settings
 # ============================================================================
 
 async def get_user_settings(user_id: str) -> Optional[Dict[str, Any]]:
     """Fetch per-user audio settings."""
-    client = get_supabase()
-    result = client.table("user_settings").select("*").eq("user_id", user_id).execute()
+    client = await _get_client()
+    result = await _execute(client.table("user_settings").select("*").eq("user_id", user_id))
     return result.data[0] if result.data else None
 
 
@@ -257,7 +885,7 @@ async def upsert_user_settings(
     device_id: Optional[str],
 ) -> Dict[str, Any]:
     """Create or update per-user audio settings."""
-    client = get_supabase()
+    client = await _get_client()
     record: Dict[str, Any] = {
         "user_id": user_id,
         "gain": gain,
@@ -265,8 +893,8 @@ async def upsert_user_settings(
         "treble": treble,
         "device_id": device_id,
     }
-    result = client.table("user_settings").upsert(
+    result = await _execute(client.table("user_settings").upsert(
         record,
         on_conflict="user_id",
-    ).execute()
+    ))
     return result.data[0]
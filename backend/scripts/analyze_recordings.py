@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Batch quality report for many WAV files (local or in Supabase Storage).
+
+Analyzes every .wav/.flac under the given files/directories across a process
+pool and writes one row per file: source, size and the AudioInfo fields
+(sample rate, duration, peak, RMS, is_valid, error). Storage paths, or all
+recordings of a script/recorder, are downloaded to a temp dir first.
+A summary with throughput (files/s) is printed to stderr.
+
+Usage (from project root):
+  python backend/scripts/analyze_recordings.py data/wavs recordings
+  python backend/scripts/analyze_recordings.py recordings --format jsonl --output report.jsonl
+  python backend/scripts/analyze_recordings.py --recorder <user_id> --script-id 3 --format parquet --output audit.parquet
+
+Remote inputs require backend/.env with SUPABASE_URL and SUPABASE_KEY;
+Parquet output requires pyarrow.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir))
+
+_env_file = _backend_dir / ".env"
+if _env_file.exists():
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(_env_file)
+    except ImportError:
+        pass
+
+from core.batch_analysis import analyze_files, failure_row, render_report, summarize  # noqa: E402
+
+
+def local_files(inputs: List[str]) -> List[str]:
+    paths = []
+    for name in inputs:
+        p = Path(name)
+        if p.is_dir():
+            paths += sorted(str(f) for f in p.rglob("*") if f.suffix.lower() in (".wav", ".flac") and f.is_file())
+        else:
+            paths.append(str(p))
+    return paths
+
+
+async def download(args, temp_dir: str) -> Tuple[List[str], List[str], list]:
+    """Fetch remote recordings into temp_dir: (local paths, storage paths, failure rows)."""
+    import db
+
+    storage_paths = list(args.storage)
+    if args.script_id is not None or args.recorder:
+        async for r in db.iter_recordings(
+            script_id=args.script_id, recorder_name=args.recorder, columns="id, storage_path",
+        ):
+            if r.get("storage_path"):
+                storage_paths.append(r["storage_path"])
+
+    slots = asyncio.Semaphore(args.concurrency)
+    paths, sources, failures = [], [], []
+
+    async def fetch(i: int, storage_path: str):
+        dest = os.path.join(temp_dir, f"{i:06d}.wav")
+        async with slots:
+            try:
+                await db.download_recording_audio(storage_path, dest)
+            except Exception as e:
+                failures.append(failure_row(storage_path, f"Download failed: {e}"))
+                return
+        paths.append(dest)
+        sources.append(storage_path)
+
+    await asyncio.gather(*(fetch(i, p) for i, p in enumerate(storage_paths)))
+    await db.close_db()
+    return paths, sources, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze many WAV files into a columnar report")
+    parser.add_argument("inputs", nargs="*", help="WAV files or directories (searched recursively)")
+    parser.add_argument("--storage", action="append", default=[], help="Storage path in the recordings bucket (repeatable)")
+    parser.add_argument("--script-id", type=int, help="All stored recordings of this script")
+    parser.add_argument("--recorder", help="All stored recordings of this recorder")
+    parser.add_argument("--format", choices=["csv", "jsonl", "parquet"], default="csv")
+    parser.add_argument("--output", "-o", help="Report file (default: stdout; required for parquet)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Analysis worker processes")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallel downloads for remote inputs")
+    args = parser.parse_args()
+
+    remote = bool(args.storage) or args.script_id is not None or bool(args.recorder)
+    if not args.inputs and not remote:
+        parser.error("give files/directories, --storage, --script-id or --recorder")
+    if args.format == "parquet" and not args.output:
+        parser.error("--output is required for parquet")
+    if remote and (not os.environ.get("SUPABASE_URL") or not os.environ.get("SUPABASE_KEY")):
+        print("Error: SUPABASE_URL and SUPABASE_KEY are required for remote inputs (backend/.env).")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory(prefix="kuiper-analyze-") as temp_dir:
+        paths = local_files(args.inputs)
+        sources = list(paths)
+        rows = []
+        if remote:
+            start = time.perf_counter()
+            remote_paths, remote_sources, rows = asyncio.run(download(args, temp_dir))
+            print(f"Downloaded {len(remote_paths)} recording(s) in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+            paths += remote_paths
+            sources += remote_sources
+
+        start = time.perf_counter()
+        rows = list(analyze_files(paths, sources, workers=args.jobs)) + rows
+        elapsed = time.perf_counter() - start
+
+    try:
+        report = render_report(rows, args.format)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    if args.output:
+        Path(args.output).write_bytes(report)
+    else:
+        sys.stdout.buffer.write(report)
+
+    counts = summarize(rows)
+    print(
+        f"{counts['files']} files ({counts['bytes'] / 1048576:.1f} MB): {counts['valid']} valid, "
+        f"{counts['invalid']} invalid, {counts['failed']} unreadable", file=sys.stderr,
+    )
+    if paths and elapsed > 0:
+        print(
+            f"Analyzed {len(paths)} files in {elapsed:.3f}s with {args.jobs} worker(s): "
+            f"{len(paths) / elapsed:.0f} files/s, {counts['bytes'] / 1048576 / elapsed:.1f} MB/s",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: vectorized analyze_wav_bytes vs the previous struct.unpack path.
+
+Generates synthetic 8-bit and 16-bit mono WAVs (a 220 Hz tone with noise),
+checks that both implementations agree on peak/RMS, and prints timings.
+
+Usage (from project root):
+  python backend/scripts/bench_audio_analysis.py
+  python backend/scripts/bench_audio_analysis.py --seconds 10 --rate 48000 --repeat 5
+"""
+import argparse
+import io
+import math
+import struct
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to path
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir))
+
+from core.audio_processor import analyze_wav_bytes  # noqa: E402
+
+TOLERANCE = 1e-4
+
+
+def legacy_peak_rms(data: bytes):
+    """Peak/RMS exactly as computed before the numpy engine (reference only)."""
+    with wave.open(io.BytesIO(data), "rb") as wf:
+        channels = wf.getnchannels()
+        num_samples = wf.getnframes()
+        bit_depth = wf.getsampwidth() * 8
+        frames = wf.readframes(num_samples)
+    total_samples = num_samples * channels
+    if bit_depth == 16:
+        values = struct.unpack(f"<{total_samples}h", frames)
+        normalized = [v / 32768.0 for v in values]
+    else:
+        values = struct.unpack(f"<{total_samples}B", frames)
+        normalized = [(v - 128) / 128.0 for v in values]
+    peak = max(abs(v) for v in normalized)
+    rms = math.sqrt(sum(v ** 2 for v in normalized) / len(normalized))
+    return peak, rms
+
+
+def make_wav(bit_depth: int, seconds: float, rate: int) -> bytes:
+    """Build a mono WAV of a noisy tone at roughly -6 dBFS."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * rate)) / rate
+    signal = 0.5 * np.sin(2 * np.pi * 220 * t) + 0.02 * rng.standard_normal(t.size)
+    if bit_depth == 16:
+        pcm = (signal * 32767).astype("<i2").tobytes()
+    else:
+        pcm = (signal * 127 + 128).astype(np.uint8).tobytes()
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(bit_depth // 8)
+        wf.setframerate(rate)
+        wf.writeframes(pcm)
+    return buf.getvalue()
+
+
+def best_of(fn, data: bytes, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(data)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=30.0, help="Clip length (default: 30)")
+    parser.add_argument("--rate", type=int, default=44100, help="Sample rate (default: 44100)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per implementation; best is reported")
+    args = parser.parse_args()
+
+    print(f"{args.seconds:.0f}s mono clip @ {args.rate} Hz, best of {args.repeat}")
+    print(f"{'bits':>4}  {'legacy ms':>10}  {'numpy ms':>9}  {'speedup':>8}  {'max diff':>9}")
+    for bit_depth in (8, 16):
+        data = make_wav(bit_depth, args.seconds, args.rate)
+
+        info = analyze_wav_bytes(data)
+        ref_peak, ref_rms = legacy_peak_rms(data)
+        diff = max(abs(info.peak_amplitude - ref_peak), abs(info.rms_level - ref_rms))
+        if diff > TOLERANCE:
+            print(f"  {bit_depth}-bit results differ by {diff:.6f} (tolerance {TOLERANCE})")
+            sys.exit(1)
+
+        legacy = best_of(legacy_peak_rms, data, args.repeat)
+        vectorized = best_of(analyze_wav_bytes, data, args.repeat)
+        print(
+            f"{bit_depth:>4}  {legacy * 1000:>10.1f}  {vectorized * 1000:>9.2f}  "
+            f"{legacy / vectorized:>7.0f}x  {diff:>9.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
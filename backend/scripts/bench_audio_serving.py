@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/recordings/{id}/audio playback paths.
+
+Starts the fake Supabase (with per-call latency) and the API, saves one
+recording, then times a cold fetch (downloaded from storage into the local
+cache), warm full fetches (served from disk), 304 revalidations and 64 KB
+Range seeks, and reports how many storage downloads were made.
+
+Usage (from project root):
+  python backend/scripts/bench_audio_serving.py
+  python backend/scripts/bench_audio_serving.py --seconds 60 --latency 0.05
+"""
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir / "scripts"))
+
+from fake_supabase import FakeSupabase  # noqa: E402
+from loadtest_save import free_port, make_wav, start_fake_supabase  # noqa: E402
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recording audio serving latency")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Recording length")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake Supabase latency per call")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    state = FakeSupabase(latency=args.latency)
+    script = state.seed_script("audiobench", ["Line one."])
+    supabase_port, api_port = free_port(), free_port()
+    start_fake_supabase(state, supabase_port)
+    cache_dir = tempfile.mkdtemp(prefix="kuiper-audio-bench-")
+
+    env = {
+        **os.environ,
+        "SUPABASE_URL": f"http://127.0.0.1:{supabase_port}",
+        "SUPABASE_KEY": "fake-service-role-key",
+        "LOG_LEVEL": "WARNING",
+        "AUDIO_CACHE_DIR": cache_dir,
+    }
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(api_port), "--log-level", "warning"],
+        cwd=_backend_dir,
+        env=env,
+    )
+    url = f"http://127.0.0.1:{api_port}"
+    headers = {"Authorization": f"Bearer {state.issue_token()}"}
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{url}/api/health", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+
+        wav = make_wav(args.seconds)
+        with httpx.Client(base_url=url, headers=headers, timeout=60) as client:
+            client.post(
+                "/api/recording/save",
+                files={"audio_file": ("take.wav", wav, "audio/wav")},
+                data={"script_id": str(script["id"]), "line_index": "0", "phrase_text": "Line one."},
+            ).raise_for_status()
+            recording_id = state.tables["recordings"][0]["id"]
+            audio_url = f"/api/recordings/{recording_id}/audio"
+
+            state.calls.clear()
+            start = time.perf_counter()
+            first = client.get(audio_url)
+            cold = (time.perf_counter() - start) * 1000
+            assert first.content == wav
+            etag = first.headers["etag"]
+
+            warm = timed(lambda: client.get(audio_url).raise_for_status(), args.repeat)
+            revalidate = timed(
+                lambda: client.get(audio_url, headers={"If-None-Match": etag}), args.repeat
+            )
+
+            def seek():
+                offset = random.randrange(0, len(wav) - 65536)
+                r = client.get(audio_url, headers={"Range": f"bytes={offset}-{offset + 65535}"})
+                assert r.status_code == 206 and r.content == wav[offset:offset + 65536]
+
+            ranged = timed(seek, args.repeat)
+
+        downloads = state.calls.get("GET storage:object", 0)
+        print(f"{len(wav) / 1048576:.1f} MB recording, fake Supabase latency {args.latency * 1000:.0f} ms/call")
+        print(f"  cold (storage -> cache)   {cold:8.1f} ms")
+        print(f"  warm full (disk cache)    {warm:8.1f} ms  (median of {args.repeat})")
+        print(f"  304 revalidation          {revalidate:8.1f} ms")
+        print(f"  64 KB Range seek (206)    {ranged:8.1f} ms")
+        print(f"  storage downloads: {downloads} for {1 + 3 * args.repeat} requests")
+    finally:
+        api.terminate()
+        api.wait()
+
+
+if __name__ == "__main__":
+    main()
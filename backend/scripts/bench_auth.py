@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: access-token verification cost per authenticated request.
+
+Signs ES256 tokens with a locally generated key pair served as a JWKS by
+the fake Supabase, then times, per call:
+  legacy  PyJWKClient.get_signing_key_from_jwt + jwt.decode on every
+          request (the previous get_current_user_id, reproduced here)
+  miss    TokenVerifier on a token it has not seen (signature verified)
+  hit     TokenVerifier on a token verified before (cache lookup)
+and how many JWKS fetches each made.
+
+Usage (from project root):
+  python backend/scripts/bench_auth.py
+  python backend/scripts/bench_auth.py --tokens 2000
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import jwt
+
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir))
+sys.path.insert(0, str(_backend_dir / "scripts"))
+
+from core.auth import TokenVerifier  # noqa: E402
+from core.workers import run_io, shutdown_pools  # noqa: E402
+from fake_supabase import FakeSupabase  # noqa: E402
+from loadtest_save import free_port, start_fake_supabase  # noqa: E402
+
+JWKS_ROUTE = "GET auth:.well-known"
+
+
+def legacy_user_id(client: jwt.PyJWKClient, token: str) -> str:
+    """The per-request verification this replaced (reference only)."""
+    signing_key = client.get_signing_key_from_jwt(token)
+    payload = jwt.decode(
+        token,
+        signing_key.key,
+        algorithms=["RS256", "ES256"],
+        audience="authenticated",
+        options={"verify_aud": True},
+    )
+    return str(payload["sub"])
+
+
+def summary(label: str, samples, fetches: int) -> None:
+    us = sorted(s * 1e6 for s in samples)
+    print(f"{label:<7} {statistics.median(us):>8.1f} {us[int(len(us) * 0.99)]:>8.1f} {fetches:>6}")
+
+
+async def run(state: FakeSupabase, url: str, n: int) -> None:
+    tokens = [state.issue_token() for _ in range(n)]
+    print(f"{'path':<7} {'p50 us':>8} {'p99 us':>8} {'JWKS':>6}")
+
+    client = jwt.PyJWKClient(url, cache_keys=True, lifespan=600)
+    state.calls.clear()
+    samples = []
+    for token in tokens:
+        start = time.perf_counter()
+        legacy_user_id(client, token)
+        samples.append(time.perf_counter() - start)
+    summary("legacy", samples, state.calls[JWKS_ROUTE])
+
+    verifier = TokenVerifier(url, cache_entries=n)
+    state.calls.clear()
+    await verifier.refresh_async(run_io)
+    samples = []
+    for token in tokens:
+        start = time.perf_counter()
+        await verifier.verify(token, run_io)
+        samples.append(time.perf_counter() - start)
+    summary("miss", samples, state.calls[JWKS_ROUTE])
+
+    state.calls.clear()
+    samples = []
+    for token in tokens:
+        start = time.perf_counter()
+        await verifier.verify(token, run_io)
+        samples.append(time.perf_counter() - start)
+    summary("hit", samples, state.calls[JWKS_ROUTE])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Access-token verification cost per request")
+    parser.add_argument("--tokens", type=int, default=1000, help="Distinct tokens to verify")
+    args = parser.parse_args()
+
+    state = FakeSupabase()
+    port = free_port()
+    start_fake_supabase(state, port)
+    url = f"http://127.0.0.1:{port}/auth/v1/.well-known/jwks.json"
+    try:
+        asyncio.run(run(state, url, args.tokens))
+    finally:
+        shutdown_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: syncing N offline takes with one /api/recording/save POST per
+line vs one /api/recording/save-batch request.
+
+Starts the fake Supabase (with per-call latency) and the API, then saves
+the same takes both ways for fresh recorders and reports wall time and
+Supabase calls by route. The per-line client runs sequentially, as
+the frontend does.
+
+Usage (from project root):
+  python backend/scripts/bench_batch_save.py
+  python backend/scripts/bench_batch_save.py --takes 50 --latency 0.05
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir / "scripts"))
+
+from fake_supabase import FakeSupabase  # noqa: E402
+from loadtest_save import free_port, make_wav, start_fake_supabase  # noqa: E402
+
+
+def report(label: str, state: FakeSupabase, elapsed: float, takes: int) -> None:
+    calls = dict(sorted(state.calls.items()))
+    print(f"{label:<10} {elapsed:>7.2f}s  {takes / elapsed:>6.1f} takes/s  {sum(calls.values()):>4} calls  {calls}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-line saves vs one batch save")
+    parser.add_argument("--takes", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=3.0, help="Length of each take")
+    parser.add_argument("--latency", type=float, default=0.03, help="Fake Supabase latency per call")
+    args = parser.parse_args()
+
+    state = FakeSupabase(latency=args.latency)
+    script = state.seed_script("batchbench", [f"Line {i + 1}." for i in range(args.takes)])
+    supabase_port, api_port = free_port(), free_port()
+    start_fake_supabase(state, supabase_port)
+    env = {
+        **os.environ,
+        "SUPABASE_URL": f"http://127.0.0.1:{supabase_port}",
+        "SUPABASE_KEY": "fake-service-role-key",
+        "LOG_LEVEL": "WARNING",
+    }
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(api_port), "--log-level", "warning"],
+        cwd=_backend_dir,
+        env=env,
+    )
+    url = f"http://127.0.0.1:{api_port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{url}/api/health", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+
+        wavs = [make_wav(args.seconds + i * 0.01) for i in range(args.takes)]
+        lines = list(range(args.takes))
+        with httpx.Client(base_url=url, timeout=120) as client:
+            # Warm up JWKS and the script cache outside the timed runs
+            warm = {"Authorization": f"Bearer {state.issue_token()}"}
+            client.get("/api/recording/progress", headers=warm)
+            client.get(f"/api/scripts/{script['id']}", headers=warm)
+
+            headers = {"Authorization": f"Bearer {state.issue_token()}"}
+            state.calls.clear()
+            start = time.perf_counter()
+            for i in lines:
+                r = client.post(
+                    "/api/recording/save",
+                    headers=headers,
+                    files={"audio_file": ("take.wav", wavs[i], "audio/wav")},
+                    data={"script_id": script["id"], "line_index": i, "phrase_text": f"Line {i + 1}."},
+                )
+                assert r.json()["success"], r.text
+            report("per-line", state, time.perf_counter() - start, args.takes)
+
+            headers = {"Authorization": f"Bearer {state.issue_token()}"}
+            state.calls.clear()
+            start = time.perf_counter()
+            r = client.post(
+                "/api/recording/save-batch",
+                headers=headers,
+                files=[("audio_files", (f"take{i}.wav", wavs[i], "audio/wav")) for i in lines],
+                data={
+                    "script_id": script["id"],
+                    "line_indexes": [str(i) for i in lines],
+                    "phrase_texts": [f"Line {i + 1}." for i in lines],
+                },
+            )
+            body = r.json()
+            assert body["saved"] == args.takes, body
+            report("batch", state, time.perf_counter() - start, args.takes)
+    finally:
+        api.terminate()
+        api.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Exercise db.py against the local Supabase stand-in with both backends.
+
+Runs the same sequence of data-layer calls (scripts, recordings, progress,
+audio download, user settings) with KUIPER_DB_BACKEND=sync and =async,
+checks they return the same data, then times a burst of concurrent
+save_recording calls on each backend.
+
+Usage (from project root):
+  python backend/scripts/bench_db_backends.py
+  python backend/scripts/bench_db_backends.py --saves 400 --latency 0.05
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import uvicorn
+
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir))
+sys.path.insert(0, str(_backend_dir / "scripts"))
+
+from fake_supabase import FakeSupabase, create_app  # noqa: E402
+from loadtest_save import free_port, make_wav  # noqa: E402
+
+
+async def exercise(db, wav: bytes, name: str):
+    """One pass over the data layer; returns comparable results."""
+    script = await db.create_script(name, ["One.", "Two.", "Three."])
+    assert await db.get_script_by_name(name) == script
+    rec = await db.save_recording(
+        script_id=script["id"], line_index=1, phrase_text="Two.", recorder_name="bench-user",
+        filename=f"{name}_0002.wav", audio_data=wav, duration_seconds=1.0, user_id=None,
+    )
+    listed = await db.list_recordings(script_id=script["id"], recorder_name="bench-user")
+    progress = [p for p in await db.get_recording_progress("bench-user") if p["script_id"] == script["id"]]
+    audio = await db.get_recording_audio(rec["storage_path"])
+    settings = await db.upsert_user_settings("bench-user", 120, 3, -2, None)
+    deleted = await db.delete_recording(rec["id"])
+    return {
+        "listed": [(r["line_index"], r["scripts"]["name"] == name) for r in listed],
+        "progress": [(p["recorded"], p["total"]) for p in progress],
+        "audio_ok": audio == wav,
+        "settings": (settings["gain"], settings["bass"], settings["treble"]),
+        "deleted": deleted,
+    }
+
+
+async def burst(db, wav: bytes, saves: int, concurrency: int) -> float:
+    script = await db.get_script_by_name("burst") or await db.create_script(
+        "burst", [f"Line {i}." for i in range(saves)]
+    )
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with slots:
+            await db.save_recording(
+                script_id=script["id"], line_index=i, phrase_text=f"Line {i}.",
+                recorder_name="burst-user", filename=f"burst_{i:04d}.wav", audio_data=wav,
+            )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(saves)))
+    return time.perf_counter() - start
+
+
+async def run_backend(backend: str, args, wav: bytes):
+    import db
+    from core.config import get_settings
+
+    get_settings().db_backend = backend
+    result = await exercise(db, wav, f"bench-{backend}")
+    elapsed = await burst(db, wav, args.saves, args.concurrency)
+    await db.close_db()
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sync and async db backends")
+    parser.add_argument("--saves", type=int, default=200, help="Saves in the timed burst")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent saves in flight")
+    parser.add_argument("--latency", type=float, default=0.02, help="Fake Supabase latency per call")
+    args = parser.parse_args()
+
+    state = FakeSupabase(latency=args.latency)
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(create_app(state), port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    os.environ["SUPABASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["SUPABASE_KEY"] = "fake-service-role-key"
+    wav = make_wav(seconds=2.0)
+
+    results = {}
+    for backend in ("sync", "async"):
+        state.calls.clear()
+        result, elapsed = asyncio.run(run_backend(backend, args, wav))
+        results[backend] = result
+        calls = sum(state.calls.values())
+        print(f"{backend:>5}: {args.saves} saves x{args.concurrency} in {elapsed:.2f}s "
+              f"({args.saves / elapsed:.0f} saves/s, {calls} Supabase calls)")
+
+    if results["sync"] != results["async"]:
+        print(f"Backends disagree:\n  sync:  {results['sync']}\n  async: {results['async']}")
+        sys.exit(1)
+    print(f"Backends agree: {results['async']}")
+
+
+if __name__ == "__main__":
+    main()
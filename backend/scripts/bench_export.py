@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/admin/export throughput and API peak RSS vs dataset size.
+
+Seeds the fake Supabase with N recordings (stored objects plus rows), then
+streams the export for growing N and reports archive size, throughput and
+the API process's peak RSS for that request (reset via /proc/<pid>/clear_refs
+before each run). Flat RSS across rows means memory does not grow with the
+dataset. Linux only.
+
+Usage (from project root):
+  python backend/scripts/bench_export.py
+  python backend/scripts/bench_export.py --counts 50 200 800 --seconds 5 --format zip
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir / "scripts"))
+
+from bench_upload_memory import reset_peak, rss_kb  # noqa: E402
+from fake_supabase import FakeSupabase  # noqa: E402
+from loadtest_save import free_port, make_wav, start_fake_supabase  # noqa: E402
+
+
+def seed(state: FakeSupabase, count: int, wav: bytes) -> int:
+    state.tables = {name: [] for name in state.tables}
+    state.objects.clear()
+    script = state.seed_script(f"export_{count}", [f"Export line {i}." for i in range(count)])
+    for line in range(count):
+        path = f"bench/{script['id']}/export_{line:05d}.wav"
+        state.objects[f"recordings/{path}"] = wav
+        state.insert("recordings", {
+            "script_id": script["id"], "line_index": line, "recorder_name": "bench",
+            "phrase_text": f"Export line {line}.", "filename": f"export_{line:05d}.wav",
+            "storage_path": path, "is_valid": True, "file_size_bytes": len(wav),
+        })
+    return script["id"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export throughput and memory")
+    parser.add_argument("--counts", type=int, nargs="+", default=[25, 100, 400])
+    parser.add_argument("--seconds", type=float, default=5.0, help="Length of each recording")
+    parser.add_argument("--latency", type=float, default=0.02, help="Fake Supabase latency per call")
+    parser.add_argument("--format", choices=["tar", "zip"], default="tar")
+    args = parser.parse_args()
+
+    state = FakeSupabase(latency=args.latency)
+    supabase_port, api_port = free_port(), free_port()
+    start_fake_supabase(state, supabase_port)
+    env = {
+        **os.environ,
+        "SUPABASE_URL": f"http://127.0.0.1:{supabase_port}",
+        "SUPABASE_KEY": "fake-service-role-key",
+        "LOG_LEVEL": "WARNING",
+        "AUDIO_CACHE_MAX_MB": "0",
+    }
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(api_port), "--log-level", "warning"],
+        cwd=_backend_dir,
+        env=env,
+    )
+    url = f"http://127.0.0.1:{api_port}"
+    wav = make_wav(args.seconds)
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{url}/api/health", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+
+        print(f"{len(wav) / 1048576:.2f} MB per recording, {args.latency * 1000:.0f} ms fake storage latency, {args.format}")
+        print(f"{'recordings':>10}  {'archive MB':>10}  {'seconds':>7}  {'MB/s':>6}  {'peak RSS MB':>11}")
+        for count in args.counts:
+            script_id = seed(state, count, wav)
+            reset_peak(api.pid)
+            size = 0
+            start = time.perf_counter()
+            with httpx.stream(
+                "GET", f"{url}/api/admin/export",
+                params={"script_id": script_id, "format": args.format},
+                headers={"X-Admin-Key": os.environ.get("ADMIN_PASSWORD", "DovKrugersRecording")},
+                timeout=300,
+            ) as r:
+                r.raise_for_status()
+                for chunk in r.iter_bytes():
+                    size += len(chunk)
+            elapsed = time.perf_counter() - start
+            mb = size / 1048576
+            print(f"{count:>10}  {mb:>10.1f}  {elapsed:>7.2f}  {mb / elapsed:>6.1f}  {rss_kb(api.pid, 'VmHWM') / 1024:>11.1f}")
+    finally:
+        api.terminate()
+        api.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: listing one recorder's takes with the old select
+("*, scripts(name, lines)", every row embedding its script's full line
+array) vs the projected, keyset-paginated listing behind /api/recording/list.
+
+Seeds the fake Supabase with --rows recordings over scripts of --lines lines
+(trainingset_en has 1,547), then reports for each: Supabase requests, JSON
+bytes received from Supabase, time to the first page and time to read
+everything. The old call is made with limit=--max-rows: Supabase's
+PostgREST caps every response there (1000 by default), so that is all it
+ever returned; uncapped, a 10k-row response would be over a gigabyte.
+
+Usage (from project root):
+  python backend/scripts/bench_list_recordings.py
+  python backend/scripts/bench_list_recordings.py --rows 20000 --page 500
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir))
+sys.path.insert(0, str(_backend_dir / "scripts"))
+
+from fake_supabase import FakeSupabase  # noqa: E402
+from loadtest_save import free_port, start_fake_supabase  # noqa: E402
+
+RECORDER = "list-bench-user"
+
+
+def seed(state: FakeSupabase, rows: int, lines: int) -> None:
+    line_texts = [f"This is script line number {i + 1}, long enough to look like a real prompt." for i in range(lines)]
+    done = 0
+    while done < rows:
+        script = state.seed_script(f"bench_{done // lines}", line_texts)
+        for i in range(min(lines, rows - done)):
+            state.insert("recordings", {
+                "script_id": script["id"],
+                "line_index": i,
+                "recorder_name": RECORDER,
+                "phrase_text": line_texts[i],
+                "filename": f"{script['name']}_{i + 1:04d}.wav",
+                "storage_path": f"{RECORDER}/{script['id']}/{i + 1:04d}.wav",
+                "duration_seconds": 3.2,
+                "peak_amplitude": 0.71,
+                "rms_level": 0.12,
+                "is_valid": True,
+                "file_size_bytes": 153644,
+                "original_size_bytes": 153644,
+            })
+        done += min(lines, rows - done)
+
+
+def report(label: str, state: FakeSupabase, rows: int, received: int, first: float, total: float) -> None:
+    requests = sum(n for route, n in state.calls.items() if route.startswith("GET rest:"))
+    print(f"{label:<8} {rows:>6} {requests:>5} {received / 1048576:>9.2f} {first * 1000:>9.0f} {total * 1000:>9.0f}")
+
+
+async def run(state: FakeSupabase, page: int, max_rows: int) -> None:
+    import db
+    from api.main import _LIST_COLUMNS
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    print(f"{'listing':<8} {'rows':>6} {'reqs':>5} {'MB recv':>9} {'first ms':>9} {'total ms':>9}")
+
+    state.calls.clear()
+    start = time.perf_counter()
+    rows = await db.list_recordings(recorder_name=RECORDER, limit=max_rows)
+    elapsed = time.perf_counter() - start
+    report("legacy", state, len(rows), len(json.dumps(rows)), elapsed, elapsed)
+
+    state.calls.clear()
+    count = received = 0
+    first = None
+    after = None
+    start = time.perf_counter()
+    while True:
+        rows = await db.list_recordings(recorder_name=RECORDER, columns=_LIST_COLUMNS, after=after, limit=page)
+        if first is None:
+            first = time.perf_counter() - start
+        count += len(rows)
+        received += len(json.dumps(rows))
+        if len(rows) < page:
+            break
+        after = (rows[-1]["script_id"], rows[-1]["line_index"])
+    report("keyset", state, count, received, first, time.perf_counter() - start)
+    await db.close_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Old vs projected, paginated recording listing")
+    parser.add_argument("--rows", type=int, default=10000, help="Recordings for the one recorder")
+    parser.add_argument("--lines", type=int, default=1547, help="Lines per script")
+    parser.add_argument("--page", type=int, default=1000, help="Page size for the keyset listing")
+    parser.add_argument("--max-rows", type=int, default=1000, help="PostgREST max-rows applied to the old call")
+    args = parser.parse_args()
+
+    state = FakeSupabase()
+    seed(state, args.rows, args.lines)
+    port = free_port()
+    start_fake_supabase(state, port)
+    os.environ["SUPABASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["SUPABASE_KEY"] = "fake-service-role-key"
+    asyncio.run(run(state, args.page, args.max_rows))
+
+
+if __name__ == "__main__":
+    main()
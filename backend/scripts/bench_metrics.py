@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: cost of the metrics instrumentation.
+
+Times, per call:
+  observe     Histogram.observe (what every stage timer ends in)
+  stage       an empty `with stage_timer(...)` block
+  middleware  one request through MetricsMiddleware around a bare ASGI app,
+              minus the same request without it
+  render      a /metrics scrape body with the default metrics populated
+
+Usage (from project root):
+  python backend/scripts/bench_metrics.py
+  python backend/scripts/bench_metrics.py --calls 500000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir))
+
+from core import metrics  # noqa: E402
+
+
+def per_call(fn, calls: int, repeats: int = 5) -> float:
+    """Median seconds per call over repeats."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(calls)
+        samples.append((time.perf_counter() - start) / calls)
+    return statistics.median(samples)
+
+
+def observe_loop(calls: int) -> None:
+    observe = metrics.STAGE_SECONDS.observe
+    for _ in range(calls):
+        observe(0.012, "bench.observe")
+
+
+def stage_loop(calls: int) -> None:
+    timer = metrics.stage_timer
+    for _ in range(calls):
+        with timer("bench.stage"):
+            pass
+
+
+def empty_loop(calls: int) -> None:
+    for _ in range(calls):
+        pass
+
+
+class _Route:
+    path = "/bench/{item_id}"
+
+
+async def bare_app(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def requests(app, calls: int) -> None:
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    for _ in range(calls):
+        await app({"type": "http", "method": "GET", "path": "/bench/1"}, receive, send)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Metrics instrumentation overhead")
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+    os.environ.setdefault("SUPABASE_KEY", "unused")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    from api.main import MetricsMiddleware
+
+    loop_cost = per_call(empty_loop, args.calls)
+    observe = per_call(observe_loop, args.calls) - loop_cost
+    stage = per_call(stage_loop, args.calls) - loop_cost
+
+    wrapped = MetricsMiddleware(bare_app)
+    n = args.calls // 4
+    bare = per_call(lambda c: asyncio.run(requests(bare_app, c)), n)
+    instrumented = per_call(lambda c: asyncio.run(requests(wrapped, c)), n)
+
+    for i in range(50):
+        metrics.STAGE_SECONDS.observe(0.01, f"bench.series{i}")
+    start = time.perf_counter()
+    body = metrics.render()
+    render = time.perf_counter() - start
+
+    print(f"observe     {observe * 1e9:8.0f} ns/call")
+    print(f"stage       {stage * 1e9:8.0f} ns/call")
+    print(f"middleware  {(instrumented - bare) * 1e6:8.2f} us/request  (bare ASGI call {bare * 1e6:.2f} us)")
+    print(f"render      {render * 1e3:8.2f} ms  ({len(body.splitlines())} lines, {len(body) / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bytes saved per take by KUIPER_NORMALIZE_UPLOADS.
+
+Runs the save path's normalization (trim silence, mono 16-bit at
+SAMPLE_RATE) over the sample recordings as they are, and over a
+browser-style copy of each (48 kHz stereo with 0.5 s of room noise added
+before and after), and reports uploaded vs stored bytes and the CPU time
+per take.
+
+Usage (from project root):
+  python backend/scripts/bench_normalize_uploads.py
+  python backend/scripts/bench_normalize_uploads.py data/wavs recordings --pad 1.0
+"""
+import argparse
+import io
+import statistics
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+_backend_dir = Path(__file__).resolve().parent.parent
+_project_root = _backend_dir.parent
+sys.path.insert(0, str(_backend_dir))
+
+from core.audio_convert import decode_wav, resample, to_mono  # noqa: E402
+from core.uploads import canonicalize  # noqa: E402
+
+
+def browser_style(data: bytes, pad_seconds: float, rate: int = 48000) -> bytes:
+    """The same take as a browser might send it: 48 kHz, stereo, padded with quiet noise."""
+    samples, src_rate = decode_wav(data)
+    mono = resample(to_mono(samples), src_rate, rate)
+    pad = np.random.default_rng(0).normal(0, 0.0005, int(pad_seconds * rate)).astype(np.float32)
+    mono = np.concatenate([pad, mono, pad])
+    pcm = (np.clip(np.repeat(mono[:, None], 2, axis=1), -1, 1) * 32767).astype("<i2")
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
+def run(label: str, takes):
+    original = stored = 0
+    times = []
+    for data in takes:
+        start = time.perf_counter()
+        out, _ = canonicalize(data)
+        times.append((time.perf_counter() - start) * 1000)
+        original += len(data)
+        stored += len(out)
+    n = len(times)
+    print(
+        f"{label:<22} {n:>5}  {original / 1048576:>8.2f}  {stored / 1048576:>8.2f}  "
+        f"{(1 - stored / original) * 100:>6.1f}%  {(original - stored) / n / 1024:>10.1f}  "
+        f"{statistics.median(times):>7.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes saved by upload normalization")
+    parser.add_argument("dirs", nargs="*", default=["data/wavs", "recordings"], help="Directories of sample WAVs")
+    parser.add_argument("--pad", type=float, default=0.5, help="Seconds of silence added to each end of browser-style takes")
+    args = parser.parse_args()
+
+    paths = []
+    for d in args.dirs:
+        root = Path(d) if Path(d).is_absolute() else _project_root / d
+        paths += sorted(root.glob("*.wav"))
+    if not paths:
+        raise SystemExit("No sample WAVs found")
+    takes = [p.read_bytes() for p in paths]
+
+    print(f"{'input':<22} {'takes':>5}  {'up MB':>8}  {'stored MB':>8}  {'saved':>7}  {'KB saved/take':>10}  {'ms/take':>7}")
+    run("samples as-is", takes)
+    run(f"48k stereo +{args.pad:g}s pad", [browser_style(t, args.pad) for t in takes])
+
+
+if __name__ == "__main__":
+    main()
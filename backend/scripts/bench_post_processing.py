@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/recording/save latency with post-processing (silence trim
+and FLAC storage) done inline vs queued as a background job.
+
+Starts the fake Supabase and the API once per mode with
+KUIPER_NORMALIZE_UPLOADS=true and KUIPER_STORAGE_FORMAT=flac, saves the
+same takes sequentially and reports save latency, then how long the queue
+took to drain and that every take ended up stored as FLAC.
+
+Usage (from project root):
+  python backend/scripts/bench_post_processing.py
+  python backend/scripts/bench_post_processing.py --takes 50 --seconds 8
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir / "scripts"))
+
+from fake_supabase import FakeSupabase  # noqa: E402
+from loadtest_save import free_port, make_wav, start_fake_supabase  # noqa: E402
+
+ADMIN_KEY = "DovKrugersRecording"
+
+
+def run(mode: str, takes: int, seconds: float, latency: float) -> None:
+    state = FakeSupabase(latency=latency)
+    script = state.seed_script("postbench", [f"Line {i + 1}." for i in range(takes)])
+    supabase_port, api_port = free_port(), free_port()
+    start_fake_supabase(state, supabase_port)
+    queue_dir = tempfile.mkdtemp(prefix="kuiper-jobbench-")
+    env = {
+        **os.environ,
+        "SUPABASE_URL": f"http://127.0.0.1:{supabase_port}",
+        "SUPABASE_KEY": "fake-service-role-key",
+        "LOG_LEVEL": "WARNING",
+        "NORMALIZE_UPLOADS": "true",
+        "STORAGE_FORMAT": "flac",
+        "POST_PROCESSING": mode,
+        "JOB_QUEUE_PATH": os.path.join(queue_dir, "jobs.sqlite3"),
+    }
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(api_port), "--log-level", "warning"],
+        cwd=_backend_dir,
+        env=env,
+    )
+    url = f"http://127.0.0.1:{api_port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{url}/api/health", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+
+        wavs = [make_wav(seconds + i * 0.01) for i in range(takes)]
+        with httpx.Client(base_url=url, timeout=120) as client:
+            headers = {"Authorization": f"Bearer {state.issue_token()}"}
+            client.get("/api/recording/progress", headers=headers)
+            samples = []
+            start = time.perf_counter()
+            for i in range(takes):
+                t = time.perf_counter()
+                r = client.post(
+                    "/api/recording/save",
+                    headers=headers,
+                    files={"audio_file": ("take.wav", wavs[i], "audio/wav")},
+                    data={"script_id": script["id"], "line_index": i, "phrase_text": f"Line {i + 1}."},
+                )
+                samples.append(time.perf_counter() - t)
+                assert r.json()["success"], r.text
+            saved = time.perf_counter() - start
+            while True:
+                counts = client.get("/api/admin/jobs", headers={"X-Admin-Key": ADMIN_KEY}).json()["counts"]
+                if counts["queued"] == 0 and counts["running"] == 0:
+                    break
+                time.sleep(0.05)
+            drained = time.perf_counter() - start
+
+        ms = sorted(s * 1000 for s in samples)
+        flac = sum(1 for r in state.tables["recordings"] if r["storage_path"].endswith(".flac"))
+        print(
+            f"{mode:<10} save p50 {statistics.median(ms):7.1f} ms  p95 {ms[int(len(ms) * 0.95)]:7.1f} ms  "
+            f"saves {saved:6.2f}s  all stored {drained:6.2f}s  flac {flac}/{takes}  failed jobs {counts['failed']}"
+        )
+    finally:
+        api.terminate()
+        api.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Save latency with inline vs background post-processing")
+    parser.add_argument("--takes", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=5.0, help="Length of each take")
+    parser.add_argument("--latency", type=float, default=0.02, help="Fake Supabase latency per call")
+    args = parser.parse_args()
+
+    for mode in ("inline", "background"):
+        run(mode, args.takes, args.seconds, args.latency)
+
+
+if __name__ == "__main__":
+    main()
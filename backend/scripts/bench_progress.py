@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: db.get_recording_progress latency as the number of scripts grows.
+
+Seeds the local Supabase stand-in with N scripts (10 recordings each for the
+benchmark user) and times the grouped-query implementation against the
+previous one-count-per-script loop, reproduced here for reference.
+
+Usage (from project root):
+  python backend/scripts/bench_progress.py
+  python backend/scripts/bench_progress.py --latency 0.03 --sizes 5 50 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import uvicorn
+
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir))
+sys.path.insert(0, str(_backend_dir / "scripts"))
+
+from fake_supabase import FakeSupabase, create_app  # noqa: E402
+from loadtest_save import free_port  # noqa: E402
+
+RECORDER = "bench-user"
+
+
+async def legacy_progress(db, recorder_name: str):
+    """The N+1 implementation this replaced (reference only)."""
+    client = await db._get_client()
+    scripts = await db.list_scripts()
+    progress = []
+    for script in scripts:
+        query = client.table("recordings").select("id", count="exact").eq("script_id", script["id"])
+        query = query.eq("recorder_name", recorder_name)
+        result = await db._execute(query)
+        progress.append((script["id"], result.count or 0, script["line_count"]))
+    return progress
+
+
+def seed(state: FakeSupabase, n_scripts: int):
+    state.tables = {name: [] for name in state.tables}
+    for s in range(n_scripts):
+        script = state.seed_script(f"script_{s}", [f"Line {i}." for i in range(100)])
+        for line in range(10):
+            state.insert("recordings", {
+                "script_id": script["id"], "line_index": line, "recorder_name": RECORDER,
+                "phrase_text": f"Line {line}.", "filename": f"script_{s}_{line:04d}.wav",
+                "storage_path": f"{RECORDER}/{script['id']}/script_{s}_{line:04d}.wav",
+            })
+
+
+async def timed(fn, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+async def run(args, state: FakeSupabase):
+    import db
+
+    print(f"Fake Supabase latency {args.latency * 1000:.0f} ms/call, best of {args.repeat}")
+    print(f"{'scripts':>7}  {'N+1 ms':>8}  {'calls':>5}  {'grouped ms':>10}  {'calls':>5}")
+    for n in args.sizes:
+        seed(state, n)
+        state.calls.clear()
+        legacy_s, legacy = await timed(lambda: legacy_progress(db, RECORDER), args.repeat)
+        legacy_calls = sum(state.calls.values()) // args.repeat
+        state.calls.clear()
+        grouped_s, grouped = await timed(lambda: db.get_recording_progress(RECORDER), args.repeat)
+        grouped_calls = sum(state.calls.values()) // args.repeat
+
+        if [(p["script_id"], p["recorded"], p["total"]) for p in grouped] != legacy:
+            print(f"  results differ for {n} scripts")
+            sys.exit(1)
+        print(f"{n:>7}  {legacy_s * 1000:>8.1f}  {legacy_calls:>5}  {grouped_s * 1000:>10.1f}  {grouped_calls:>5}")
+    await db.close_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Progress latency vs number of scripts")
+    parser.add_argument("--latency", type=float, default=0.02, help="Fake Supabase latency per call")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 16, 64, 256])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    state = FakeSupabase(latency=args.latency)
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(create_app(state), port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    os.environ["SUPABASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["SUPABASE_KEY"] = "fake-service-role-key"
+    asyncio.run(run(args, state))
+
+
+if __name__ == "__main__":
+    main()
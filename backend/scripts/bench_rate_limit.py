@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request overhead of the rate limiting middleware.
+
+Drives a trivial Starlette app through each middleware in-process (no
+network) and reports microseconds per request for:
+  - no limiter (baseline)
+  - the previous list-of-timestamps BaseHTTPMiddleware, reproduced here
+  - RateLimitMiddleware with the memory backend
+  - RateLimitMiddleware with the shared SQLite backend
+
+Two workloads: one hot client sending --limit requests (the old limiter
+rescans its whole timestamp list on each one), and --clients distinct IPs
+sending one request each, after which retained keys are shown once the
+window has passed.
+
+Usage (from project root):
+  python backend/scripts/bench_rate_limit.py
+  python backend/scripts/bench_rate_limit.py --limit 5000 --clients 50000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from api.main import RateLimitMiddleware  # noqa: E402
+from core.ratelimit import MemoryRateLimiter, SQLiteRateLimiter  # noqa: E402
+
+
+def legacy_middleware(limit: int, store: dict):
+    """The list-scan limiter this replaced (reference only)."""
+
+    async def rate_limit(request, call_next):
+        client_ip = request.client.host if request.client else "unknown"
+        current_time = time.time()
+        minute_ago = current_time - 60
+        if client_ip not in store:
+            store[client_ip] = []
+        store[client_ip] = [t for t in store[client_ip] if t > minute_ago]
+        if len(store[client_ip]) >= limit:
+            return JSONResponse(status_code=429, content={"detail": "Rate limit exceeded."})
+        store[client_ip].append(current_time)
+        return await call_next(request)
+
+    return rate_limit
+
+
+def base_app() -> Starlette:
+    async def ok(request):
+        return PlainTextResponse("ok")
+
+    return Starlette(routes=[Route("/", ok)])
+
+
+async def drive(app, ips) -> float:
+    """Send one GET / per ip; returns seconds per request."""
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for ip in ips:
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": "/", "raw_path": b"/",
+            "query_string": b"", "root_path": "", "headers": [],
+            "client": (ip, 50000), "server": ("testserver", 80),
+        }
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / len(ips)
+
+
+def variants(limit: int, db_path: str):
+    plain = base_app()
+    yield "no limiter", plain, None
+
+    store = {}
+    legacy = base_app()
+    legacy.add_middleware(BaseHTTPMiddleware, dispatch=legacy_middleware(limit, store))
+    yield "list scan (old)", legacy, store
+
+    memory = MemoryRateLimiter(limit)
+    yield "memory", RateLimitMiddleware(base_app(), memory), memory
+
+    sqlite = SQLiteRateLimiter(db_path, limit)
+    yield "sqlite", RateLimitMiddleware(base_app(), sqlite), sqlite
+
+
+def retained_after_window(state) -> str:
+    if state is None:
+        return "-"
+    if isinstance(state, dict):
+        return str(len(state))  # never evicted
+    later = time.time() + 2 * state.window
+    if isinstance(state, SQLiteRateLimiter):
+        with state._lock:
+            state._delete_stale(later)
+    else:
+        state._sweep(later)
+    return str(state.keys())
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Hot client: {args.limit} requests from one IP (limit {args.limit}/min)")
+        print(f"  {'middleware':<16} {'us/request':>10}")
+        for name, app, _ in variants(args.limit, os.path.join(tmp, "hot.sqlite3")):
+            print(f"  {name:<16} {await drive(app, ['10.0.0.1'] * args.limit) * 1e6:>10.1f}")
+
+        ips = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(args.clients)]
+        print(f"\nMany clients: {args.clients} IPs, one request each")
+        print(f"  {'middleware':<16} {'us/request':>10}  {'keys kept after window':>22}")
+        for name, app, state in variants(args.limit, os.path.join(tmp, "many.sqlite3")):
+            per_request = await drive(app, ips)
+            print(f"  {name:<16} {per_request * 1e6:>10.1f}  {retained_after_window(state):>22}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rate limit middleware overhead")
+    parser.add_argument("--limit", type=int, default=2000, help="Requests per minute allowed per IP")
+    parser.add_argument("--clients", type=int, default=20000, help="Distinct client IPs")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: stored bytes and codec cost of KUIPER_STORAGE_FORMAT=flac.
+
+Encodes each sample WAV as FLAC, checks the round trip is bit-exact, and
+reports WAV vs FLAC bytes plus the CPU time per take to encode (save path)
+and decode back to WAV (serving a client that asks for audio/wav).
+
+Usage (from project root):
+  python backend/scripts/bench_storage_format.py
+  python backend/scripts/bench_storage_format.py data/wavs recordings
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+_backend_dir = Path(__file__).resolve().parent.parent
+_project_root = _backend_dir.parent
+sys.path.insert(0, str(_backend_dir))
+
+from core.audio_convert import decode_wav  # noqa: E402
+from core.codecs import encode, flac_available  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WAV vs FLAC storage size and codec time")
+    parser.add_argument("dirs", nargs="*", default=["data/wavs", "recordings"], help="Directories of sample WAVs")
+    args = parser.parse_args()
+
+    if not flac_available():
+        raise SystemExit("FLAC needs soundfile (pip install soundfile)")
+    paths = []
+    for d in args.dirs:
+        root = Path(d) if Path(d).is_absolute() else _project_root / d
+        paths += sorted(root.glob("*.wav"))
+    if not paths:
+        raise SystemExit("No sample WAVs found")
+
+    wav_bytes = flac_bytes = 0
+    encode_ms, decode_ms = [], []
+    for path in paths:
+        data = path.read_bytes()
+        start = time.perf_counter()
+        flac = encode(data, "flac")
+        encode_ms.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        back = encode(flac, "wav")
+        decode_ms.append((time.perf_counter() - start) * 1000)
+        samples, rate = decode_wav(data)
+        again, again_rate = decode_wav(back)
+        if rate != again_rate or not (samples == again).all():
+            raise SystemExit(f"{path}: FLAC round trip is not lossless")
+        wav_bytes += len(data)
+        flac_bytes += len(flac)
+
+    n = len(paths)
+    print(f"{n} takes, round trip bit-exact")
+    print(f"  WAV   {wav_bytes / 1048576:8.2f} MB  {wav_bytes / n / 1024:8.1f} KB/take")
+    print(f"  FLAC  {flac_bytes / 1048576:8.2f} MB  {flac_bytes / n / 1024:8.1f} KB/take  ({flac_bytes / wav_bytes * 100:.1f}% of WAV)")
+    print(f"  encode {statistics.median(encode_ms):6.1f} ms/take   decode {statistics.median(decode_ms):6.1f} ms/take (median)")
+
+
+if __name__ == "__main__":
+    main()
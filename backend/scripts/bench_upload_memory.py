@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Measure API peak RSS per /api/recording/save upload as file size grows.
+
+Starts the fake Supabase in-process and the API in a subprocess, then posts
+WAV files of increasing size. Before each upload the API's peak-RSS counter
+is reset (/proc/<pid>/clear_refs), and VmHWM is read afterwards, so each row
+is the high-water mark for that single request. Finishes with an oversized
+upload to show it is rejected without reading the body. Linux only.
+
+Usage (from project root):
+  python backend/scripts/bench_upload_memory.py
+  python backend/scripts/bench_upload_memory.py --sizes 1 16 64 96
+"""
+import argparse
+import io
+import os
+import subprocess
+import sys
+import time
+import wave
+from pathlib import Path
+
+import httpx
+
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir / "scripts"))
+
+from fake_supabase import FakeSupabase  # noqa: E402
+from loadtest_save import free_port, start_fake_supabase  # noqa: E402
+
+
+def wav_of_size(megabytes: float) -> bytes:
+    frames = int(megabytes * 1024 * 1024) // 2
+    pcm = (b"\x00\x10\x00\xf0" * (frames // 2 + 1))[: frames * 2]
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(44100)
+        wf.writeframes(pcm)
+    return buf.getvalue()
+
+
+def rss_kb(pid: int, field: str) -> int:
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith(field + ":"):
+            return int(line.split()[1])
+    return 0
+
+
+def reset_peak(pid: int) -> None:
+    Path(f"/proc/{pid}/clear_refs").write_text("5")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak RSS per upload")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 8, 32, 64, 96], help="Upload sizes in MB")
+    args = parser.parse_args()
+
+    state = FakeSupabase()
+    script = state.seed_script("memtest", ["Line one."])
+    supabase_port, api_port = free_port(), free_port()
+    start_fake_supabase(state, supabase_port)
+
+    env = {
+        **os.environ,
+        "SUPABASE_URL": f"http://127.0.0.1:{supabase_port}",
+        "SUPABASE_KEY": "fake-service-role-key",
+        "LOG_LEVEL": "WARNING",
+    }
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(api_port), "--log-level", "warning"],
+        cwd=_backend_dir,
+        env=env,
+    )
+    url = f"http://127.0.0.1:{api_port}"
+    token = state.issue_token()
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{url}/api/health", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+
+        print(f"API baseline RSS: {rss_kb(api.pid, 'VmRSS') / 1024:.1f} MB")
+        print(f"{'upload MB':>9}  {'status':>6}  {'peak RSS MB':>11}  {'seconds':>7}")
+        for size in args.sizes + [150]:
+            data = wav_of_size(size)
+            reset_peak(api.pid)
+            start = time.perf_counter()
+            try:
+                r = httpx.post(
+                    f"{url}/api/recording/save",
+                    headers={"Authorization": f"Bearer {token}"},
+                    files={"audio_file": ("take.wav", data, "audio/wav")},
+                    data={"script_id": str(script["id"]), "line_index": "0", "phrase_text": "Line one."},
+                    timeout=120,
+                )
+                status = r.status_code
+            except httpx.TransportError:
+                status = "closed"
+            elapsed = time.perf_counter() - start
+            print(f"{len(data) / 1048576:>9.1f}  {status:>6}  {rss_kb(api.pid, 'VmHWM') / 1024:>11.1f}  {elapsed:>7.2f}")
+    finally:
+        api.terminate()
+        api.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Build a training-ready dataset from recordings.
+
+Reads a directory of WAV files (e.g. data/ or a downloaded recordings/
+folder) or an archive from /api/admin/export (.tar / .zip), and writes
+<out>/wavs/*.wav as mono 16-bit PCM at the target rate, resampled, with
+leading/trailing silence trimmed and loudness normalized, plus an
+LJSpeech-style <out>/metadata.csv built from any metadata.csv found in
+the input. Files are converted on a process pool.
+
+Re-runs are incremental: <out>/manifest.json records the SHA-256 of each
+source and the conversion settings, so only new or changed recordings are
+converted, and outputs whose source disappeared are removed. Changing any
+conversion option rebuilds everything.
+
+Usage (from project root):
+  python backend/scripts/build_dataset.py data/ build/dataset
+  python backend/scripts/build_dataset.py export.tar build/dataset --jobs 8 --target-dbfs -23
+  python backend/scripts/build_dataset.py recordings/ build/dataset --config data/my_voice.json --no-trim
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir))
+
+from core import SAMPLE_RATE  # noqa: E402
+from core.audio_convert import ConvertOptions, convert_wav  # noqa: E402
+from core.export import metadata_line  # noqa: E402
+
+MANIFEST = "manifest.json"
+
+
+def output_name(relative: str) -> str:
+    """Flat output filename for an input path: wavs/0001.wav -> 0001.wav,
+    alice/3/line_0001.wav -> alice_3_line_0001.wav."""
+    parts = Path(relative).parts
+    if len(parts) > 1 and parts[0] == "wavs":
+        parts = parts[1:]
+    return "_".join(parts)
+
+
+def parse_metadata(text: str) -> Dict[str, str]:
+    """LJSpeech metadata.csv (`id|text` or `id|text|normalized`) -> {wav filename: text}."""
+    entries = {}
+    for line in text.splitlines():
+        name, sep, rest = line.partition("|")
+        if not sep:
+            continue
+        name = name.strip()
+        if not name.endswith(".wav"):
+            name += ".wav"
+        entries[name] = rest.split("|")[0].strip()
+    return entries
+
+
+def read_sources(source: Path) -> Tuple[Dict[str, str], Iterator[Tuple[str, bytes]]]:
+    """Return (metadata, iterator of (output name, wav bytes)) for a directory or export archive."""
+    if source.is_dir():
+        metadata = {}
+        for csv in source.rglob("metadata.csv"):
+            metadata.update(parse_metadata(csv.read_text(encoding="utf-8", errors="replace")))
+        paths = sorted(p for p in source.rglob("*") if p.suffix.lower() == ".wav" and p.is_file())
+        return metadata, ((output_name(p.relative_to(source).as_posix()), p.read_bytes()) for p in paths)
+
+    if zipfile.is_zipfile(source):
+        archive = zipfile.ZipFile(source)
+        names = archive.namelist()
+        metadata = {}
+        for name in names:
+            if Path(name).name == "metadata.csv":
+                metadata.update(parse_metadata(archive.read(name).decode("utf-8", "replace")))
+        wavs = sorted(n for n in names if n.lower().endswith(".wav"))
+        return metadata, ((output_name(n), archive.read(n)) for n in wavs)
+
+    if tarfile.is_tarfile(source):
+        # Exports put metadata.csv last, so collect it in a first pass over the headers
+        archive = tarfile.open(source)
+        members = [m for m in archive.getmembers() if m.isfile()]
+        metadata = {}
+        for m in members:
+            if Path(m.name).name == "metadata.csv":
+                metadata.update(parse_metadata(archive.extractfile(m).read().decode("utf-8", "replace")))
+        wavs = [m for m in members if m.name.lower().endswith(".wav")]
+        return metadata, ((output_name(m.name), archive.extractfile(m).read()) for m in wavs)
+
+    raise SystemExit(f"{source}: not a directory, .zip or .tar")
+
+
+def load_manifest(out_dir: Path, fingerprint: str) -> Dict[str, dict]:
+    path = out_dir / MANIFEST
+    if not path.exists():
+        return {}
+    manifest = json.loads(path.read_text())
+    if manifest.get("settings") != fingerprint:
+        print("Conversion settings changed; rebuilding all files")
+        return {}
+    return manifest.get("files", {})
+
+
+def save_manifest(out_dir: Path, fingerprint: str, options: ConvertOptions, files: Dict[str, dict]) -> None:
+    path = out_dir / MANIFEST
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(
+        {"settings": fingerprint, "options": asdict(options), "files": dict(sorted(files.items()))},
+        indent=1,
+    ))
+    os.replace(tmp, path)
+
+
+def convert_job(name: str, data: bytes, options: ConvertOptions):
+    """Runs in a pool worker: (name, ConvertedAudio or None, error or None)."""
+    try:
+        return name, convert_wav(data, options), None
+    except ValueError as e:
+        return name, None, str(e)
+
+
+def build(source: Path, out_dir: Path, options: ConvertOptions, jobs: int) -> None:
+    wav_dir = out_dir / "wavs"
+    wav_dir.mkdir(parents=True, exist_ok=True)
+    fingerprint = options.fingerprint()
+    previous = load_manifest(out_dir, fingerprint)
+    metadata, sources = read_sources(source)
+
+    files: Dict[str, dict] = {}
+    seen = set()
+    skipped = failed = 0
+    converted_seconds = 0.0
+    start = time.perf_counter()
+
+    in_flight = {}
+    pending_info: Dict[str, dict] = {}
+
+    def collect(done) -> None:
+        nonlocal failed, converted_seconds
+        for future in done:
+            in_flight.pop(future)
+            name, audio, error = future.result()
+            info = pending_info.pop(name)
+            if audio is None:
+                failed += 1
+                print(f"  {name}: {error}")
+                (wav_dir / name).unlink(missing_ok=True)
+                continue
+            tmp = wav_dir / f".{name}.tmp"
+            tmp.write_bytes(audio.data)
+            os.replace(tmp, wav_dir / name)
+            info.update(
+                source_rate=audio.source_rate,
+                source_channels=audio.source_channels,
+                duration=audio.duration_seconds,
+            )
+            files[name] = info
+            converted_seconds += audio.source_seconds
+
+    completed = False
+    try:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for name, data in sources:
+                if name in seen:
+                    print(f"  {name}: duplicate output name, skipped")
+                    continue
+                seen.add(name)
+                digest = hashlib.sha256(data).hexdigest()
+                text = metadata.get(name, metadata.get(Path(name).name, ""))
+                old = previous.get(name)
+                if old and old.get("sha256") == digest and (wav_dir / name).exists():
+                    files[name] = {**old, "text": text}
+                    skipped += 1
+                    continue
+                pending_info[name] = {"sha256": digest, "text": text}
+                in_flight[pool.submit(convert_job, name, data, options)] = name
+                # Bound the raw audio held in memory waiting for a worker
+                if len(in_flight) >= jobs * 4:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+        completed = True
+    finally:
+        if not completed:
+            # Interrupted: keep what finished and the entries not reached yet
+            for name, old in previous.items():
+                files.setdefault(name, old)
+        save_manifest(out_dir, fingerprint, options, files)
+
+    removed = 0
+    for name in set(previous) - seen:
+        (wav_dir / name).unlink(missing_ok=True)
+        removed += 1
+
+    missing_text = [name for name in sorted(files) if not files[name]["text"]]
+    with open(out_dir / "metadata.csv", "w", encoding="utf-8") as f:
+        for name in sorted(files):
+            if files[name]["text"]:
+                f.write(metadata_line(name, files[name]["text"]))
+
+    elapsed = time.perf_counter() - start
+    converted = len(files) - skipped
+    total = sum(entry.get("duration", 0) for entry in files.values())
+    print(f"{out_dir}: {len(files)} files, {total / 3600:.2f} h of audio at {options.sample_rate} Hz")
+    print(f"  converted: {converted}  unchanged: {skipped}  failed: {failed}  removed: {removed}")
+    if missing_text:
+        print(f"  {len(missing_text)} file(s) have no transcript and are left out of metadata.csv")
+    if converted:
+        print(f"  {elapsed:.1f}s with {jobs} worker(s), {converted_seconds / elapsed:.0f}x realtime")
+
+
+def target_rate(config: Optional[Path]) -> int:
+    if config is None:
+        return SAMPLE_RATE
+    return int(json.loads(config.read_text())["audio"]["sample_rate"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert recordings into a training-ready dataset")
+    parser.add_argument("source", type=Path, help="Directory of WAVs, or an export .tar/.zip")
+    parser.add_argument("out", type=Path, help="Output dataset directory")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--config", type=Path, help="Voice config (e.g. data/my_voice.json) to take audio.sample_rate from")
+    parser.add_argument("--sample-rate", type=int, help=f"Target rate (default: config or {SAMPLE_RATE})")
+    parser.add_argument("--trim-db", type=float, default=ConvertOptions.trim_db)
+    parser.add_argument("--trim-pad-ms", type=float, default=ConvertOptions.trim_pad_ms)
+    parser.add_argument("--target-dbfs", type=float, default=ConvertOptions.target_dbfs)
+    parser.add_argument("--peak-dbfs", type=float, default=ConvertOptions.peak_dbfs)
+    parser.add_argument("--no-trim", action="store_true", help="Keep leading/trailing silence")
+    parser.add_argument("--no-normalize", action="store_true", help="Keep original levels")
+    args = parser.parse_args()
+
+    if not args.source.exists():
+        raise SystemExit(f"{args.source} does not exist")
+    options = ConvertOptions(
+        sample_rate=args.sample_rate or target_rate(args.config),
+        trim_db=args.trim_db,
+        trim_pad_ms=args.trim_pad_ms,
+        target_dbfs=args.target_dbfs,
+        peak_dbfs=args.peak_dbfs,
+        trim=not args.no_trim,
+        normalize=not args.no_normalize,
+    )
+    build(args.source, args.out, options, max(1, args.jobs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Count Supabase round trips per db.save_recording call against the local
+stand-in (scripts/fake_supabase.py), and check the save path's guarantees.
+
+Scenarios: a first take, the identical bytes submitted again (a client
+retry), a different take, the same line re-stored in the other format,
+and a take whose storage upload fails. For each it prints the calls made
+by route and checks that the stored row always points at an object that
+exists. Then it checks background post-processing (db.replace_recording_audio):
+a take re-recorded while its job ran must keep its own audio, and a job that
+wins must leave only its re-encoded object. Exits 1 if a scenario makes more
+storage calls than expected, leaves a line without audio, or lets a job
+overwrite a newer take.
+
+Usage (from project root):
+  python backend/scripts/check_save_round_trips.py
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir))
+sys.path.insert(0, str(_backend_dir / "scripts"))
+
+from fake_supabase import FakeSupabase  # noqa: E402
+from loadtest_save import free_port, make_wav, start_fake_supabase  # noqa: E402
+
+RECORDER = "round-trip-user"
+
+
+async def run(state: FakeSupabase) -> bool:
+    import db
+
+    script = state.seed_script("trips", ["One.", "Two."])
+    take = make_wav(seconds=1.0)
+    other_take = make_wav(seconds=1.5)
+    # (label, bytes, extension, expected storage calls, upload fails)
+    scenarios = [
+        ("first take", take, "wav", 1, False),
+        ("identical re-submit", take, "wav", 0, False),
+        ("different take", other_take, "wav", 1, False),
+        ("re-stored as .flac", other_take, "flac", 2, False),
+        ("upload fails", take, "wav", 1, True),
+    ]
+    ok = True
+    print(f"{'scenario':<22} {'storage':>7} {'db':>3}  calls")
+    for label, data, ext, expected_storage, fail in scenarios:
+        state.calls.clear()
+        state.failing_uploads = 1 if fail else 0
+        error = None
+        try:
+            await db.save_recording(
+                script_id=script["id"], line_index=0, phrase_text="One.", recorder_name=RECORDER,
+                filename=f"trips_0001.{ext}", audio_data=data,
+                content_type="audio/flac" if ext == "flac" else "audio/wav",
+            )
+        except Exception as e:
+            error = type(e).__name__
+        storage = sum(n for route, n in state.calls.items() if "storage:" in route)
+        rest = sum(n for route, n in state.calls.items() if "rest:" in route)
+        row = next(r for r in state.tables["recordings"] if r["recorder_name"] == RECORDER)
+        has_audio = f"recordings/{row['storage_path']}" in state.objects
+        print(f"{label:<22} {storage:>7} {rest:>3}  {dict(sorted(state.calls.items()))}"
+              + (f"  ({error})" if error else ""))
+        if storage > expected_storage:
+            print(f"  expected at most {expected_storage} storage call(s)")
+            ok = False
+        if not has_audio:
+            print(f"  row points at missing object {row['storage_path']}")
+            ok = False
+        if fail != (error is not None):
+            print("  unexpected save outcome")
+            ok = False
+    stored = [k for k in state.objects if RECORDER in k]
+    if len(stored) != 1:
+        print(f"  expected one stored object for the line, found {stored}")
+        ok = False
+    ok = await check_post_processing(db, state, script["id"]) and ok
+    await db.close_db()
+    return ok
+
+
+async def check_post_processing(db, state: FakeSupabase, script_id: int) -> bool:
+    """A job re-encoding take A must not clobber take B saved at the same path meanwhile."""
+    take_a, take_b = make_wav(seconds=1.0), make_wav(seconds=2.0)
+    processed_a = make_wav(seconds=0.8)  # stands in for the normalized take A
+
+    async def save(data: bytes) -> dict:
+        return await db.save_recording(
+            script_id=script_id, line_index=1, phrase_text="Two.", recorder_name=RECORDER,
+            filename="trips_0002.wav", audio_data=data,
+        )
+
+    def stored(row: dict) -> bytes:
+        return state.objects.get(f"recordings/{row['storage_path']}")
+
+    def line_objects() -> list:
+        return [k for k in state.objects if RECORDER in k and "trips_0002." in k]
+
+    ok = True
+    record_a = await save(take_a)
+    record_b = await save(take_b)  # re-recorded while the job for take A runs
+    replaced = await db.replace_recording_audio(record_a, "trips_0002.wav", processed_a, "audio/wav")
+    row = await db.get_recording(record_a["id"], columns="*")
+    print(f"{'job loses the race':<22} replaced={replaced} objects={sorted(line_objects())}")
+    if replaced or row["content_sha256"] != record_b["content_sha256"] or stored(row) != take_b:
+        print("  the job overwrote the newer take")
+        ok = False
+    if len(line_objects()) != 1:
+        print("  expected only the newer take's object to remain")
+        ok = False
+
+    replaced = await db.replace_recording_audio(row, "trips_0002.wav", processed_a, "audio/wav")
+    row = await db.get_recording(record_a["id"], columns="*")
+    print(f"{'job wins':<22} replaced={replaced} objects={sorted(line_objects())}")
+    if not replaced or stored(row) != processed_a or len(line_objects()) != 1:
+        print("  expected the row to point at the re-encoded object alone")
+        ok = False
+    return ok
+
+
+def main():
+    state = FakeSupabase()
+    port = free_port()
+    start_fake_supabase(state, port)
+    os.environ["SUPABASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["SUPABASE_KEY"] = "fake-service-role-key"
+    if not asyncio.run(run(state)):
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Local Supabase stand-in for load tests and benchmarks.
+
+Implements the small subset of PostgREST, Storage and Auth (JWKS) that db.py
+and the JWT dependency in api/main.py use, backed by in-memory tables. Every
+request can be delayed by a fixed latency to mimic a remote project, and each
+call is counted per route so benchmarks can report round trips.
+
+Usage (from project root):
+  python backend/scripts/fake_supabase.py --port 54321 --latency 0.05
+
+Then point the backend at it:
+  SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_KEY=fake python run_server.py
+
+The startup banner prints a signed access token for a test user.
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import ec
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+KID = "fake-supabase-key"
+TABLE_KEYS = {"scripts": "id", "recordings": "id", "user_settings": "user_id"}
+
+
+class FakeSupabase:
+    """In-memory state shared by the fake routes (tables, objects, signing key)."""
+
+    def __init__(self, latency: float = 0.0, max_rows: Optional[int] = None):
+        self.latency = latency
+        self.max_rows = max_rows  # PostgREST db-max-rows: selects return at most this many rows
+        self.missing_columns: set = set()  # columns of a migration not applied yet; naming one is an error
+        self.tables: Dict[str, List[Dict[str, Any]]] = {name: [] for name in TABLE_KEYS}
+        self.objects: Dict[str, bytes] = {}
+        self.calls: Counter = Counter()
+        self.failing_uploads = 0  # next N storage uploads answer 500
+        self._next_id: Counter = Counter()
+        self.signing_key = ec.generate_private_key(ec.SECP256R1())
+
+    # ------------------------------------------------------------------ auth
+
+    def jwks(self) -> Dict[str, Any]:
+        jwk = json.loads(jwt.algorithms.ECAlgorithm.to_jwk(self.signing_key.public_key()))
+        jwk.update({"kid": KID, "alg": "ES256", "use": "sig"})
+        return {"keys": [jwk]}
+
+    def issue_token(self, user_id: Optional[str] = None, ttl: int = 3600) -> str:
+        """Sign an access token the backend will accept via JWKS."""
+        now = int(time.time())
+        payload = {
+            "sub": user_id or str(uuid.uuid4()),
+            "aud": "authenticated",
+            "role": "authenticated",
+            "iat": now,
+            "exp": now + ttl,
+        }
+        return jwt.encode(payload, self.signing_key, algorithm="ES256", headers={"kid": KID})
+
+    # ---------------------------------------------------------------- tables
+
+    def insert(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        row = dict(row)
+        if TABLE_KEYS[table] == "id" and "id" not in row:
+            self._next_id[table] += 1
+            row["id"] = self._next_id[table]
+        row.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+        self.tables[table].append(row)
+        return row
+
+    def seed_script(self, name: str, lines: List[str]) -> Dict[str, Any]:
+        return self.insert("scripts", {"name": name, "lines": lines, "line_count": len(lines)})
+
+    # ------------------------------------------------------------------ rpc
+
+    def rpc_recording_counts(self, p_recorder_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        counts: Counter = Counter(
+            r["script_id"] for r in self.tables["recordings"]
+            if p_recorder_name is None or r.get("recorder_name") == p_recorder_name
+        )
+        return [{"script_id": sid, "recorded": n} for sid, n in counts.items()]
+
+
+def _coerce(value: str) -> Any:
+    if value == "true":
+        return True
+    if value == "false":
+        return False
+    if value == "null":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+
+def _matches(row: Dict[str, Any], column: str, expr: str) -> bool:
+    op, _, raw = expr.partition(".")
+    current = row.get(column)
+    if op == "in":
+        return current in [_coerce(v.strip('"')) for v in raw.strip("()").split(",") if v]
+    if op == "is":
+        return current is _coerce(raw)
+    value = _coerce(raw)
+    if op == "eq":
+        return current == value or str(current) == raw
+    if op == "neq":
+        return current != value
+    if current is None:
+        return False
+    if op == "gt":
+        return current > value
+    if op == "gte":
+        return current >= value
+    if op == "lt":
+        return current < value
+    if op == "lte":
+        return current <= value
+    raise ValueError(f"Unsupported filter operator: {op}")
+
+
+_RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+def _split_terms(body: str) -> List[str]:
+    """Split "a.eq.1,and(b.gt.2,c.lt.3)" at top-level commas."""
+    terms, depth, current = [], 0, ""
+    for ch in body + ",":
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0:
+            if current:
+                terms.append(current)
+            current = ""
+        else:
+            current += ch
+    return terms
+
+
+def _matches_logic(row: Dict[str, Any], op: str, body: str) -> bool:
+    """PostgREST or=(...) / and=(...) trees, e.g. or=(a.gt.1,and(a.eq.1,b.gt.2))."""
+    results = []
+    for term in _split_terms(body.strip()[1:-1]):
+        if term.startswith(("and(", "or(")):
+            inner_op, _, inner = term.partition("(")
+            results.append(_matches_logic(row, inner_op, "(" + inner))
+        else:
+            column, _, expr = term.partition(".")
+            results.append(_matches(row, column, expr))
+    return any(results) if op == "or" else all(results)
+
+
+def _filter_rows(rows: List[Dict[str, Any]], params) -> List[Dict[str, Any]]:
+    for column, expr in params.multi_items():
+        if column in _RESERVED_PARAMS or "." in column:
+            continue
+        if column in ("or", "and"):
+            rows = [r for r in rows if _matches_logic(r, column, expr)]
+        else:
+            rows = [r for r in rows if _matches(r, column, expr)]
+    return rows
+
+
+def _order_rows(rows: List[Dict[str, Any]], order: Optional[str]) -> List[Dict[str, Any]]:
+    if not order:
+        return rows
+    for term in reversed(order.split(",")):
+        column, _, direction = term.partition(".")
+        rows = sorted(
+            rows,
+            key=lambda r: (r.get(column) is None, r.get(column)),
+            reverse=direction.startswith("desc"),
+        )
+    return rows
+
+
+def _project(state: FakeSupabase, table: str, rows: List[Dict[str, Any]], select: str) -> List[Dict[str, Any]]:
+    """Apply a PostgREST select list, including one level of embedded resources."""
+    columns: List[str] = []
+    embeds: Dict[str, List[str]] = {}
+    depth, current = 0, ""
+    for ch in (select or "*") + ",":
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0:
+            item = current.strip()
+            if "(" in item:
+                name, _, inner = item.partition("(")
+                embeds[name.strip()] = [c.strip() for c in inner.rstrip(")").split(",")]
+            elif item:
+                columns.append(item)
+            current = ""
+        else:
+            current += ch
+
+    projected = []
+    for row in rows:
+        out = dict(row) if "*" in columns else {c: row.get(c) for c in columns}
+        for name, inner in embeds.items():
+            parent = next(
+                (p for p in state.tables.get(name, []) if p.get("id") == row.get(f"{name[:-1]}_id")),
+                None,
+            )
+            out[name] = None if parent is None else (
+                dict(parent) if "*" in inner else {c: parent.get(c) for c in inner}
+            )
+        projected.append(out)
+    return projected
+
+
+def create_app(state: Optional[FakeSupabase] = None) -> FastAPI:
+    state = state or FakeSupabase()
+    app = FastAPI(title="Fake Supabase")
+    app.state.fake = state
+
+    @app.middleware("http")
+    async def count_and_delay(request: Request, call_next):
+        # e.g. "GET rest:scripts", "POST storage:object"
+        parts = request.url.path.split("/")
+        kind = f"{parts[1]}:{parts[3]}" if len(parts) > 3 else request.url.path
+        state.calls[f"{request.method} {kind}"] += 1
+        if state.latency:
+            await asyncio.sleep(state.latency)
+        return await call_next(request)
+
+    @app.get("/auth/v1/.well-known/jwks.json")
+    async def jwks():
+        return state.jwks()
+
+    # -------------------------------------------------------------- postgrest
+
+    def _unknown_column(table: str, names) -> Optional[JSONResponse]:
+        for name in names:
+            if name in state.missing_columns:
+                return JSONResponse(
+                    {"code": "42703", "message": f"column {table}.{name} does not exist", "hint": None, "details": None},
+                    status_code=400,
+                )
+        return None
+
+    def _unknown_write_column(table: str, rows) -> Optional[JSONResponse]:
+        for name in {k for row in rows for k in row}:
+            if name in state.missing_columns:
+                return JSONResponse(
+                    {"code": "PGRST204", "message": f"Could not find the '{name}' column of '{table}' in the schema cache",
+                     "hint": None, "details": None},
+                    status_code=400,
+                )
+        return None
+
+    @app.get("/rest/v1/{table}")
+    async def select_rows(table: str, request: Request):
+        selected = [c.strip() for c in request.query_params.get("select", "*").split(",")]
+        error = _unknown_column(table, [*selected, *request.query_params.keys()])
+        if error is not None:
+            return error
+        rows = _filter_rows(state.tables[table], request.query_params)
+        rows = _order_rows(rows, request.query_params.get("order"))
+        total = len(rows)
+        offset = int(request.query_params.get("offset", 0))
+        limit = request.query_params.get("limit")
+        rows = rows[offset:offset + int(limit)] if limit else rows[offset:]
+        if state.max_rows is not None:
+            rows = rows[:state.max_rows]
+        body = _project(state, table, rows, request.query_params.get("select", "*"))
+        headers = {}
+        if "count=exact" in request.headers.get("prefer", ""):
+            end = offset + len(body) - 1
+            headers["Content-Range"] = f"{offset}-{end}/{total}" if body else f"*/{total}"
+        return JSONResponse(body, headers=headers)
+
+    @app.head("/rest/v1/{table}")
+    async def count_rows(table: str, request: Request):
+        rows = _filter_rows(state.tables[table], request.query_params)
+        return Response(headers={"Content-Range": f"*/{len(rows)}"})
+
+    @app.post("/rest/v1/{table}")
+    async def insert_rows(table: str, request: Request):
+        payload = await request.json()
+        rows = payload if isinstance(payload, list) else [payload]
+        error = _unknown_write_column(table, rows)
+        if error is not None:
+            return error
+        prefer = request.headers.get("prefer", "")
+        conflict = request.query_params.get("on_conflict")
+        result = []
+        for row in rows:
+            existing = None
+            if conflict and "merge-duplicates" in prefer:
+                keys = [k.strip() for k in conflict.split(",")]
+                existing = next(
+                    (r for r in state.tables[table] if all(r.get(k) == row.get(k) for k in keys)),
+                    None,
+                )
+            if existing is not None:
+                existing.update(row)
+                result.append(existing)
+            else:
+                result.append(state.insert(table, row))
+        return JSONResponse(result, status_code=201)
+
+    @app.patch("/rest/v1/{table}")
+    async def update_rows(table: str, request: Request):
+        payload = await request.json()
+        error = _unknown_write_column(table, [payload]) or _unknown_column(table, request.query_params.keys())
+        if error is not None:
+            return error
+        rows = _filter_rows(state.tables[table], request.query_params)
+        for row in rows:
+            row.update(payload)
+        return JSONResponse(rows)
+
+    @app.delete("/rest/v1/{table}")
+    async def delete_rows(table: str, request: Request):
+        rows = _filter_rows(state.tables[table], request.query_params)
+        doomed = {id(r) for r in rows}
+        state.tables[table] = [r for r in state.tables[table] if id(r) not in doomed]
+        return JSONResponse(rows)
+
+    @app.post("/rest/v1/rpc/{fn}")
+    async def call_rpc(fn: str, request: Request):
+        handler = getattr(state, f"rpc_{fn}", None)
+        if handler is None:
+            return JSONResponse(
+                {"code": "PGRST202", "message": f"Could not find the function public.{fn}", "hint": None, "details": None},
+                status_code=404,
+            )
+        return handler(**(await request.json()))
+
+    # ---------------------------------------------------------------- storage
+
+    def _not_found():
+        return JSONResponse(
+            {"statusCode": "404", "error": "not_found", "message": "Object not found"},
+            status_code=404,
+        )
+
+    @app.post("/storage/v1/object/{bucket}/{path:path}")
+    @app.put("/storage/v1/object/{bucket}/{path:path}")
+    async def upload_object(bucket: str, path: str, request: Request):
+        key = f"{bucket}/{path}"
+        if state.failing_uploads > 0:
+            state.failing_uploads -= 1
+            return JSONResponse(
+                {"statusCode": "500", "error": "internal", "message": "Injected upload failure"},
+                status_code=500,
+            )
+        upsert = request.method == "PUT" or request.headers.get("x-upsert") == "true"
+        if key in state.objects and not upsert:
+            return JSONResponse(
+                {"statusCode": "409", "error": "Duplicate", "message": "The resource already exists"},
+                status_code=409,
+            )
+        form = await request.form()
+        upload = form.get("file")
+        state.objects[key] = await upload.read() if upload is not None else await request.body()
+        return {"Key": key, "Id": str(uuid.uuid4())}
+
+    @app.get("/storage/v1/object/{bucket}/{path:path}")
+    async def download_object(bucket: str, path: str):
+        data = state.objects.get(f"{bucket}/{path}")
+        if data is None:
+            return _not_found()
+        return Response(data, media_type="application/octet-stream")
+
+    @app.head("/storage/v1/object/{bucket}/{path:path}")
+    async def head_object(bucket: str, path: str):
+        data = state.objects.get(f"{bucket}/{path}")
+        if data is None:
+            return Response(status_code=404)
+        return Response(headers={"Content-Length": str(len(data))})
+
+    @app.delete("/storage/v1/object/{bucket}")
+    async def remove_objects(bucket: str, request: Request):
+        payload = await request.json()
+        removed = []
+        for prefix in payload.get("prefixes", []):
+            if state.objects.pop(f"{bucket}/{prefix}", None) is not None:
+                removed.append({"name": prefix, "bucket_id": bucket})
+        return removed
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local Supabase stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    state = FakeSupabase(latency=args.latency)
+    state.seed_script("demo", [f"Demo line {i + 1}." for i in range(20)])
+    print(f"Test token: {state.issue_token()}")
+    uvicorn.run(create_app(state), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Load test: /api/health latency while recordings are being saved concurrently.
+
+Starts the fake Supabase (scripts/fake_supabase.py) in-process with a fixed
+per-request latency, launches the API with uvicorn pointed at it, then:
+  1. measures /api/health latency on an idle server (baseline)
+  2. measures it again while N clients loop on /api/recording/save
+and prints p50/p95/max for both phases plus worker-pool and cache stats.
+
+Usage (from project root):
+  python backend/scripts/loadtest_save.py
+  python backend/scripts/loadtest_save.py --uploaders 32 --latency 0.2 --seconds 10
+"""
+import argparse
+import asyncio
+import io
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import wave
+from pathlib import Path
+
+import httpx
+import numpy as np
+import uvicorn
+
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir / "scripts"))
+
+from fake_supabase import FakeSupabase, create_app  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def make_wav(seconds: float = 10.0, rate: int = 44100) -> bytes:
+    t = np.arange(int(seconds * rate)) / rate
+    pcm = (0.3 * np.sin(2 * np.pi * 220 * t) * 32767).astype("<i2").tobytes()
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(pcm)
+    return buf.getvalue()
+
+
+def start_fake_supabase(state: FakeSupabase, port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(create_app(state), port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def summarize(label: str, samples):
+    ms = sorted(s * 1000 for s in samples)
+    p95 = ms[int(len(ms) * 0.95) - 1] if len(ms) >= 20 else ms[-1]
+    print(f"  {label:<14} n={len(ms):<5} p50={statistics.median(ms):7.2f} ms  p95={p95:7.2f} ms  max={ms[-1]:7.2f} ms")
+
+
+async def probe_health(client: httpx.AsyncClient, seconds: float):
+    samples = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        r = await client.get("/api/health")
+        r.raise_for_status()
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(0.02)
+    return samples
+
+
+async def uploader(client, token, script_id, wav, stop: asyncio.Event, results):
+    line = 0
+    while not stop.is_set():
+        r = await client.post(
+            "/api/recording/save",
+            headers={"Authorization": f"Bearer {token}"},
+            files={"audio_file": ("take.wav", wav, "audio/wav")},
+            data={"script_id": str(script_id), "line_index": str(line % 20), "phrase_text": "Load test line."},
+        )
+        results[r.status_code] = results.get(r.status_code, 0) + 1
+        line += 1
+
+
+async def run(args, api_url: str, token: str, script_id: int):
+    wav = make_wav()
+    async with httpx.AsyncClient(base_url=api_url, timeout=60) as client:
+        print(f"/api/health latency ({args.seconds:.0f}s per phase)")
+        summarize("idle", await probe_health(client, args.seconds))
+
+        stop = asyncio.Event()
+        results = {}
+        tasks = [
+            asyncio.create_task(uploader(client, token, script_id, wav, stop, results))
+            for _ in range(args.uploaders)
+        ]
+        await asyncio.sleep(0.5)
+        samples = await probe_health(client, args.seconds)
+        stop.set()
+        await asyncio.gather(*tasks)
+        summarize(f"{args.uploaders} uploaders", samples)
+        print(f"  save responses: {dict(sorted(results.items()))}")
+        health = (await client.get("/api/health")).json()
+        print(f"  worker pools: {health.get('workers')}")
+        print(f"  caches: {health.get('caches')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Health latency under concurrent uploads")
+    parser.add_argument("--uploaders", type=int, default=16, help="Concurrent save clients (default: 16)")
+    parser.add_argument("--latency", type=float, default=0.1, help="Fake Supabase latency per call in seconds")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each phase")
+    args = parser.parse_args()
+
+    state = FakeSupabase(latency=args.latency)
+    script = state.seed_script("loadtest", [f"Load test line {i + 1}." for i in range(20)])
+    supabase_port, api_port = free_port(), free_port()
+    start_fake_supabase(state, supabase_port)
+
+    env = {
+        **os.environ,
+        "SUPABASE_URL": f"http://127.0.0.1:{supabase_port}",
+        "SUPABASE_KEY": "fake-service-role-key",
+        "KUIPER_LOG_LEVEL": "WARNING",
+        "LOG_LEVEL": "WARNING",
+    }
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(api_port), "--log-level", "warning"],
+        cwd=_backend_dir,
+        env=env,
+    )
+    api_url = f"http://127.0.0.1:{api_port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{api_url}/api/health", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        asyncio.run(run(args, api_url, state.issue_token(), script["id"]))
+        print(f"  fake supabase calls: {dict(state.calls)}")
+    finally:
+        api.terminate()
+        api.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Pre-synthesize pronunciations for every script line into the TTS disk cache.
+
+Lines already in the cache are skipped, so it is cheap to re-run after
+adding scripts. Run it with the same KUIPER_TTS_CACHE_DIR as the API server
+(the default is <tmp>/kuiper-tts) so the server picks the files up.
+
+Usage (from project root):
+  python backend/scripts/warm_tts_cache.py
+  python backend/scripts/warm_tts_cache.py --script LauraVoice --lang en --concurrency 8
+
+Requires: backend/.env with SUPABASE_URL and SUPABASE_KEY, and espeak-ng
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+_backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend_dir))
+
+_env_file = _backend_dir / ".env"
+if _env_file.exists():
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(_env_file)
+    except ImportError:
+        pass
+
+
+async def run(args):
+    import db
+    from core import tts
+    from core.tts_engines import TTSError, TTSUnavailableError
+
+    scripts = await db.list_scripts()
+    if args.script:
+        scripts = [s for s in scripts if s["name"] in args.script]
+    lines = sorted({line for s in scripts for line in s["lines"] if line.strip()})
+    if not lines:
+        print("No script lines to synthesize.")
+        return
+
+    try:
+        engine = await tts.start_engine()
+    except TTSUnavailableError as e:
+        raise SystemExit(f"TTS engine unavailable: {e}")
+    print(f"Warming TTS cache for {len(lines)} distinct lines from {len(scripts)} script(s) "
+          f"(lang={args.lang}, voice={args.voice or 'default'}, engine={engine.name})")
+
+    slots = asyncio.Semaphore(args.concurrency)
+    failed = []
+
+    async def warm(line: str):
+        async with slots:
+            try:
+                await tts.pronounce(line, args.lang, args.voice)
+            except TTSUnavailableError:
+                raise SystemExit("espeak-ng is not installed")
+            except TTSError as e:
+                failed.append((line, e))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(warm(line) for line in lines))
+    elapsed = time.perf_counter() - start
+
+    stats = tts.tts_cache_stats()
+    disk = stats["disk"] or {}
+    print(f"  synthesized: {stats['synthesized']}")
+    print(f"  already cached: {disk.get('hits', 0)}")
+    print(f"  failed: {len(failed)}")
+    for line, e in failed[:10]:
+        print(f"    {line[:60]!r}: {e}")
+    print(f"  cache size: {disk.get('bytes', 0) / 1048576:.1f} MB in {disk.get('directory')}")
+    print(f"  {elapsed:.1f}s")
+    await tts.stop_engine()
+    await db.close_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-synthesize script lines into the TTS cache")
+    parser.add_argument("--script", action="append", help="Only this script name (repeatable)")
+    parser.add_argument("--lang", default="en", help="espeak-ng language (default: en)")
+    parser.add_argument("--voice", default="", help="espeak-ng voice variant, e.g. f3")
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+
+    if not os.environ.get("SUPABASE_URL") or not os.environ.get("SUPABASE_KEY"):
+        print("Error: SUPABASE_URL and SUPABASE_KEY are required (backend/.env).")
+        sys.exit(1)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
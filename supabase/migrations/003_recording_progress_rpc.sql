@@ -0,0 +1,18 @@
+-- Migration: Aggregated recording progress in one query
+-- Replaces one count(*) request per script with a single grouped RPC call
+-- (POST /rest/v1/rpc/recording_counts). Used by /api/recording/progress.
+
+CREATE OR REPLACE FUNCTION recording_counts(p_recorder_name TEXT DEFAULT NULL)
+RETURNS TABLE (script_id INTEGER, recorded BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT r.script_id, COUNT(*) AS recorded
+  FROM recordings r
+  WHERE p_recorder_name IS NULL OR r.recorder_name = p_recorder_name
+  GROUP BY r.script_id;
+$$;
+
+-- Covering index so the per-recorder aggregate is an index-only scan
+CREATE INDEX IF NOT EXISTS idx_recordings_recorder_script
+  ON recordings(recorder_name, script_id);
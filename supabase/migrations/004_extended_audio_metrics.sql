@@ -0,0 +1,11 @@
+-- Migration: Frame-based quality metrics on recordings
+-- Computed by the backend's audio analysis on every save, next to peak_amplitude/rms_level,
+-- so takes can be filtered (noisy, clipped, long silences) without downloading audio.
+-- NULL for recordings saved before this migration.
+
+ALTER TABLE recordings ADD COLUMN IF NOT EXISTS noise_floor_db FLOAT;
+ALTER TABLE recordings ADD COLUMN IF NOT EXISTS snr_db FLOAT;
+ALTER TABLE recordings ADD COLUMN IF NOT EXISTS clipped_ratio FLOAT;
+ALTER TABLE recordings ADD COLUMN IF NOT EXISTS leading_silence_seconds FLOAT;
+ALTER TABLE recordings ADD COLUMN IF NOT EXISTS trailing_silence_seconds FLOAT;
+ALTER TABLE recordings ADD COLUMN IF NOT EXISTS dc_offset FLOAT;
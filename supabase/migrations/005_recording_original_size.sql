@@ -0,0 +1,6 @@
+-- Migration: Uploaded size next to stored size
+-- With KUIPER_NORMALIZE_UPLOADS the backend trims silence and re-encodes takes
+-- (mono 16-bit at 22050 Hz) before storing them; file_size_bytes is the stored
+-- object and original_size_bytes what the client uploaded. NULL for older rows.
+
+ALTER TABLE recordings ADD COLUMN IF NOT EXISTS original_size_bytes INTEGER;
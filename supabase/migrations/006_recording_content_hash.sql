@@ -0,0 +1,6 @@
+-- Migration: Content hash of each stored take
+-- The backend hashes the audio it is about to store and skips the storage
+-- upload when the line already holds identical bytes (a retried save).
+-- NULL for recordings saved before this migration; their next save uploads.
+
+ALTER TABLE recordings ADD COLUMN IF NOT EXISTS content_sha256 CHAR(64);
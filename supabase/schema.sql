@@ -8,6 +8,10 @@
 -- For existing projects, migrations are in supabase/migrations/:
 --   001_add_phrase_and_recorder.sql  - Adds phrase_text, recorder_name
 --   002_add_user_id_to_recordings.sql - Adds user_id for account-linked recordings
+--   003_recording_progress_rpc.sql    - Adds recording_counts() for one-query progress
+--   004_extended_audio_metrics.sql    - Adds noise floor, SNR, clipping, silence, DC offset
+--   005_recording_original_size.sql   - Adds original_size_bytes (uploaded vs stored size)
+--   006_recording_content_hash.sql    - Adds content_sha256 (skips re-uploading identical takes)
 --
 -- =============================================================================
 
@@ -36,6 +40,9 @@ CREATE TABLE IF NOT EXISTS scripts (
 --   recorder_name - Identifier for who recorded (user_id as string for new records)
 --   phrase_text   - The exact text that was read (from scripts.lines)
 --   storage_path  - Path in storage bucket: recordings/{recorder_name}/{script_id}/{filename}
+--   noise_floor_db .. dc_offset - Frame-based quality metrics (NULL for legacy rows)
+--   file_size_bytes / original_size_bytes - Stored size / size as uploaded
+--   content_sha256 - SHA-256 of the stored object (NULL for legacy rows)
 --
 -- Unique constraint: one recording per (script_id, line_index, recorder_name)
 -- =============================================================================
@@ -54,6 +61,14 @@ CREATE TABLE IF NOT EXISTS recordings (
     rms_level FLOAT DEFAULT 0,
     is_valid BOOLEAN DEFAULT TRUE,
     file_size_bytes INTEGER DEFAULT 0,
+    original_size_bytes INTEGER,
+    content_sha256 CHAR(64),
+    noise_floor_db FLOAT,
+    snr_db FLOAT,
+    clipped_ratio FLOAT,
+    leading_silence_seconds FLOAT,
+    trailing_silence_seconds FLOAT,
+    dc_offset FLOAT,
     created_at TIMESTAMPTZ DEFAULT NOW(),
     UNIQUE(script_id, line_index, recorder_name)
 );
@@ -63,6 +78,19 @@ CREATE INDEX IF NOT EXISTS idx_recordings_script_id ON recordings(script_id);
 CREATE INDEX IF NOT EXISTS idx_recordings_recorder_name ON recordings(recorder_name);
 CREATE INDEX IF NOT EXISTS idx_recordings_user_id ON recordings(user_id);
 CREATE INDEX IF NOT EXISTS idx_recordings_script_line ON recordings(script_id, line_index);
+CREATE INDEX IF NOT EXISTS idx_recordings_recorder_script ON recordings(recorder_name, script_id);
+
+-- Recorded line counts per script in one grouped query (used for progress)
+CREATE OR REPLACE FUNCTION recording_counts(p_recorder_name TEXT DEFAULT NULL)
+RETURNS TABLE (script_id INTEGER, recorded BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT r.script_id, COUNT(*) AS recorded
+  FROM recordings r
+  WHERE p_recorder_name IS NULL OR r.recorder_name = p_recorder_name
+  GROUP BY r.script_id;
+$$;
 
 -- =============================================================================
 -- 3. USER SETTINGS